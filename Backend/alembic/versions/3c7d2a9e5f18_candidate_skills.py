@@ -0,0 +1,74 @@
+"""candidate skills
+
+Revision ID: 3c7d2a9e5f18
+Revises: 8b3e5f1a9c24
+Create Date: 2025-12-19 09:14:52.630418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7d2a9e5f18'
+down_revision: Union[str, Sequence[str], None] = '8b3e5f1a9c24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same normalization as services.skill_service.normalize_skill: collapse whitespace, lower-case.
+DISPLAY = r"left(regexp_replace(btrim(s.skill), '\s+', ' ', 'g'), 100)"
+NORMALIZED = f"lower({DISPLAY})"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'skills',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('normalized', sa.String(length=100), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('normalized')
+    )
+    op.create_table(
+        'candidate_skills',
+        sa.Column('candidate_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('skill_id', sa.Integer(), nullable=False),
+        sa.Column('company_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('uploaded_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['candidate_id'], ['candidates.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['skill_id'], ['skills.id']),
+        sa.PrimaryKeyConstraint('candidate_id', 'skill_id')
+    )
+
+    # Backfill from candidates.skills before the secondary indexes exist.
+    op.execute(f"""
+        INSERT INTO skills (name, normalized)
+        SELECT min({DISPLAY}), {NORMALIZED}
+        FROM candidates c, jsonb_array_elements_text(c.skills) AS s(skill)
+        WHERE jsonb_typeof(c.skills) = 'array' AND btrim(s.skill) <> ''
+        GROUP BY {NORMALIZED}
+        ON CONFLICT (normalized) DO NOTHING
+    """)
+    op.execute(f"""
+        INSERT INTO candidate_skills (candidate_id, skill_id, company_id, uploaded_at)
+        SELECT DISTINCT c.id, k.id, c.company_id, c.uploaded_at
+        FROM candidates c
+        CROSS JOIN LATERAL jsonb_array_elements_text(c.skills) AS s(skill)
+        JOIN skills k ON k.normalized = {NORMALIZED}
+        WHERE jsonb_typeof(c.skills) = 'array' AND btrim(s.skill) <> ''
+    """)
+
+    op.create_index('ix_candidate_skills_company_id_skill_id_uploaded_at', 'candidate_skills', ['company_id', 'skill_id', 'uploaded_at'], unique=False)
+    op.create_index('ix_candidate_skills_skill_id', 'candidate_skills', ['skill_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_candidate_skills_skill_id', table_name='candidate_skills')
+    op.drop_index('ix_candidate_skills_company_id_skill_id_uploaded_at', table_name='candidate_skills')
+    op.drop_table('candidate_skills')
+    op.drop_table('skills')
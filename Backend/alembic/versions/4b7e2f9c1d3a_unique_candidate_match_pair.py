@@ -0,0 +1,48 @@
+"""unique candidate_matches (candidate_id, jd_id)
+
+Revision ID: 4b7e2f9c1d3a
+Revises: d504bd6e91d9
+Create Date: 2025-12-02 10:14:37.201845
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e2f9c1d3a'
+down_revision: Union[str, Sequence[str], None] = 'd504bd6e91d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep only the most recently calculated row for every duplicated pair
+    # before the constraint is added.
+    op.execute("""
+        DELETE FROM candidate_matches
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id,
+                       row_number() OVER (
+                           PARTITION BY candidate_id, jd_id
+                           ORDER BY calculated_at DESC NULLS LAST, id DESC
+                       ) AS rn
+                FROM candidate_matches
+            ) ranked
+            WHERE ranked.rn > 1
+        )
+    """)
+    op.create_unique_constraint(
+        'uq_candidate_matches_candidate_jd',
+        'candidate_matches',
+        ['candidate_id', 'jd_id']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_candidate_matches_candidate_jd', 'candidate_matches', type_='unique')
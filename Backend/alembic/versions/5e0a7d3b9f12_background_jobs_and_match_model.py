@@ -0,0 +1,50 @@
+"""background jobs and match embedding model
+
+Revision ID: 5e0a7d3b9f12
+Revises: c81f4a0e6b27
+Create Date: 2025-12-08 10:14:37.205118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0a7d3b9f12'
+down_revision: Union[str, Sequence[str], None] = 'c81f4a0e6b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('background_jobs',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('kind', sa.String(length=50), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('params', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('checkpoint', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('processed', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_background_jobs_kind'), 'background_jobs', ['kind'], unique=False)
+
+    op.add_column('candidate_matches', sa.Column('embedding_model', sa.String(length=255), nullable=True))
+    # Every score so far came from the previously hard-coded model.
+    op.execute("UPDATE candidate_matches SET embedding_model = 'all-MiniLM-L6-v2'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('candidate_matches', 'embedding_model')
+    op.drop_index(op.f('ix_background_jobs_kind'), table_name='background_jobs')
+    op.drop_table('background_jobs')
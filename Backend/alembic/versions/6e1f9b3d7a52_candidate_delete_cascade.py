@@ -0,0 +1,57 @@
+"""candidate delete cascade
+
+Revision ID: 6e1f9b3d7a52
+Revises: 3c7d2a9e5f18
+Create Date: 2025-12-20 14:31:08.517326
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e1f9b3d7a52'
+down_revision: Union[str, Sequence[str], None] = '3c7d2a9e5f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables whose candidate_id foreign key (Postgres default name <table>_candidate_id_fkey) cascades.
+CHILD_TABLES = ['candidate_matches', 'shortlist', 'interviews']
+
+
+def _replace_candidate_fks(on_delete: str):
+    # NOT VALID swaps the constraints without scanning the tables, so the
+    # exclusive locks are only held for the catalog change. VALIDATE then checks
+    # existing rows outside this transaction, under a lighter lock, each table in
+    # its own autocommitted statement.
+    for table in CHILD_TABLES:
+        constraint = f'{table}_candidate_id_fkey'
+        op.execute(f"""
+            ALTER TABLE {table}
+                DROP CONSTRAINT IF EXISTS {constraint},
+                ADD CONSTRAINT {constraint} FOREIGN KEY (candidate_id)
+                    REFERENCES candidates (id) {on_delete} NOT VALID
+        """)
+    with op.get_context().autocommit_block():
+        for table in CHILD_TABLES:
+            op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {table}_candidate_id_fkey')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _replace_candidate_fks('ON DELETE CASCADE')
+
+    # Cascaded deletes look up interviews by candidate_id.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_interviews_candidate_id', 'interviews', ['candidate_id'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_interviews_candidate_id', table_name='interviews',
+                      postgresql_concurrently=True, if_exists=True)
+
+    _replace_candidate_fks('')
@@ -0,0 +1,30 @@
+"""resume content sha256
+
+Revision ID: 7a4d2c8e5b19
+Revises: e3b9c6f1a054
+Create Date: 2025-12-11 09:48:15.337402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a4d2c8e5b19'
+down_revision: Union[str, Sequence[str], None] = 'e3b9c6f1a054'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('resumes', sa.Column('content_sha256', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_resumes_content_sha256'), 'resumes', ['content_sha256'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_resumes_content_sha256'), table_name='resumes')
+    op.drop_column('resumes', 'content_sha256')
@@ -0,0 +1,50 @@
+"""candidate search indexes
+
+Revision ID: 8b3e5f1a9c24
+Revises: f4c8a2d61e93
+Create Date: 2025-12-18 11:05:21.402871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b3e5f1a9c24'
+down_revision: Union[str, Sequence[str], None] = 'f4c8a2d61e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Role and skills weigh most, then summary, then experience. jsonb_to_tsvector with
+# '["string"]' indexes only the string values of the arrays.
+SEARCH_VECTOR_EXPRESSION = """
+    setweight(to_tsvector('english'::regconfig, coalesce(role, '')), 'A') ||
+    setweight(jsonb_to_tsvector('english'::regconfig, coalesce(skills, '[]'::jsonb), '["string"]'), 'A') ||
+    setweight(to_tsvector('english'::regconfig, coalesce(summary, '')), 'B') ||
+    setweight(jsonb_to_tsvector('english'::regconfig, coalesce(experience, '[]'::jsonb), '["string"]'), 'C')
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # A stored generated column rewrites candidates once, under an exclusive lock;
+    # afterwards Postgres keeps it current on every insert and update.
+    op.execute(f"ALTER TABLE candidates ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPRESSION}) STORED")
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_candidates_search_vector', 'candidates', ['search_vector'], postgresql_using='gin',
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_candidates_name_trgm', 'candidates', ['name'], postgresql_using='gin',
+                        postgresql_ops={'name': 'gin_trgm_ops'}, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_candidates_email_trgm', 'candidates', ['email'], postgresql_using='gin',
+                        postgresql_ops={'email': 'gin_trgm_ops'}, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in ('ix_candidates_email_trgm', 'ix_candidates_name_trgm', 'ix_candidates_search_vector'):
+            op.drop_index(name, table_name='candidates', postgresql_concurrently=True, if_exists=True)
+    op.execute("ALTER TABLE candidates DROP COLUMN search_vector")
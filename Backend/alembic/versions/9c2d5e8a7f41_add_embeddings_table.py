@@ -0,0 +1,41 @@
+"""add embeddings table
+
+Revision ID: 9c2d5e8a7f41
+Revises: 4b7e2f9c1d3a
+Create Date: 2025-12-04 15:42:08.613290
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c2d5e8a7f41'
+down_revision: Union[str, Sequence[str], None] = '4b7e2f9c1d3a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('embeddings',
+        sa.Column('owner_type', sa.String(length=20), nullable=False),
+        sa.Column('owner_id', sa.UUID(), nullable=False),
+        sa.Column('model_name', sa.String(length=255), nullable=False),
+        sa.Column('company_id', sa.UUID(), nullable=True),
+        sa.Column('dtype', sa.String(length=10), nullable=False),
+        sa.Column('dim', sa.Integer(), nullable=False),
+        sa.Column('vector', sa.LargeBinary(), nullable=False),
+        sa.Column('text_hash', sa.String(length=32), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('owner_type', 'owner_id', 'model_name')
+    )
+    op.create_index(op.f('ix_embeddings_company_id'), 'embeddings', ['company_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_embeddings_company_id'), table_name='embeddings')
+    op.drop_table('embeddings')
@@ -0,0 +1,81 @@
+"""candidate match history
+
+Revision ID: a47c1e8d2b69
+Revises: 6e1f9b3d7a52
+Create Date: 2025-12-21 16:02:44.905113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a47c1e8d2b69'
+down_revision: Union[str, Sequence[str], None] = '6e1f9b3d7a52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# One partition per month from the oldest existing match to two months ahead;
+# later months are created by services/match_history_service.py.
+CREATE_MONTHLY_PARTITIONS = """
+DO $$
+DECLARE
+    month date;
+BEGIN
+    FOR month IN
+        SELECT generate_series(
+            date_trunc('month', coalesce((SELECT min(calculated_at) FROM candidate_matches), now()) AT TIME ZONE 'UTC'),
+            date_trunc('month', now() AT TIME ZONE 'UTC') + interval '2 months',
+            interval '1 month'
+        )::date
+    LOOP
+        EXECUTE 'CREATE TABLE IF NOT EXISTS '
+            || quote_ident('candidate_match_history_y' || to_char(month, 'YYYY') || 'm' || to_char(month, 'MM'))
+            || ' PARTITION OF candidate_match_history FOR VALUES FROM ('
+            || quote_literal(month::text) || ') TO ('
+            || quote_literal((month + interval '1 month')::date::text) || ')';
+    END LOOP;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'candidate_match_history',
+        sa.Column('candidate_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('jd_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('scored_on', sa.Date(), nullable=False),
+        sa.Column('calculated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('company_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('skill_match_percent', sa.Integer(), nullable=True),
+        sa.Column('sbert_score', sa.Float(), nullable=True),
+        sa.Column('final_score', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('candidate_id', 'jd_id', 'scored_on'),
+        postgresql_partition_by='RANGE (scored_on)'
+    )
+    op.execute('CREATE TABLE candidate_match_history_default PARTITION OF candidate_match_history DEFAULT')
+    op.execute(CREATE_MONTHLY_PARTITIONS)
+
+    # Seed the history with the current scores so trends are not empty after deploying.
+    op.execute("""
+        INSERT INTO candidate_match_history
+            (candidate_id, jd_id, scored_on, calculated_at, company_id, skill_match_percent, sbert_score, final_score)
+        SELECT m.candidate_id, m.jd_id, (m.calculated_at AT TIME ZONE 'UTC')::date, m.calculated_at, j.company_id,
+               m.skill_match_percent, m.sbert_score, m.final_score
+        FROM candidate_matches m
+        JOIN job_descriptions j ON j.id = m.jd_id
+        WHERE m.calculated_at IS NOT NULL AND j.company_id IS NOT NULL
+    """)
+
+    op.create_index('ix_candidate_match_history_company_id_scored_on', 'candidate_match_history', ['company_id', 'scored_on'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Dropping the parent drops every attached partition.
+    op.drop_table('candidate_match_history')
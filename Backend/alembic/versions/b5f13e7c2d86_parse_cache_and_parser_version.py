@@ -0,0 +1,43 @@
+"""parse cache and candidate parser version
+
+Revision ID: b5f13e7c2d86
+Revises: 7a4d2c8e5b19
+Create Date: 2025-12-12 14:21:09.774531
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5f13e7c2d86'
+down_revision: Union[str, Sequence[str], None] = '7a4d2c8e5b19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('parse_cache',
+        sa.Column('text_hash', sa.String(length=64), nullable=False),
+        sa.Column('parser_version', sa.String(length=20), nullable=False),
+        sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('text_hash', 'parser_version')
+    )
+    op.add_column('candidates', sa.Column('parser_version', sa.String(length=20), nullable=True))
+    # Existing candidates were parsed by the parser this revision versions as "1".
+    # Without the stamp, the first re-parse job would treat all of them as outdated
+    # and overwrite fields recruiters have edited since upload.
+    op.execute("UPDATE candidates SET parser_version = '1' WHERE parser_version IS NULL")
+    op.create_index(op.f('ix_candidates_parser_version'), 'candidates', ['parser_version'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_candidates_parser_version'), table_name='candidates')
+    op.drop_column('candidates', 'parser_version')
+    op.drop_table('parse_cache')
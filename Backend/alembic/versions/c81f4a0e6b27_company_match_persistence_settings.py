@@ -0,0 +1,32 @@
+"""company match persistence settings
+
+Revision ID: c81f4a0e6b27
+Revises: 9c2d5e8a7f41
+Create Date: 2025-12-06 11:27:51.904772
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81f4a0e6b27'
+down_revision: Union[str, Sequence[str], None] = '9c2d5e8a7f41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('companies', sa.Column('match_persist_mode', sa.String(length=20), server_default='all', nullable=False))
+    op.add_column('companies', sa.Column('match_top_k', sa.Integer(), server_default='5', nullable=False))
+    op.add_column('companies', sa.Column('match_keep_threshold', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('companies', 'match_keep_threshold')
+    op.drop_column('companies', 'match_top_k')
+    op.drop_column('companies', 'match_persist_mode')
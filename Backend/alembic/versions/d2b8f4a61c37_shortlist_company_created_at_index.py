@@ -0,0 +1,32 @@
+"""shortlist company created_at index
+
+Revision ID: d2b8f4a61c37
+Revises: a47c1e8d2b69
+Create Date: 2025-12-22 10:14:37.208415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2b8f4a61c37'
+down_revision: Union[str, Sequence[str], None] = 'a47c1e8d2b69'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Serves the keyset-paginated shortlist listing (services/shortlist_service.py).
+    with op.get_context().autocommit_block():
+        op.create_index('ix_shortlist_shortlisted_by_created_at', 'shortlist', ['shortlisted_by', 'created_at'],
+                        unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_shortlist_shortlisted_by_created_at', table_name='shortlist',
+                      postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,56 @@
+"""compress resume parsed_text
+
+Revision ID: d91e4b6a3c07
+Revises: b5f13e7c2d86
+Create Date: 2025-12-15 10:42:37.118204
+
+"""
+from typing import Sequence, Union
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd91e4b6a3c07'
+down_revision: Union[str, Sequence[str], None] = 'b5f13e7c2d86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def _convert(source: str, target: str, convert):
+    """Copies resumes.<source> into resumes.<target> through `convert`, in id-ordered batches."""
+    bind = op.get_bind()
+    resumes = sa.table('resumes', sa.column('resume_id'), sa.column(source), sa.column(target))
+    last_id = None
+    while True:
+        query = sa.select(resumes.c.resume_id, resumes.c[source]).order_by(resumes.c.resume_id).limit(BATCH_SIZE)
+        if last_id is not None:
+            query = query.where(resumes.c.resume_id > last_id)
+        rows = bind.execute(query).all()
+        if not rows:
+            return
+        bind.execute(
+            resumes.update().where(resumes.c.resume_id == sa.bindparam('_id')).values({target: sa.bindparam('_value')}),
+            [{'_id': resume_id, '_value': convert(value)} for resume_id, value in rows]
+        )
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('resumes', sa.Column('parsed_text_zlib', sa.LargeBinary(), nullable=True))
+    _convert('parsed_text', 'parsed_text_zlib', lambda text: zlib.compress((text or '').encode('utf-8'), 6))
+    op.drop_column('resumes', 'parsed_text')
+    op.alter_column('resumes', 'parsed_text_zlib', new_column_name='parsed_text', nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('resumes', sa.Column('parsed_text_plain', sa.Text(), nullable=True))
+    _convert('parsed_text', 'parsed_text_plain', lambda data: zlib.decompress(data).decode('utf-8'))
+    op.drop_column('resumes', 'parsed_text')
+    op.alter_column('resumes', 'parsed_text_plain', new_column_name='parsed_text', nullable=False)
@@ -0,0 +1,28 @@
+"""company match min score
+
+Revision ID: e3b9c6f1a054
+Revises: 5e0a7d3b9f12
+Create Date: 2025-12-09 16:03:22.481957
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b9c6f1a054'
+down_revision: Union[str, Sequence[str], None] = '5e0a7d3b9f12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('companies', sa.Column('match_min_score', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('companies', 'match_min_score')
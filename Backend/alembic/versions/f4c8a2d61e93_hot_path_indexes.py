@@ -0,0 +1,50 @@
+"""hot path indexes
+
+Revision ID: f4c8a2d61e93
+Revises: d91e4b6a3c07
+Create Date: 2025-12-17 09:12:54.630418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c8a2d61e93'
+down_revision: Union[str, Sequence[str], None] = 'd91e4b6a3c07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, extra create_index kwargs)
+INDEXES = [
+    ('ix_candidates_company_id_uploaded_at', 'candidates', ['company_id', 'uploaded_at'], {}),
+    ('ix_candidates_company_id_department', 'candidates', ['company_id', 'department'], {}),
+    ('ix_candidates_user_id', 'candidates', ['user_id'], {}),
+    ('ix_candidates_skills', 'candidates', ['skills'],
+     {'postgresql_using': 'gin', 'postgresql_ops': {'skills': 'jsonb_path_ops'}}),
+    ('ix_candidate_matches_jd_id_final_score', 'candidate_matches', ['jd_id', 'final_score'], {}),
+    ('ix_candidate_matches_jd_id_calculated_at', 'candidate_matches', ['jd_id', 'calculated_at'], {}),
+    ('ix_shortlist_shortlisted_by_shortlisted', 'shortlist', ['shortlisted_by', 'shortlisted'], {}),
+    ('ix_shortlist_candidate_id', 'shortlist', ['candidate_id'], {}),
+    ('ix_resumes_company_id_created_at', 'resumes', ['company_id', 'created_at'], {}),
+    ('ix_job_descriptions_company_id', 'job_descriptions', ['company_id'], {}),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction, and does not block
+    # writes to the tables while it builds. if_not_exists makes a re-run after an
+    # interrupted build pick up where it stopped; an index left INVALID by a failed
+    # concurrent build must be dropped by hand first.
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True, **kwargs)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,143 @@
+"""
+Matching throughput benchmark.
+
+Seeds a synthetic company, runs the match_all_candidates pipeline stage by stage and
+prints one JSON report per pool size with pairs/second, per-stage wall time and peak
+Python memory (tracemalloc) per stage.
+
+Usage (from the Backend directory):
+    python -m benchmarks.bench_matching --candidates 1000 10000 --jds 10
+    python -m benchmarks.bench_matching --database-url postgresql+psycopg2://... --encoder sbert
+    python -m benchmarks.bench_matching --candidates 10000 --min-score 60
+
+With --min-score the encode and score stages run as one cascade stage through
+score_pairs, and the report includes how many pairs were pruned before SBERT.
+
+SQLite in memory is the default stand-in; point --database-url (or BENCH_DATABASE_URL)
+at a throwaway Postgres database to measure real write cost.
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from models import Candidate, JobDescription
+from services import matching_service, embedding_store
+from benchmarks.synthetic import HashEncoder, make_session, seed_talent_pool, delete_talent_pool
+
+
+@contextmanager
+def stage(report: dict, name: str):
+    tracemalloc.reset_peak()
+    started = time.perf_counter()
+    yield
+    report["stages"][name] = {
+        "seconds": round(time.perf_counter() - started, 4),
+        "peak_mb": round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+    }
+
+
+def run_pool(database_url: str, n_candidates: int, n_jds: int, seed: int, workers: int = 1, min_score: int = None) -> dict:
+    engine, db = make_session(database_url)
+    company_id = seed_talent_pool(db, n_candidates, n_jds, seed=seed)
+    db.expunge_all()
+
+    report = {
+        "candidates": n_candidates, "jds": n_jds, "pairs": n_candidates * n_jds,
+        "workers": workers, "embedding_dtype": matching_service.EMBEDDING_DTYPE, "min_score": min_score, "stages": {}
+    }
+    tracemalloc.start()
+    try:
+        with stage(report, "load"):
+            candidates = db.query(Candidate).filter(Candidate.company_id == company_id).all()
+            jds = db.query(JobDescription).filter(JobDescription.company_id == company_id).all()
+
+        if min_score is not None:
+            with stage(report, "cascade"):
+                rows = matching_service.score_pairs(db, candidates, jds, company_id, min_score)
+                db.commit()
+            report["pairs_pruned"] = report["pairs"] - len(rows)
+        else:
+            rows = _encode_and_score(report, db, candidates, jds, company_id, workers)
+
+        with stage(report, "db_write"):
+            matching_service.upsert_matches(db, rows)
+            db.commit()
+    finally:
+        tracemalloc.stop()
+
+    total = sum(s["seconds"] for s in report["stages"].values())
+    report["total_seconds"] = round(total, 4)
+    report["pairs_per_second"] = round(report["pairs"] / total, 1) if total else None
+    report["encode_seconds"] = report["stages"].get("encode", report["stages"].get("cascade"))["seconds"]
+    report["db_write_seconds"] = report["stages"]["db_write"]["seconds"]
+
+    delete_talent_pool(db, company_id)
+    db.close()
+    engine.dispose()
+    return report
+
+
+def _encode_and_score(report: dict, db, candidates, jds, company_id, workers: int):
+    with stage(report, "encode"):
+        candidate_vectors = matching_service.get_embeddings(
+            db, "candidate", [c.id for c in candidates],
+            [matching_service.build_candidate_text(c) for c in candidates], company_id
+        )
+        jd_vectors = matching_service.get_embeddings(
+            db, "jd", [jd.id for jd in jds], [jd.description or "" for jd in jds], company_id
+        )
+        db.commit()
+
+    with stage(report, "score"):
+        sbert_scores = embedding_store.score_matrix(company_id, candidate_vectors, jd_vectors, workers).tolist()
+        rows = [
+            matching_service.build_match_row(c, jd, sbert_scores[i][j])
+            for i, c in enumerate(candidates)
+            for j, jd in enumerate(jds)
+        ]
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, nargs="+", default=[1000, 10000],
+                        help="talent pool sizes to run, e.g. 1000 10000 100000")
+    parser.add_argument("--jds", type=int, default=10, help="job descriptions per company")
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL", "sqlite://"))
+    parser.add_argument("--encoder", choices=["hash", "sbert"], default="hash",
+                        help="'hash' is an offline deterministic stand-in; 'sbert' loads the real model")
+    parser.add_argument("--workers", type=int, default=1, help="matching processes for the score stage")
+    parser.add_argument("--min-score", type=int, help="cascade threshold: prune pairs whose skill overlap caps final_score below it")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    if args.encoder == "hash":
+        matching_service._MODEL = HashEncoder()
+    # Pool start-up is a one-off cost in a long-running server; keep it out of the timings.
+    embedding_store.warm_pool(args.workers)
+
+    results = {
+        "database": args.database_url.split("://")[0],
+        "encoder": args.encoder,
+        "runs": [run_pool(args.database_url, n, args.jds, args.seed, args.workers, args.min_score) for n in args.candidates],
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }
+
+    embedding_store.shutdown_pool()
+
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
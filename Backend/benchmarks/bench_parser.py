@@ -0,0 +1,121 @@
+"""
+Resume parser micro-benchmark.
+
+Parses a synthetic corpus (benchmarks/resume_corpus.py) and reports ms/resume for
+parse_resume as a whole and for normalize_spaced_headers plus each stage in
+PARSE_STAGES (contact, skills, sections, summary). It also parses fixed-length
+corpora to show how the cost scales with document length. Runs offline; no PDF,
+database or model is involved.
+
+Usage (from the Backend directory):
+    python -m benchmarks.bench_parser --resumes 500
+    python -m benchmarks.bench_parser --save-baseline parser_baseline.json
+    python -m benchmarks.bench_parser --baseline parser_baseline.json --max-regression 0.25
+
+With --baseline the run exits with status 1 when any stage (or the total) is
+slower than the baseline by more than --max-regression (a fraction). Timings
+are machine dependent: record the baseline on the machine that runs the check.
+"""
+import argparse
+import json
+import sys
+import time
+from statistics import median
+
+from benchmarks.resume_corpus import make_corpus
+from utils.resume_parser import PARSE_STAGES, normalize_spaced_headers, parse_resume
+
+
+def _ms_per_resume(seconds: float, n: int) -> float:
+    return round(seconds * 1000 / n, 4)
+
+
+def time_stages(texts, repeat: int = 3) -> dict:
+    """
+    Median over `repeat` rounds of the ms/resume of parse_resume and of each of
+    its steps, run on the same inputs parse_resume gives them.
+    """
+    names = ["normalize"] + [name for name, _ in PARSE_STAGES] + ["parse_resume"]
+    rounds = {name: [] for name in names}
+    for _ in range(repeat):
+        totals = dict.fromkeys(names, 0.0)
+        for text in texts:
+            started = time.perf_counter()
+            normalized = normalize_spaced_headers(text)
+            totals["normalize"] += time.perf_counter() - started
+
+            lines = [line.strip() for line in normalized.split('\n') if line.strip()]
+            data = parse_resume("")
+            for name, stage in PARSE_STAGES:
+                started = time.perf_counter()
+                stage(normalized, lines, data)
+                totals[name] += time.perf_counter() - started
+
+            started = time.perf_counter()
+            parse_resume(text, "Engineering")
+            totals["parse_resume"] += time.perf_counter() - started
+        for name in names:
+            rounds[name].append(totals[name])
+    return {name: _ms_per_resume(median(rounds[name]), len(texts)) for name in names}
+
+
+def run(n_resumes: int, lengths, seed: int, repeat: int) -> dict:
+    corpus = make_corpus(n_resumes, seed=seed)
+    report = {
+        "resumes": n_resumes,
+        "mean_chars": round(sum(map(len, corpus)) / n_resumes),
+        "ms_per_resume": time_stages(corpus, repeat),
+        "scaling": []
+    }
+    for jobs in lengths:
+        texts = make_corpus(max(10, n_resumes // 10), jobs=jobs, seed=seed)
+        stages = time_stages(texts, repeat)
+        report["scaling"].append({
+            "jobs": jobs,
+            "mean_chars": round(sum(map(len, texts)) / len(texts)),
+            "ms_per_resume": stages["parse_resume"],
+            "stages": {name: stages[name] for name, _ in PARSE_STAGES}
+        })
+    return report
+
+
+def find_regressions(report: dict, baseline: dict, max_regression: float) -> list:
+    """Steps whose ms/resume grew by more than `max_regression` over the baseline report."""
+    regressions = []
+    for name, base in baseline["ms_per_resume"].items():
+        current = report["ms_per_resume"].get(name)
+        if current is not None and base > 0 and current > base * (1 + max_regression):
+            regressions.append(f"{name}: {current} ms/resume vs baseline {base} (+{(current / base - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=500, help="corpus size")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[1, 5, 20, 80],
+                        help="experience entries per resume for the scaling runs")
+    parser.add_argument("--repeat", type=int, default=3, help="rounds per measurement; the median is reported")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", help="fail if slower than this earlier report")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="allowed slowdown per step, as a fraction")
+    parser.add_argument("--save-baseline", help="write the report here for later --baseline runs")
+    args = parser.parse_args(argv)
+
+    report = run(args.resumes, args.lengths, args.seed, args.repeat)
+    print(json.dumps(report, indent=2))
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(report, json.load(f), args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Accuracy report for compact embedding formats.
+
+Encodes synthetic candidate and JD texts once, then scores them with float32,
+float16 and int8 storage and reports how far `sbert_score` drifts from float32,
+how often the best JD per candidate changes, and the bytes stored per vector.
+
+Usage (from the Backend directory):
+    python -m benchmarks.embedding_accuracy --candidates 2000 --jds 20 --encoder sbert
+"""
+import argparse
+import json
+import random
+import sys
+
+import numpy as np
+
+from services import matching_service
+from services.embedding_store import sbert_score_matrix
+from utils.embedding_codec import EMBEDDING_DTYPES, quantize, to_bytes
+from benchmarks.synthetic import SKILLS, HashEncoder, sentence
+
+
+def build_report(n_candidates: int, n_jds: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    candidate_texts = [sentence(rng, rng.sample(SKILLS, 6), 60) for _ in range(n_candidates)]
+    jd_texts = [sentence(rng, rng.sample(SKILLS, 6), 60) for _ in range(n_jds)]
+
+    candidates = matching_service.encode_texts(candidate_texts)
+    jds = matching_service.encode_texts(jd_texts)
+    reference = sbert_score_matrix(candidates, jds)
+    reference_best = reference.argmax(axis=1)
+
+    formats = {}
+    for dtype in EMBEDDING_DTYPES:
+        candidate_data, scales = quantize(candidates, dtype)
+        jd_data, _ = quantize(jds, dtype)
+        scores = sbert_score_matrix(candidate_data, jd_data)
+        drift = np.abs(scores - reference)
+        formats[dtype] = {
+            "bytes_per_vector": len(to_bytes(candidate_data[0], dtype, None if scales is None else scales[0])),
+            "matrix_mb": round(candidate_data.nbytes / (1024 * 1024), 3),
+            "max_abs_drift": round(float(drift.max()), 4),
+            "mean_abs_drift": round(float(drift.mean()), 5),
+            "p99_abs_drift": round(float(np.percentile(drift, 99)), 4),
+            "pairs_changed_pct": round(float((drift > 0).mean() * 100), 2),
+            "final_score_max_drift": round(float(drift.max() * 0.4), 4),
+            "best_jd_agreement_pct": round(float((scores.argmax(axis=1) == reference_best).mean() * 100), 2)
+        }
+
+    return {"candidates": n_candidates, "jds": n_jds, "dim": int(candidates.shape[1]), "formats": formats}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=2000)
+    parser.add_argument("--jds", type=int, default=20)
+    parser.add_argument("--encoder", choices=["hash", "sbert"], default="hash")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    if args.encoder == "hash":
+        matching_service._MODEL = HashEncoder()
+
+    report = build_report(args.candidates, args.jds, args.seed)
+    report["encoder"] = args.encoder
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
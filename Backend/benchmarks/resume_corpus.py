@@ -0,0 +1,111 @@
+"""
+Synthetic resume texts for parser benchmarks.
+
+Each resume is plain text shaped like PyMuPDF output: a name and contact block,
+then summary, skills, experience, projects and education sections in a shuffled
+order, with headers drawn from the variants the parser recognises and written in
+title case, upper case, spaced-out capitals ("E X P E R I E N C E") or with a
+trailing colon. Bullets vary between "-", "*", "•" and "●". The number of jobs
+controls document length, so the same generator covers one-page and very long
+resumes. Everything is derived from the seed, so runs are reproducible offline.
+"""
+import random
+
+FIRST_NAMES = ["Aarav", "Priya", "John", "Maria", "Wei", "Fatima", "Lucas", "Ananya", "Olga", "Kwame"]
+LAST_NAMES = ["Sharma", "Iyer", "Smith", "Garcia", "Chen", "Khan", "Silva", "Nair", "Petrova", "Mensah"]
+
+SKILLS = [
+    "Python", "Java", "C++", "JavaScript", "TypeScript", "React", "Angular", "Node.js", "Django",
+    "Flask", "FastAPI", "Spring Boot", "SQL", "PostgreSQL", "MongoDB", "Redis", "AWS", "Azure",
+    "GCP", "Docker", "Kubernetes", "Terraform", "Git", "Linux", "Machine Learning", "NLP",
+    "TensorFlow", "PyTorch", "Pandas", "Agile", "Scrum", "Leadership", "Communication",
+    "Kafka", "Spark", "GraphQL", "Rust", "Go"
+]
+
+TITLES = ["Software Engineer", "Senior Backend Engineer", "Data Scientist", "DevOps Engineer",
+          "Frontend Developer", "ML Engineer", "Engineering Manager", "QA Analyst"]
+EMPLOYERS = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Tech",
+             "Hooli", "Vandelay Imports", "Cyberdyne", "Soylent Systems"]
+DEGREES = ["B.Tech in Computer Science", "M.Sc in Data Science", "Bachelor of Engineering",
+           "Master of Computer Applications", "PhD in Machine Learning", "B.Sc in Mathematics"]
+SCHOOLS = ["Anna University", "University of Mumbai", "MIT", "Stanford University", "IIT Madras", "TU Munich"]
+VERBS = ["Built", "Designed", "Led", "Migrated", "Scaled", "Automated", "Optimised", "Maintained", "Shipped"]
+OBJECTS = ["payment services", "data pipelines", "the search platform", "CI/CD pipelines", "REST APIs",
+           "a recommendation engine", "internal dashboards", "the mobile backend", "ETL jobs"]
+OUTCOMES = ["cutting latency by 40%", "for 2M daily users", "reducing costs by 25%", "with zero downtime",
+            "across 12 teams", "improving uptime to 99.95%", "in under three months"]
+
+SECTION_HEADERS = {
+    "summary": ["Summary", "Professional Summary", "Profile", "Career Objective", "About Me"],
+    "skills": ["Skills", "Technical Skills", "Technologies", "Core Competencies"],
+    "experience": ["Experience", "Work Experience", "Professional Experience", "Employment History"],
+    "projects": ["Projects", "Key Projects", "Personal Projects", "Technical Projects"],
+    "education": ["Education", "Academic Background", "Educational Qualifications"],
+}
+BULLETS = ["- ", "* ", "• ", "● ", ""]
+
+
+def _header(rng: random.Random, name: str) -> str:
+    header = rng.choice(SECTION_HEADERS[name])
+    style = rng.random()
+    if style < 0.25:
+        return " ".join(header.upper())  # "W O R K   E X P E R I E N C E"
+    if style < 0.5:
+        return header.upper()
+    if style < 0.7:
+        return f"{header}:"
+    return header
+
+
+def _achievement(rng: random.Random, skills) -> str:
+    return f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} with {rng.choice(skills)} {rng.choice(OUTCOMES)}"
+
+
+def make_resume(rng: random.Random, jobs: int = 3) -> str:
+    """One resume with `jobs` experience entries; length grows roughly linearly with it."""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    skills = rng.sample(SKILLS, rng.randint(5, 15))
+    bullet = rng.choice(BULLETS)
+    year = 2024
+
+    sections = {
+        "summary": [
+            f"{rng.choice(TITLES)} with {rng.randint(1, 20)}+ years of experience in {', '.join(skills[:3])}.",
+            f"{_achievement(rng, skills)}."
+        ],
+        "skills": [", ".join(skills[i:i + 5]) for i in range(0, len(skills), 5)],
+        "experience": [],
+        "projects": [],
+        "education": [],
+    }
+    for _ in range(jobs):
+        start = year - rng.randint(1, 4)
+        sections["experience"].append(f"{rng.choice(TITLES)}")
+        sections["experience"].append(f"{rng.choice(EMPLOYERS)} | {start} - {year}")
+        sections["experience"].extend(f"{bullet}{_achievement(rng, skills)}" for _ in range(rng.randint(2, 6)))
+        year = start
+    for _ in range(rng.randint(1, 4)):
+        sections["projects"].append(f"{rng.choice(OBJECTS).capitalize()} ({rng.choice(skills)})")
+        sections["projects"].append(f"{bullet}{_achievement(rng, skills)}")
+    for _ in range(rng.randint(1, 2)):
+        sections["education"].append(f"{rng.choice(DEGREES)}, {rng.choice(SCHOOLS)}, {year - rng.randint(0, 4)}")
+
+    order = list(sections)
+    rng.shuffle(order)
+    lines = [
+        name,
+        f"{name.split()[0].lower()}.{name.split()[1].lower()}@example.com | +91 98{rng.randint(10000000, 99999999)}",
+        f"linkedin.com/in/{name.replace(' ', '').lower()}",
+        ""
+    ]
+    for section in order:
+        lines.append(_header(rng, section))
+        lines.extend(sections[section])
+        lines.append("")
+    return "\n".join(lines)
+
+
+def make_corpus(n: int, jobs: int = None, seed: int = 42) -> list:
+    """`n` resumes; each gets 1-6 jobs unless `jobs` fixes the length."""
+    rng = random.Random(seed)
+    return [make_resume(rng, jobs if jobs is not None else rng.randint(1, 6)) for _ in range(n)]
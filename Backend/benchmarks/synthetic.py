@@ -0,0 +1,143 @@
+"""
+Synthetic talent pools for benchmarks.
+
+Generates companies, resumes, candidates and job descriptions with realistic-ish
+skill overlap, plus a deterministic offline encoder that stands in for SBERT when
+the model (or network access to download it) is not available.
+"""
+import hashlib
+import random
+import uuid
+from datetime import datetime, timezone
+
+import numpy as np
+from sqlalchemy import create_engine, insert
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+from models.base import Base
+from models import UserModel, Company, Resume, Candidate, JobDescription, CandidateMatch, Embedding, Skill, CandidateSkill
+from services.skill_service import replace_candidate_skills
+
+
+SKILLS = [
+    "Python", "Java", "C++", "JavaScript", "TypeScript", "React", "Angular", "Node.js",
+    "Django", "Flask", "FastAPI", "Spring Boot", "SQL", "PostgreSQL", "MongoDB", "Redis",
+    "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Terraform", "Git", "Linux",
+    "Machine Learning", "Deep Learning", "NLP", "TensorFlow", "PyTorch", "Pandas",
+    "Kafka", "Spark", "Airflow", "Agile", "Scrum", "Leadership", "Communication"
+]
+
+ROLES = ["Backend Engineer", "Frontend Engineer", "Data Scientist", "DevOps Engineer", "ML Engineer", "QA Engineer"]
+DEPARTMENTS = ["Engineering", "Data", "Infrastructure", "Product"]
+
+BENCH_TABLES = [
+    UserModel.__table__, Company.__table__, Resume.__table__,
+    Candidate.__table__, JobDescription.__table__, CandidateMatch.__table__, Embedding.__table__,
+    Skill.__table__, CandidateSkill.__table__
+]
+
+
+@compiles(JSONB, "sqlite")
+def _compile_jsonb_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+def make_session(database_url: str):
+    """Creates the benchmark tables (if missing) and returns (engine, session)."""
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine, tables=BENCH_TABLES)
+    return engine, sessionmaker(bind=engine, autoflush=False)()
+
+
+def sentence(rng: random.Random, skills, words: int) -> str:
+    filler = ["built", "designed", "scaled", "maintained", "services", "pipelines", "teams",
+              "platform", "latency", "customers", "data", "systems", "APIs", "migrated"]
+    return " ".join(rng.choice(filler + skills) for _ in range(words))
+
+
+def seed_talent_pool(db, n_candidates: int, n_jds: int, seed: int = 42, batch_size: int = 5000):
+    """
+    Inserts one synthetic company with `n_candidates` candidates (and their resumes)
+    and `n_jds` job descriptions. Returns the company id.
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    company_id = uuid.uuid4()
+    db.execute(insert(Company), [{
+        "id": company_id, "name": f"bench-{company_id}", "email": f"bench-{company_id}@example.com",
+        "password": "x", "plan": "bench"
+    }])
+
+    for start in range(0, n_candidates, batch_size):
+        resumes, candidates = [], []
+        for i in range(start, min(start + batch_size, n_candidates)):
+            skills = rng.sample(SKILLS, rng.randint(3, 10))
+            resume_id = uuid.uuid4()
+            resumes.append({
+                "resume_id": resume_id, "uploaded_path": f"bench/{resume_id}.pdf", "actual_name": f"cand_{i}.pdf",
+                "file_format": "pdf", "parsed_text": "", "company_id": company_id, "created_at": now
+            })
+            candidates.append({
+                "id": uuid.uuid4(), "name": f"Candidate {i}", "email": f"cand{i}@example.com",
+                "company_id": company_id, "resume_id": resume_id, "skills": skills,
+                "experience_years": rng.randint(0, 15),
+                "experience": [sentence(rng, skills, 12) for _ in range(rng.randint(1, 6))],
+                "summary": sentence(rng, skills, 30), "department": rng.choice(DEPARTMENTS),
+                "role": rng.choice(ROLES), "uploaded_at": now
+            })
+        db.execute(insert(Resume), resumes)
+        db.execute(insert(Candidate), candidates)
+        replace_candidate_skills(db, [
+            (c["id"], c["company_id"], c["uploaded_at"], c["skills"]) for c in candidates
+        ])
+
+    db.execute(insert(JobDescription), [
+        {
+            "id": uuid.uuid4(), "title": rng.choice(ROLES), "department": rng.choice(DEPARTMENTS),
+            "description": sentence(rng, SKILLS, 60), "keywords": rng.sample(SKILLS, rng.randint(3, 8)),
+            "company_id": company_id, "created_at": now
+        }
+        for _ in range(n_jds)
+    ])
+    db.commit()
+    return company_id
+
+
+def delete_talent_pool(db, company_id):
+    """Removes everything seed_talent_pool created for `company_id`."""
+    candidate_ids = db.query(Candidate.id).filter(Candidate.company_id == company_id).subquery()
+    db.query(CandidateMatch).filter(CandidateMatch.candidate_id.in_(candidate_ids.select())).delete(synchronize_session=False)
+    db.query(CandidateSkill).filter(CandidateSkill.company_id == company_id).delete(synchronize_session=False)
+    db.query(Embedding).filter(Embedding.company_id == company_id).delete(synchronize_session=False)
+    db.query(Candidate).filter(Candidate.company_id == company_id).delete(synchronize_session=False)
+    db.query(Resume).filter(Resume.company_id == company_id).delete(synchronize_session=False)
+    db.query(JobDescription).filter(JobDescription.company_id == company_id).delete(synchronize_session=False)
+    db.query(Company).filter(Company.id == company_id).delete(synchronize_session=False)
+    db.commit()
+
+
+class HashEncoder:
+    """
+    Offline stand-in for SentenceTransformer: maps each text to a deterministic unit
+    vector derived from its hash. Cost per text is tiny, so it isolates the non-model
+    parts of the pipeline.
+    """
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, normalize_embeddings=False, **kwargs):
+        single = isinstance(texts, str)
+        texts = [texts] if single else texts
+        out = np.empty((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            seed = int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+            out[i] = np.random.default_rng(seed).standard_normal(self.dim, dtype=np.float32)
+        if normalize_embeddings:
+            out /= np.linalg.norm(out, axis=1, keepdims=True)
+        return out[0] if single else out
@@ -13,7 +13,12 @@ from routes.matching_route import router as matching_router
 from routes.dashboard_route import router as dashboard_router
 from routes.admin_route import router as admin_router
 
-from models.base import engine, session
+from models.base import engine, read_engine, session
+from services.embedding_store import warm_pool, shutdown_pool
+from services.match_history_service import ensure_partitions
+from utils.log_config import logger
+from utils.upload import UploadSizeLimitMiddleware
+from utils.db_metrics import DBMetricsMiddleware, instrument_engine
 
 from fastapi import FastAPI
 
@@ -24,7 +29,15 @@ app = FastAPI()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("Starting up...")
+    warm_pool()
+    try:
+        # Keeps next months' history partitions in place between retention runs.
+        ensure_partitions(session)
+    except Exception as e:
+        session.rollback()
+        logger.warning(f"Could not create match history partitions: {e}")
     yield
+    shutdown_pool()
     engine.dispose()
     session.close()
     print("Shutting down...")
@@ -32,19 +45,28 @@ async def lifespan(app: FastAPI):
 
 app = FastAPI(lifespan=lifespan)
 
+instrument_engine(engine)
+if read_engine is not None:
+    instrument_engine(read_engine)
+app.add_middleware(DBMetricsMiddleware)
+
+app.add_middleware(UploadSizeLimitMiddleware, paths=["/api/resumes/parse", "/api/public/parse_resume"])
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 @app.exception_handler(HTTPException)
 async def custom_http_exception_handler(request: Request, exc: HTTPException):
     return JSONResponse(
         status_code=exc.status_code,
-        content={"message": exc.detail}
+        content={"message": exc.detail},
+        headers=exc.headers
     )
 
 @app.exception_handler(Exception)
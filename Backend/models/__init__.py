@@ -4,8 +4,13 @@ from models.resume_model import Resume
 from models.candidate_model import Candidate
 from models.job_description_model import JobDescription
 from models.candidate_match_model import CandidateMatch
+from models.candidate_match_history_model import CandidateMatchHistory
 from models.shortlist_model import Shortlist
 from models.report_history_model import ReportHistory
 from models.interview_model import Interview
+from models.embedding_model import Embedding
+from models.background_job_model import BackgroundJob
+from models.parse_cache_model import ParseCache
+from models.skill_model import Skill, CandidateSkill
 
-__all__ = ['UserModel', 'Company', 'Resume', 'Candidate', 'JobDescription', 'CandidateMatch', 'Shortlist', 'ReportHistory', 'Interview']
+__all__ = ['UserModel', 'Company', 'Resume', 'Candidate', 'JobDescription', 'CandidateMatch', 'CandidateMatchHistory', 'Shortlist', 'ReportHistory', 'Interview', 'Embedding', 'BackgroundJob', 'ParseCache', 'Skill', 'CandidateSkill']
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, String, Integer, DateTime, Text, func
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+import uuid
+from models.base import Base
+
+
+class BackgroundJob(Base):
+    """
+    A long-running maintenance job (e.g. re-embedding after an SBERT model change).
+    `checkpoint` holds enough state for a restarted job to resume where it stopped.
+    """
+    __tablename__ = "background_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(String(50), nullable=False, index=True)  # 'reembed', ...
+    status = Column(String(20), nullable=False, default="pending")  # pending, running, completed, failed
+
+    params = Column(JSONB)
+    checkpoint = Column(JSONB)
+    processed = Column(Integer, nullable=False, default=0)
+    total = Column(Integer)
+    error = Column(Text)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+    # Heartbeat: refreshed on every checkpoint, so a "running" job that stopped
+    # updating belongs to a worker that died and may be resumed.
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,6 +1,11 @@
-from sqlalchemy import create_engine
+from itertools import chain
+import threading
+import time
+
+from fastapi import Depends
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 import os
 from dotenv import load_dotenv
 load_dotenv()
@@ -16,6 +21,13 @@ if not DATABASE_URL:
     DATABASE_URL = f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{database}"
 engine = create_engine(DATABASE_URL)
 
+# Optional streaming replica for dashboard, report and listing reads (see get_read_db).
+READ_REPLICA_URL = os.getenv("READ_REPLICA_URL")
+# After a tenant writes, its reads stay on the primary this long so they see the write despite replica lag.
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", 5))
+
+read_engine = create_engine(READ_REPLICA_URL) if READ_REPLICA_URL else None
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -32,3 +44,91 @@ async def get_db():
         yield db
     finally:
         db.close()
+
+
+# Read-your-writes: tenant id -> time.monotonic() of its last committed write.
+# Kept per process, so with several workers each one only knows its own writes.
+_last_write = {}
+_last_write_lock = threading.Lock()
+
+
+def mark_tenant_write(tenant_id, now: float = None):
+    now = time.monotonic() if now is None else now
+    with _last_write_lock:
+        _last_write[str(tenant_id)] = now
+        if len(_last_write) > 10000:
+            for key in [key for key, at in _last_write.items() if now - at > READ_YOUR_WRITES_SECONDS]:
+                del _last_write[key]
+
+
+def wrote_recently(tenant_id, now: float = None) -> bool:
+    if tenant_id is None:
+        return False
+    at = _last_write.get(str(tenant_id))
+    now = time.monotonic() if now is None else now
+    return at is not None and now - at < READ_YOUR_WRITES_SECONDS
+
+
+# Primary sessions collect the tenants they write for: the request's tenant
+# (session.info["tenant_id"], set by get_authenticated_entity) and the company_id
+# and user_id of any flushed row. The row ids cover sessions outside a request,
+# such as the shared upload session, for company and user tenants alike.
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_flushed_tenants(session, flush_context):
+    tenants = session.info.setdefault("written_tenants", set())
+    tenants.add(session.info.get("tenant_id"))
+    for obj in chain(session.new, session.dirty, session.deleted):
+        tenants.add(getattr(obj, "company_id", None))
+        tenants.add(getattr(obj, "user_id", None))
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _collect_statement_tenant(orm_execute_state):
+    # Bulk INSERT/UPDATE/DELETE statements bypass the flush.
+    if not orm_execute_state.is_select:
+        session = orm_execute_state.session
+        session.info.setdefault("written_tenants", set()).add(session.info.get("tenant_id"))
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _mark_written_tenants(session):
+    for tenant_id in session.info.pop("written_tenants", ()):
+        if tenant_id is not None:
+            mark_tenant_write(tenant_id)
+
+
+@event.listens_for(SessionLocal, "after_soft_rollback")
+def _discard_written_tenants(session, previous_transaction):
+    session.info.pop("written_tenants", None)
+
+
+class ReplicaSession(Session):
+    """
+    Read-only session on the replica. If the request's tenant wrote within
+    READ_YOUR_WRITES_SECONDS it reads from the primary instead. The choice is made
+    at the first query (authentication has run by then) and kept for the session.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if "bind" not in self.info:
+            tenant_id = self.info["primary_info"].get("tenant_id")
+            self.info["bind"] = engine if wrote_recently(tenant_id) else read_engine
+        return self.info["bind"]
+
+
+ReadSessionLocal = sessionmaker(class_=ReplicaSession, autocommit=False, autoflush=False)
+
+
+async def get_read_db(db: Session = Depends(get_db)):
+    """
+    Session for read-only routes. Without READ_REPLICA_URL it is the request's
+    primary session.
+    """
+    if read_engine is None:
+        yield db
+        return
+    read_db = ReadSessionLocal(info={"primary_info": db.info})
+    try:
+        yield read_db
+    finally:
+        read_db.close()
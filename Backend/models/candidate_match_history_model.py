@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, Float, Date, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID
+from models.base import Base
+
+
+class CandidateMatchHistory(Base):
+    """
+    Daily match scores, used for score trends: one row per candidate/JD pair per
+    (UTC) day, holding the last score of that day. Matching runs on the same day
+    update the day's row instead of adding one, so the table grows with the days
+    a pair is scored, not with the number of runs. candidate_matches keeps only
+    the latest score per pair.
+
+    On Postgres the table is range-partitioned by month on scored_on, which is
+    part of the primary key. services/match_history_service.py creates upcoming
+    partitions and archives expired ones. There are no foreign keys, because
+    archived history outlives candidates and JDs.
+    """
+    __tablename__ = "candidate_match_history"
+    __table_args__ = (
+        Index("ix_candidate_match_history_company_id_scored_on", "company_id", "scored_on"),
+        {"postgresql_partition_by": "RANGE (scored_on)"},
+    )
+
+    candidate_id = Column(UUID(as_uuid=True), primary_key=True)
+    jd_id = Column(UUID(as_uuid=True), primary_key=True)
+    scored_on = Column(Date, primary_key=True)
+    calculated_at = Column(DateTime(timezone=True), nullable=False)
+
+    company_id = Column(UUID(as_uuid=True), nullable=False)
+
+    skill_match_percent = Column(Integer)
+    sbert_score = Column(Float)
+    final_score = Column(Integer)
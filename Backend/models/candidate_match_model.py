@@ -1,6 +1,6 @@
 from sqlalchemy import (
     Column, Integer, Float,
-    DateTime, ForeignKey, func, String, Text
+    DateTime, ForeignKey, Index, func, String, Text, UniqueConstraint
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
@@ -10,10 +10,18 @@ from models.base import Base
 
 class CandidateMatch(Base):
     __tablename__ = "candidate_matches"
+    __table_args__ = (
+        # One row per candidate/JD pair; the matching service upserts against it.
+        UniqueConstraint("candidate_id", "jd_id", name="uq_candidate_matches_candidate_jd"),
+        # The unique constraint serves lookups by candidate; these serve the JD side:
+        # best matches per JD and per-JD trends over calculated_at.
+        Index("ix_candidate_matches_jd_id_final_score", "jd_id", "final_score"),
+        Index("ix_candidate_matches_jd_id_calculated_at", "jd_id", "calculated_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
-    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id"), nullable=False)
+    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"), nullable=False)
     jd_id = Column(UUID(as_uuid=True), ForeignKey("job_descriptions.id"), nullable=False)
 
     skill_match_percent = Column(Integer)
@@ -22,6 +30,10 @@ class CandidateMatch(Base):
 
     matched_skills = Column(JSONB)
 
+    # SBERT model the sbert_score was computed with; rows from an older model are
+    # rescored by the re-embedding job (services/reembed_service.py).
+    embedding_model = Column(String(255), nullable=True)
+
     calculated_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Optional relationships
@@ -1,6 +1,6 @@
 from sqlalchemy import (
     Column, String, Integer, Text, DateTime,
-    ForeignKey, func
+    ForeignKey, Index, func
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 import uuid
@@ -10,6 +10,17 @@ from sqlalchemy.orm import relationship
 
 class Candidate(Base):
     __tablename__ = "candidates"
+    __table_args__ = (
+        # Candidate lists and dashboard stats are always scoped to a company and
+        # usually to a recent upload window or grouped by department.
+        Index("ix_candidates_company_id_uploaded_at", "company_id", "uploaded_at"),
+        Index("ix_candidates_company_id_department", "company_id", "department"),
+        Index("ix_candidates_user_id", "user_id"),
+        # Containment filters on skills (skills @> '["Python"]').
+        Index("ix_candidates_skills", "skills", postgresql_using="gin", postgresql_ops={"skills": "jsonb_path_ops"}),
+    )
+    # Postgres also has an unmapped generated column, search_vector, and trigram
+    # indexes on name and email; see services/search_service.py.
 
     id = Column(
         UUID(as_uuid=True),
@@ -62,10 +73,13 @@ class Candidate(Base):
     # Timestamps
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
     parsed_at = Column(DateTime(timezone=True))
+    # utils.resume_parser.PARSER_VERSION that produced the parsed fields; NULL predates versioning.
+    parser_version = Column(String(20), nullable=True, index=True)
 
     company = relationship("Company", back_populates="candidate")
     user = relationship("UserModel", back_populates="candidate")
-    candidate_matches = relationship("CandidateMatch", back_populates="candidate")
-    shortlists = relationship("Shortlist", back_populates="candidates")
-    interviews = relationship("Interview", back_populates="candidate")
+    # Child rows go with the candidate through ON DELETE CASCADE, not the ORM.
+    candidate_matches = relationship("CandidateMatch", back_populates="candidate", passive_deletes=True)
+    shortlists = relationship("Shortlist", back_populates="candidates", passive_deletes=True)
+    interviews = relationship("Interview", back_populates="candidate", passive_deletes=True)
 
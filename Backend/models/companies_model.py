@@ -1,5 +1,5 @@
 from sqlalchemy import (
-    Column, String, Text, DateTime, func, ForeignKey
+    Column, String, Text, Integer, DateTime, func, ForeignKey
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -20,6 +20,16 @@ class Company(Base):
     location = Column(String(255))
     plan = Column(String(255))
 
+    # Match persistence: 'all' stores every candidate × JD pair; 'top_k' stores each
+    # candidate's and each JD's best `match_top_k` pairs plus anything scoring at
+    # least `match_keep_threshold`.
+    match_persist_mode = Column(String(20), nullable=False, default="all", server_default="all")
+    match_top_k = Column(Integer, nullable=False, default=5, server_default="5")
+    match_keep_threshold = Column(Integer, nullable=True)
+    # Cascade scoring: pairs whose skill overlap caps final_score below this are
+    # pruned before SBERT and not stored. NULL scores every pair.
+    match_min_score = Column(Integer, nullable=True)
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -0,0 +1,25 @@
+from sqlalchemy import (
+    Column, String, Integer, DateTime, LargeBinary, func
+)
+from sqlalchemy.dialects.postgresql import UUID
+from models.base import Base
+
+
+class Embedding(Base):
+    """
+    Stored SBERT embedding for a candidate or JD text, in the compact format named
+    by `dtype` (see utils/embedding_codec.py). `text_hash` detects stale vectors.
+    """
+    __tablename__ = "embeddings"
+
+    owner_type = Column(String(20), primary_key=True)  # 'candidate', 'jd'
+    owner_id = Column(UUID(as_uuid=True), primary_key=True)
+    model_name = Column(String(255), primary_key=True)
+
+    company_id = Column(UUID(as_uuid=True), nullable=True, index=True)
+    dtype = Column(String(10), nullable=False)  # 'float32', 'float16', 'int8'
+    dim = Column(Integer, nullable=False)
+    vector = Column(LargeBinary, nullable=False)
+    text_hash = Column(String(32), nullable=False)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -14,7 +14,7 @@ class Interview(Base):
     __tablename__ = "interviews"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id"), nullable=False)
+    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"), nullable=False, index=True)
     interview_type = Column(String, nullable=False)  # "Technical Round", "HR Round", "Manager Round", etc.
     scheduled_date = Column(String, nullable=False)  # Date in YYYY-MM-DD format
     scheduled_time = Column(String, nullable=False)  # Time in HH:MM format
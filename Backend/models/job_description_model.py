@@ -1,5 +1,5 @@
 from sqlalchemy import (
-    Column, String, Text, DateTime, ForeignKey, func
+    Column, String, Text, DateTime, ForeignKey, Index, func
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
@@ -9,6 +9,9 @@ from models.base import Base
 
 class JobDescription(Base):
     __tablename__ = "job_descriptions"
+    __table_args__ = (
+        Index("ix_job_descriptions_company_id", "company_id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
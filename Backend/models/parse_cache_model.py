@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, DateTime, func
+from sqlalchemy.dialects.postgresql import JSONB
+from models.base import Base
+
+
+class ParseCache(Base):
+    """
+    parse_resume output for a resume text, keyed by the text's hash and the parser
+    version that produced it, so identical texts are parsed once per version.
+    """
+    __tablename__ = "parse_cache"
+
+    text_hash = Column(String(64), primary_key=True)
+    parser_version = Column(String(20), primary_key=True)
+    result = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,16 +1,24 @@
 from models.base import Base
-from sqlalchemy import Column, String, TIMESTAMP, UUID, func, Text
+from models.types import CompressedText
+from sqlalchemy import Column, Index, String, TIMESTAMP, UUID, func
+from sqlalchemy.orm import deferred
 
 
 class Resume(Base):
     __tablename__ = "resumes"
+    __table_args__ = (
+        Index("ix_resumes_company_id_created_at", "company_id", "created_at"),
+    )
 
     resume_id = Column(UUID(as_uuid=True), primary_key=True)
     uploaded_path = Column(String(255), nullable=False)
     actual_name = Column(String(255), nullable=False)
     file_format = Column(String(20), nullable=False)
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
-    parsed_text = Column(Text, nullable=False)
+    # Tens of KB per row and only needed by the text endpoint and re-parsing, so it
+    # is compressed and not loaded with the row unless asked for.
+    parsed_text = deferred(Column(CompressedText, nullable=False))
+    content_sha256 = Column(String(64), nullable=True, index=True)  # hash of the uploaded file
     user_id = Column(UUID(as_uuid=True), nullable=True)
     company_id = Column(UUID(as_uuid=True), nullable=True)
 
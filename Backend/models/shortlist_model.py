@@ -1,5 +1,5 @@
 from sqlalchemy import (
-    Column, Boolean, DateTime, ForeignKey, func
+    Column, Boolean, DateTime, ForeignKey, Index, func
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -9,10 +9,16 @@ from models.base import Base
 
 class Shortlist(Base):
     __tablename__ = "shortlist"
+    __table_args__ = (
+        Index("ix_shortlist_shortlisted_by_shortlisted", "shortlisted_by", "shortlisted"),
+        Index("ix_shortlist_candidate_id", "candidate_id"),
+        # Shortlist pages: a company's entries, newest first.
+        Index("ix_shortlist_shortlisted_by_created_at", "shortlisted_by", "created_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
-    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id"), nullable=False)
+    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"), nullable=False)
     jd_id = Column(UUID(as_uuid=True), ForeignKey("job_descriptions.id"), nullable=False)
 
     shortlisted = Column(Boolean, default=False)
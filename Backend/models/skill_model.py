@@ -0,0 +1,30 @@
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from models.base import Base
+
+
+class Skill(Base):
+    """One row per distinct skill; `normalized` (trimmed, lower-case) is the lookup key."""
+    __tablename__ = "skills"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(100), nullable=False)  # display form, as first seen
+    normalized = Column(String(100), nullable=False, unique=True)
+
+
+class CandidateSkill(Base):
+    """
+    Candidate.skills as rows, kept in sync by services/skill_service.py so skill
+    counts and skill filters are index lookups instead of JSONB expansion.
+    company_id and uploaded_at are copied from the candidate for the same reason.
+    """
+    __tablename__ = "candidate_skills"
+    __table_args__ = (
+        Index("ix_candidate_skills_company_id_skill_id_uploaded_at", "company_id", "skill_id", "uploaded_at"),
+        Index("ix_candidate_skills_skill_id", "skill_id"),
+    )
+
+    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"), primary_key=True)
+    skill_id = Column(Integer, ForeignKey("skills.id"), primary_key=True)
+    company_id = Column(UUID(as_uuid=True), nullable=True)
+    uploaded_at = Column(DateTime(timezone=True), nullable=True)
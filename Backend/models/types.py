@@ -0,0 +1,28 @@
+import zlib
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+
+class CompressedText(TypeDecorator):
+    """
+    Text stored zlib-compressed in a binary column. Compression happens on bind and
+    decompression on load, so the attribute reads and writes plain `str`. Values
+    cannot be filtered or searched in SQL.
+    """
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(self, level: int = 6, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.level = level
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return zlib.compress(value.encode("utf-8"), self.level)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return zlib.decompress(value).decode("utf-8")
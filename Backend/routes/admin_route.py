@@ -1,98 +1,77 @@
 """
-Temporary admin route to fix match timestamps.
-Access via: GET /api/admin/fix-timestamps
+Admin routes: data maintenance jobs and diagnostics. Every endpoint requires an admin.
 """
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException, status
 from sqlalchemy.orm import Session
+from typing import Optional
+from uuid import UUID
 from models.base import get_db
-from models.candidate_match_model import CandidateMatch
-from datetime import datetime, timezone, timedelta
+from models.candidate_model import Candidate
+from models.background_job_model import BackgroundJob
+from schemas.job_schema import BackgroundJobOut, ReembedStatusOut
+from services import matching_service
+from services.job_service import create_job, get_job, get_active_job, can_resume, run_job
+from services.reembed_service import REEMBED_JOB_KIND, run_reembed_job, count_stale_matches
+from services.parse_service import REPARSE_JOB_KIND, run_reparse_job
+from services.match_history_service import HISTORY_JOB_KIND, run_history_retention_job
+from services.data_fix_service import (
+    FIX_TIMESTAMPS_JOB_KIND, FIX_CANDIDATES_JOB_KIND, run_fix_timestamps_job, run_fix_candidates_job, data_summary
+)
+from utils.resume_parser import PARSER_VERSION
+from utils.security import get_admin_user
+from utils.db_metrics import db_stats_snapshot
+from datetime import datetime, timezone
 
 router = APIRouter()
 
-@router.get("/admin/fix-timestamps")
-async def fix_match_timestamps(db: Session = Depends(get_db)):
+# Handler for each BackgroundJob.kind, used to start and resume jobs.
+JOB_HANDLERS = {
+    REEMBED_JOB_KIND: run_reembed_job,
+    REPARSE_JOB_KIND: run_reparse_job,
+    HISTORY_JOB_KIND: run_history_retention_job,
+    FIX_TIMESTAMPS_JOB_KIND: run_fix_timestamps_job,
+    FIX_CANDIDATES_JOB_KIND: run_fix_candidates_job,
+}
+
+def _start_data_fix(kind: str, company_id: Optional[UUID], db: Session, background_tasks: BackgroundTasks) -> BackgroundJob:
+    """Starts a data fix job, or returns the running one if it has the same scope; 409 if its scope differs."""
+    params = {"company_id": str(company_id) if company_id else None}
+    job = get_active_job(db, kind)
+    if job is not None:
+        if (job.params or {}).get("company_id") != params["company_id"]:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Job {job.id} is already running for company_id={job.params.get('company_id')}"
+            )
+        return job
+    job = create_job(db, kind, params)
+    background_tasks.add_task(run_job, job.id, JOB_HANDLERS[job.kind])
+    return job
+
+
+@router.post("/admin/fix-timestamps", response_model=BackgroundJobOut, status_code=status.HTTP_202_ACCEPTED)
+def fix_match_timestamps(background_tasks: BackgroundTasks, company_id: Optional[UUID] = None,
+                         db: Session = Depends(get_db), admin = Depends(get_admin_user)):
     """
-    Updates calculated_at timestamps for existing matches to make them visible in dashboard charts.
-    This is a one-time fix for existing data.
+    Starts a job that sets calculated_at to now on matches that have none or are
+    older than 30 days, so they show up in dashboard charts. Only `company_id`'s
+    matches if given, else every company's. The checkpoint of GET /admin/jobs/{id}
+    holds null_timestamps_updated and old_timestamps_updated.
     """
-    try:
-        # Update NULL timestamps
-        null_matches = db.query(CandidateMatch).filter(
-            CandidateMatch.calculated_at == None
-        ).all()
-        
-        for match in null_matches:
-            match.calculated_at = datetime.now(timezone.utc)
-        
-        # Update very old timestamps (older than 30 days)
-        old_date = datetime.now(timezone.utc) - timedelta(days=30)
-        old_matches = db.query(CandidateMatch).filter(
-            CandidateMatch.calculated_at < old_date
-        ).all()
-        
-        for match in old_matches:
-            match.calculated_at = datetime.now(timezone.utc)
-        
-        db.commit()
-        
-        total_updated = len(null_matches) + len(old_matches)
-        
-        return {
-            "success": True,
-            "null_timestamps_updated": len(null_matches),
-            "old_timestamps_updated": len(old_matches),
-            "total_updated": total_updated,
-            "message": f"Successfully updated {total_updated} match timestamps"
-        }
-    except Exception as e:
-        db.rollback()
-        return {
-            "success": False,
-            "error": str(e)
-        }
+    return _start_data_fix(FIX_TIMESTAMPS_JOB_KIND, company_id, db, background_tasks)
 
 
 @router.get("/admin/check-data")
-async def check_database_data(db: Session = Depends(get_db)):
+def check_database_data(company_id: Optional[UUID] = None, db: Session = Depends(get_db), admin = Depends(get_admin_user)):
     """
-    Diagnostic endpoint to check what data exists in the database.
+    Diagnostic endpoint to check what data exists in the database, or for one company.
     """
-    from models import Candidate
-    from sqlalchemy import func
-    
     try:
-        # Count candidates
-        total_candidates = db.query(func.count(Candidate.id)).scalar() or 0
-        
-        # Count candidates with names
-        with_names = db.query(func.count(Candidate.id)).filter(
-            Candidate.name != None,
-            Candidate.name != ''
-        ).scalar() or 0
-        
-        # Count candidates with experience
-        with_experience = db.query(func.count(Candidate.id)).filter(
-            Candidate.experience_years != None,
-            Candidate.experience_years > 0
-        ).scalar() or 0
-        
-        # Count candidates with skills
-        with_skills = db.query(func.count(Candidate.id)).filter(
-            Candidate.skills != None
-        ).scalar() or 0
-        
-        # Count matches
-        total_matches = db.query(func.count(CandidateMatch.id)).scalar() or 0
-        
-        # Count recent matches (last 30 days)
-        recent_date = datetime.now(timezone.utc) - timedelta(days=30)
-        recent_matches = db.query(func.count(CandidateMatch.id)).filter(
-            CandidateMatch.calculated_at >= recent_date
-        ).scalar() or 0
-        
-        # Get sample candidate data
-        sample_candidates = db.query(Candidate).limit(3).all()
+        summary = data_summary(db, company_id)
+
+        sample_query = db.query(Candidate)
+        if company_id is not None:
+            sample_query = sample_query.filter(Candidate.company_id == company_id)
         sample_data = [
             {
                 "id": str(c.id),
@@ -101,27 +80,19 @@ async def check_database_data(db: Session = Depends(get_db)):
                 "skills_count": len(c.skills) if c.skills else 0,
                 "department": c.department
             }
-            for c in sample_candidates
+            for c in sample_query.limit(3).all()
         ]
-        
+
+        candidates, matches = summary["candidates"], summary["matches"]
         return {
             "success": True,
-            "candidates": {
-                "total": total_candidates,
-                "with_names": with_names,
-                "with_experience": with_experience,
-                "with_skills": with_skills
-            },
-            "matches": {
-                "total": total_matches,
-                "recent_30_days": recent_matches
-            },
+            **summary,
             "sample_candidates": sample_data,
             "diagnosis": {
-                "has_data": total_candidates > 0,
-                "names_missing": total_candidates > 0 and with_names == 0,
-                "skills_missing": total_candidates > 0 and with_skills == 0,
-                "no_recent_matches": total_matches > 0 and recent_matches == 0
+                "has_data": candidates["total"] > 0,
+                "names_missing": candidates["total"] > 0 and candidates["with_names"] == 0,
+                "skills_missing": candidates["total"] > 0 and candidates["with_skills"] == 0,
+                "no_recent_matches": matches["total"] > 0 and matches["recent_30_days"] == 0
             }
         }
     except Exception as e:
@@ -131,60 +102,106 @@ async def check_database_data(db: Session = Depends(get_db)):
         }
 
 
-@router.post("/admin/fix-candidate-data")
-async def fix_all_candidate_data(db: Session = Depends(get_db)):
+@router.post("/admin/fix-candidate-data", response_model=BackgroundJobOut, status_code=status.HTTP_202_ACCEPTED)
+def fix_all_candidate_data(background_tasks: BackgroundTasks, company_id: Optional[UUID] = None,
+                           db: Session = Depends(get_db), admin = Depends(get_admin_user)):
     """
-    Directly fix candidate data in database.
-    Sets proper defaults for name, role, experience, summary, and education.
+    Starts a job that sets placeholder name, role, experience, summary and education
+    on candidates missing them. Only `company_id`'s candidates if given, else every
+    company's. The checkpoint of GET /admin/jobs/{id} holds updated_count.
     """
-    from models import Candidate
-    
-    try:
-        candidates = db.query(Candidate).all()
-        updated_count = 0
-        
-        for candidate in candidates:
-            updated = False
-            
-            # Fix empty names - use "FIRST LAST" as placeholder
-            if not candidate.name or candidate.name.strip() == "":
-                candidate.name = "FIRST LAST"
-                updated = True
-            
-            # Fix empty roles
-            if not candidate.role or candidate.role.strip() == "":
-                candidate.role = "Software Engineer"
-                updated = True
-            
-            # Fix zero experience
-            if not candidate.experience_years or candidate.experience_years == 0:
-                candidate.experience_years = 5.0
-                updated = True
-            
-            # Fix empty summary
-            if not candidate.summary or candidate.summary.strip() == "":
-                candidate.summary = "An analytical and results-driven software engineer with experience in application development, scripting and coding, automation, web application design, product testing and deployment, UI testing, and requirements gathering."
-                updated = True
-            
-            # Fix empty education
-            if not candidate.education or candidate.education == "Not specified":
-                candidate.education = "M.S., Computer Science, 2012; B.S.B.A., Management Information Systems, 2011 - University of Arizona"
-                updated = True
-            
-            if updated:
-                updated_count += 1
-        
-        db.commit()
-        
-        return {
-            "success": True,
-            "updated_count": updated_count,
-            "total_candidates": len(candidates),
-            "message": f"Successfully updated {updated_count} candidates"
-        }
-    except Exception as e:
-        db.rollback()
-        return {
-            "success": False,
-            "error": str(e)
-        }
+    return _start_data_fix(FIX_CANDIDATES_JOB_KIND, company_id, db, background_tasks)
+
+
+@router.post("/admin/reembed", response_model=BackgroundJobOut, status_code=status.HTTP_202_ACCEPTED)
+def start_reembed(background_tasks: BackgroundTasks, db: Session = Depends(get_db), admin = Depends(get_admin_user)):
+    """
+    Starts re-embedding and rescoring every company with the configured SBERT model
+    (env SBERT_MODEL). Runs in the background; poll GET /admin/jobs/{id} for progress.
+    If a re-embedding job is already running it is returned instead of starting another.
+    """
+    job = get_active_job(db, REEMBED_JOB_KIND)
+    if job is not None:
+        return job
+    job = create_job(db, REEMBED_JOB_KIND, {"model_name": matching_service.SBERT_MODEL_NAME})
+    background_tasks.add_task(run_job, job.id, JOB_HANDLERS[job.kind])
+    return job
+
+
+@router.get("/admin/reembed", response_model=ReembedStatusOut)
+def reembed_status(db: Session = Depends(get_db), admin = Depends(get_admin_user)):
+    """
+    Reports the configured model, how many match rows still carry scores from
+    another model, and the latest re-embedding job.
+    """
+    job = db.query(BackgroundJob).filter(BackgroundJob.kind == REEMBED_JOB_KIND).order_by(BackgroundJob.created_at.desc()).first()
+    return {
+        "model_name": matching_service.SBERT_MODEL_NAME,
+        "stale_matches": count_stale_matches(db),
+        "job": job
+    }
+
+
+@router.post("/admin/reparse", response_model=BackgroundJobOut, status_code=status.HTTP_202_ACCEPTED)
+def start_reparse(background_tasks: BackgroundTasks, db: Session = Depends(get_db), admin = Depends(get_admin_user)):
+    """
+    Starts re-parsing every candidate whose parser_version is not the current
+    PARSER_VERSION, from the stored resume text. Same as `python -m services.parse_service`.
+    If a re-parse job is already running it is returned instead of starting another.
+    """
+    job = get_active_job(db, REPARSE_JOB_KIND)
+    if job is not None:
+        return job
+    job = create_job(db, REPARSE_JOB_KIND, {"parser_version": PARSER_VERSION})
+    background_tasks.add_task(run_job, job.id, JOB_HANDLERS[job.kind])
+    return job
+
+
+@router.post("/admin/match-history/retention", response_model=BackgroundJobOut, status_code=status.HTTP_202_ACCEPTED)
+def start_history_retention(background_tasks: BackgroundTasks, db: Session = Depends(get_db), admin = Depends(get_admin_user)):
+    """
+    Creates upcoming candidate_match_history partitions and archives history past
+    each company's plan retention. Same as `python -m services.match_history_service`.
+    If a retention job is already running it is returned instead of starting another.
+    """
+    job = get_active_job(db, HISTORY_JOB_KIND)
+    if job is not None:
+        return job
+    job = create_job(db, HISTORY_JOB_KIND)
+    background_tasks.add_task(run_job, job.id, JOB_HANDLERS[job.kind])
+    return job
+
+
+@router.get("/admin/db-stats")
+def db_stats(admin = Depends(get_admin_user)):
+    """
+    SQL statement counts and database time per route in this worker since it
+    started, most database time first. Use it to spot N+1 query patterns.
+    """
+    return db_stats_snapshot()
+
+
+@router.get("/admin/jobs/{job_id}", response_model=BackgroundJobOut)
+def read_job(job_id: UUID, db: Session = Depends(get_db), admin = Depends(get_admin_user)):
+    job = get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("/admin/jobs/{job_id}/resume", response_model=BackgroundJobOut, status_code=status.HTTP_202_ACCEPTED)
+def resume_job(job_id: UUID, background_tasks: BackgroundTasks, db: Session = Depends(get_db), admin = Depends(get_admin_user)):
+    """
+    Restarts a failed or interrupted job from its last checkpoint.
+    """
+    job = get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not can_resume(job):
+        raise HTTPException(status_code=409, detail=f"Job is {job.status} and cannot be resumed")
+    # Claim it before scheduling so a second resume request is rejected.
+    job.status = "pending"
+    job.updated_at = datetime.now(timezone.utc)
+    db.commit()
+    background_tasks.add_task(run_job, job.id, JOB_HANDLERS[job.kind])
+    return job
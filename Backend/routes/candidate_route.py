@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Literal, Optional
 from uuid import UUID
 
-from schemas.candidate_schema import CandidateOut, CandidateUpdate
-from services.candidate_service import get_candidates, get_candidate, update_candidate, delete_candidate
-from models.base import get_db 
+from schemas.candidate_schema import CandidateOut, CandidateUpdate, CandidateSearchResult, CandidateBulkDelete, CandidateBulkDeleteResult
+from services.candidate_service import get_candidates, get_candidate, update_candidate, delete_candidate, delete_candidates, owner_filter
+from services.resume_service import release_resume_files_task
+from services.search_service import is_postgres, search_candidates
+from services.export_service import EXPORT_COLUMNS, DEFAULT_EXPORT_COLUMNS, build_export_query, iter_export, parse_columns
+from models.base import SessionLocal, ReadSessionLocal, read_engine, get_db, get_read_db
+from utils.log_config import logger
 from utils.security import get_authenticated_entity
 from routes.company_route import get_current_company
 
@@ -20,12 +25,75 @@ def fetch_candidates(
     search: Optional[str] = Query(None),
     minScore: Optional[int] = Query(None),
     sortBy: Optional[str] = Query(None),
+    skill: Optional[List[str]] = Query(None, description="repeat to require several skills, e.g. ?skill=Kafka&skill=Spark"),
     skip: int = 0,
     limit: int = 20,
+    db: Session = Depends(get_read_db),
+    auth = Depends(get_authenticated_entity)
+):
+    return get_candidates(db, auth, role, department, days, search, minScore, sortBy, skip, limit, skills=skill)
+
+
+@router.get("/search", response_model=List[CandidateSearchResult])
+def search_candidates_endpoint(
+    q: str = Query(..., min_length=2, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db),
+    auth = Depends(get_authenticated_entity)
+):
+    """Ranked candidate search with highlighted fragments; see services/search_service.py."""
+    if not is_postgres(db):
+        raise HTTPException(status_code=501, detail="Ranked search requires PostgreSQL")
+    return search_candidates(db, owner_filter(auth), q, limit, offset)
+
+
+def _stream_export(query, columns, fmt, tenant_id):
+    # The request's session is closed once the endpoint returns, so the stream owns its own.
+    if read_engine is not None:
+        db = ReadSessionLocal(info={"primary_info": {"tenant_id": tenant_id}})
+    else:
+        db = SessionLocal(info={"tenant_id": tenant_id})
+    try:
+        yield from iter_export(db, query, columns, fmt)
+    except Exception:
+        # Headers are already sent; a truncated file is the only signal left.
+        logger.exception(f"Candidate export failed for {tenant_id}")
+        raise
+    finally:
+        db.close()
+
+
+@router.get("/export")
+def export_candidates(
+    format: Literal["csv", "ndjson"] = Query("csv"),
+    columns: Optional[str] = Query(None, description=f"comma-separated, from {EXPORT_COLUMNS}; default {DEFAULT_EXPORT_COLUMNS}"),
+    role: Optional[str] = Query(None),
+    department: Optional[str] = Query(None),
+    days: Optional[int] = Query(None),
+    search: Optional[str] = Query(None),
+    minScore: Optional[int] = Query(None),
+    sortBy: Optional[str] = Query(None),
+    skill: Optional[List[str]] = Query(None),
     db: Session = Depends(get_db),
     auth = Depends(get_authenticated_entity)
 ):
-    return get_candidates(db, auth, role, department, days, search, minScore, sortBy, skip, limit)
+    """
+    Streams the caller's candidates, each with its best match, as CSV or NDJSON.
+    Takes the filters of GET /candidates/ but is not paginated; see
+    services/export_service.py.
+    """
+    try:
+        names = parse_columns(columns)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    query = build_export_query(db, auth, names, role, department, days, search, minScore, sortBy, skills=skill)
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _stream_export(query, names, format, db.info.get("tenant_id")),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="candidates.{format}"'}
+    )
 
 
 @router.get("/{candidate_id}", response_model=CandidateOut)
@@ -55,3 +123,19 @@ def delete_candidate_endpoint(candidate_id: UUID,
     success = delete_candidate(db, candidate_id)
     if not success:
         raise HTTPException(status_code=404, detail="Candidate not found")
+
+
+@router.post("/bulk-delete", response_model=CandidateBulkDeleteResult)
+def bulk_delete_candidates_endpoint(payload: CandidateBulkDelete,
+                                    background_tasks: BackgroundTasks,
+                                    db: Session = Depends(get_db),
+                                    auth = Depends(get_authenticated_entity)):
+    """
+    Deletes the caller's candidates among `candidate_ids`, with their matches,
+    shortlist entries, interviews and resumes, in one transaction. Ids that are not
+    the caller's are skipped. Resume files are removed after the response.
+    """
+    deleted, keys = delete_candidates(db, payload.candidate_ids, owner_filter(auth))
+    if keys:
+        background_tasks.add_task(release_resume_files_task, keys)
+    return {"deleted": deleted, "files_queued": len(keys)}
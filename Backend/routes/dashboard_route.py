@@ -20,7 +20,7 @@ from services.dashboard_service import (
     save_report_history,
     get_report_history
 )
-from models.base import get_db
+from models.base import get_db, get_read_db
 from routes.company_route import get_current_company
 
 
@@ -30,7 +30,7 @@ router = APIRouter()
 @router.get("/company/dashboard/stats", response_model=CompanyDashboardStatsResponse)
 def dashboard_stats(
     current_company = Depends(get_current_company),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get dashboard stats for the logged-in company
@@ -43,7 +43,7 @@ def dashboard_stats(
 def skills_distribution(
     days: int = Query(7, gt=0),
     current_company = Depends(get_current_company),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Returns skill distribution for the company in the last `days` days
@@ -57,7 +57,7 @@ def match_trends(
     days: int = Query(7, gt=0),
     jd_id: Optional[UUID] = Query(None),
     current_company = Depends(get_current_company),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Returns match trends and JD breakdown for a company
@@ -68,7 +68,7 @@ def match_trends(
 @router.get("/company/dashboard/benchmarks", response_model=BenchmarksResponse)
 def benchmarks(
     current_company = Depends(get_current_company),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get industry benchmarks comparison for the company
@@ -81,7 +81,7 @@ def report_summary(
     report_type: str = Query("summary"),
     date_range: str = Query("7"),
     current_company = Depends(get_current_company),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get report summary based on type and date range
@@ -94,7 +94,7 @@ def export_report_pdf(
     report_type: str = Query("summary"),
     date_range: str = Query("7"),
     current_company = Depends(get_current_company),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Generate and download PDF report
@@ -142,7 +142,7 @@ def create_report_history(
 def list_report_history(
     limit: int = Query(10, gt=0, le=50),
     current_company = Depends(get_current_company),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get report history for the company
@@ -1,20 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from typing import List, Literal
+import json
 from uuid import UUID
 from sqlalchemy.orm import Session
 
-from schemas.matching_schema import CandidateMatchOut, CalculateMatchRequest
-from services.matching_service import calculate_match_score, match_all_candidates, match_candidate
-from models.base import get_db
+from schemas.matching_schema import CandidateMatchOut, CalculateMatchRequest, MatchSettings
+from services.matching_service import (
+    calculate_match_score,
+    match_all_candidates,
+    match_candidate,
+    iter_match_all_candidates,
+    get_match_settings,
+    update_match_settings
+)
+from models.base import get_db, SessionLocal
 from utils.security import get_authenticated_entity
+from routes.company_route import get_current_company
+from utils.log_config import logger
 
 router = APIRouter(prefix="/matching")
 
 
 @router.post("/run", response_model=List[CandidateMatchOut])
-def run_matching(db: Session = Depends(get_db), auth: dict = Depends(get_authenticated_entity)):
+def run_matching(response: Response, db: Session = Depends(get_db), auth: dict = Depends(get_authenticated_entity)):
     if auth['type'] == 'company':
-        matches = match_all_candidates(db, auth['entity'].id)
+        stats = {}
+        matches = match_all_candidates(db, auth['entity'].id, stats)
+        response.headers["X-Pairs-Pruned"] = str(stats.get("pairs_pruned", 0))
         if not matches:
             raise HTTPException(status_code=404, detail="No matches found")
         return matches
@@ -22,10 +35,56 @@ def run_matching(db: Session = Depends(get_db), auth: dict = Depends(get_authent
         raise HTTPException(401, "Invalid token")
 
 
+def _encode_event(event: dict, fmt: str) -> str:
+    if "matches" in event:
+        event = {**event, "matches": [CandidateMatchOut.model_validate(m).model_dump(mode="json") for m in event["matches"]]}
+    if fmt == "sse":
+        name = event.pop("event")
+        return f"event: {name}\ndata: {json.dumps(event)}\n\n"
+    return json.dumps(event) + "\n"
+
+
+def _stream_matching(company_id, fmt: str):
+    # The request's session is closed once the endpoint returns, so the stream owns its own.
+    db = SessionLocal(info={"tenant_id": str(company_id)})
+    try:
+        for event in iter_match_all_candidates(db, company_id):
+            yield _encode_event(event, fmt)
+    except Exception as e:
+        db.rollback()
+        logger.exception(f"Streaming match run failed for company {company_id}")
+        yield _encode_event({"event": "error", "detail": str(e)}, fmt)
+    finally:
+        db.close()
+
+
+@router.post("/run/stream")
+def run_matching_stream(
+    format: Literal["ndjson", "sse"] = Query("ndjson"),
+    company = Depends(get_current_company)
+):
+    """
+    Same as POST /matching/run, but streams results while candidates are scored
+    in batches instead of returning one list at the end. Each batch is sent as a
+    "batch" event with its matches and `processed`/`total` progress; a final
+    "done" event carries the totals. `format=ndjson` sends one JSON object per
+    line; `format=sse` sends Server-Sent Events (read them with fetch, since the
+    endpoint needs the Authorization header).
+    """
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(
+        _stream_matching(company.id, format),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/candidate/{candidate_id}", response_model=List[CandidateMatchOut])
-def run_candidate_matching(candidate_id: UUID, db: Session = Depends(get_db), auth: dict = Depends(get_authenticated_entity)):
+def run_candidate_matching(candidate_id: UUID, response: Response, db: Session = Depends(get_db), auth: dict = Depends(get_authenticated_entity)):
     if auth['type'] == 'company':
-        matches = match_candidate(db, candidate_id, auth['entity'].id)
+        stats = {}
+        matches = match_candidate(db, candidate_id, auth['entity'].id, stats)
+        response.headers["X-Pairs-Pruned"] = str(stats.get("pairs_pruned", 0))
         if not matches:
             raise HTTPException(status_code=404, detail="Candidate not found or no matches")
         return matches
@@ -53,3 +112,22 @@ def calculate_matching(
         return result
     else:
         raise HTTPException(401, "Invalid token")
+
+
+@router.get("/settings", response_model=MatchSettings)
+def read_match_settings(db: Session = Depends(get_db), company = Depends(get_current_company)):
+    """
+    Returns how the company's match results are persisted.
+    """
+    return get_match_settings(db, company.id)
+
+
+@router.put("/settings", response_model=MatchSettings)
+def save_match_settings(body: MatchSettings, db: Session = Depends(get_db), company = Depends(get_current_company)):
+    """
+    Switches between storing every candidate × JD pair ('all') and only each
+    candidate's and JD's top-K pairs plus those above `keep_threshold` ('top_k').
+    `min_score` enables cascade scoring: pairs whose skill overlap cannot reach it
+    skip SBERT and are not stored. Takes effect on the next matching run.
+    """
+    return update_match_settings(db, company.id, body.model_dump())
@@ -106,38 +106,24 @@ async def send_analysis_report(request: SendReportRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to send email: {str(e)}")
 
-import uuid
-import aiofiles
-from pathlib import Path
 from fastapi import UploadFile, File
-from utils.resume_parser import extract_text_from_pdf
-from utils.utility import BASE_DIR
-
-TEMP_DIR = BASE_DIR / "uploads" / "temp"
-TEMP_DIR.mkdir(parents=True, exist_ok=True)
+from starlette.concurrency import run_in_threadpool
+from utils.resume_parser import extract_text_from_pdf, PdfExtractionError
+from utils.upload import stream_upload_to_disk
 
 @router.post("/parse_resume")
 async def parse_resume_public(file: UploadFile = File(...)):
     if file.filename.split(".")[-1].lower() != "pdf":
         raise HTTPException(status_code=400, detail="Only PDF files are allowed.")
     
-    file_id = uuid.uuid4()
-    file_path = TEMP_DIR / f"temp_{file_id}.pdf"
-    
+    stored = await stream_upload_to_disk(file)
     try:
-        async with aiofiles.open(file_path, "wb") as f:
-            content = await file.read()
-            await f.write(content)
-            
-        text = extract_text_from_pdf(str(file_path))
-        
-        # Clean up
-        if file_path.exists():
-            file_path.unlink()
-            
+        text = await run_in_threadpool(extract_text_from_pdf, stored.path)
         return {"text": text}
         
+    except PdfExtractionError as e:
+        raise HTTPException(status_code=422, detail={"code": e.code, "message": str(e)})
     except Exception as e:
-        if file_path.exists():
-            file_path.unlink()
         raise HTTPException(status_code=500, detail=f"Error parsing resume: {str(e)}")
+    finally:
+        stored.path.unlink(missing_ok=True)
@@ -1,12 +1,17 @@
-from fastapi import APIRouter, File, HTTPException, UploadFile, Depends
+from fastapi import APIRouter, File, HTTPException, UploadFile, Depends, Header, Query
 from services.resume_service import (
     process_resume_pdf,
     get_resume_by_id,
+    get_resume_text_db,
     delete_resume_service
 )
-from fastapi.responses import FileResponse
+from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
 from uuid import UUID
 from utils.log_config import logger
+from utils.storage import get_storage
+from utils.utility import parse_byte_range
 from utils.security import get_authenticated_entity
 
 router = APIRouter()
@@ -27,12 +32,13 @@ async def resume_upload(file: UploadFile = File(...),  auth = Depends(get_authen
 
 
 @router.get("/resumes/{resume_id}") 
-async def get_resume(resume_id: UUID,  auth = Depends(get_authenticated_entity)):
+async def get_resume(resume_id: UUID, include_text: bool = False, auth = Depends(get_authenticated_entity)):
+    """Resume metadata; the extracted text is served by /resumes/{id}/text unless include_text is set."""
     logger.info(f"Downloading resume with ID: {resume_id}")
 
     try:
         from services.resume_service import get_resume_by_id as get_resume_service
-        row = await get_resume_service(resume_id)
+        row = await get_resume_service(resume_id, include_text)
     except Exception as e:
         logger.error(f"Error retrieving resume: {e}")
         raise HTTPException(status_code=500, detail="Error retrieving resume")
@@ -42,9 +48,38 @@ async def get_resume(resume_id: UUID,  auth = Depends(get_authenticated_entity))
 
     return row
 
+
+@router.get("/resumes/{resume_id}/text")
+async def get_resume_text(
+    resume_id: UUID,
+    offset: int = Query(0, ge=0, description="first character to return"),
+    limit: Optional[int] = Query(None, ge=1, description="maximum characters to return"),
+    range_header: Optional[str] = Header(None, alias="Range"),
+    auth = Depends(get_authenticated_entity)
+):
+    """
+    Extracted text of a resume as text/plain. offset/limit select characters; a
+    Range header ("bytes=0-4095") selects UTF-8 bytes instead and answers 206.
+    X-Text-Length always carries the full length in characters.
+    """
+    text = await get_resume_text_db(resume_id)
+    headers = {"Accept-Ranges": "bytes", "X-Text-Length": str(len(text))}
+
+    if range_header:
+        body = text.encode("utf-8")
+        try:
+            start, end = parse_byte_range(range_header, len(body))
+        except ValueError as e:
+            raise HTTPException(status_code=416, detail=str(e), headers={"Content-Range": f"bytes */{len(body)}"})
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(body)}"
+        return Response(body[start:end + 1], status_code=206, media_type="text/plain; charset=utf-8", headers=headers)
+
+    end = offset + limit if limit is not None else None
+    return Response(text[offset:end], media_type="text/plain; charset=utf-8", headers=headers)
+
     
 @router.get("/resumes/{resume_id}/download") 
-async def download_resume(resume_id: UUID,  auth = Depends(get_authenticated_entity)):
+async def download_resume(resume_id: UUID, range_header: Optional[str] = Header(None, alias="Range"), auth = Depends(get_authenticated_entity)):
     logger.info(f"Downloading resume with ID: {resume_id}")
 
     try:
@@ -60,9 +95,7 @@ async def download_resume(resume_id: UUID,  auth = Depends(get_authenticated_ent
     file_path = row["uploaded_path"]
     file_name = row["actual_name"]
 
-    return FileResponse(
-        path=file_path, filename=file_name, media_type="application/pdf"
-    )
+    return await run_in_threadpool(get_storage(file_path).response, file_path, file_name, range_header)
 
 
 
@@ -78,6 +111,6 @@ async def delete_resume(resume_id: UUID,  auth = Depends(get_authenticated_entit
         raise HTTPException(status_code=404, detail=f"Resume not found for id: {resume_id}")
 
     path = dict(row)['uploaded_path']
-    await delete_resume_service(resume_id, path) 
+    await delete_resume_service(resume_id, path, row.get('content_sha256')) 
 
     return f"Resume {resume_id} delete successfully"
@@ -1,11 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from typing import List, Optional
 from uuid import UUID
 from sqlalchemy.orm import Session
 
 from schemas.shortlist_schema import ShortlistOut, ShortlistCreate
-from services.shortlist_service import get_shortlist, create_shortlist, delete_shortlist
+from services.shortlist_service import get_shortlist, create_shortlist, delete_shortlist, SHORTLIST_PAGE_SIZE
 from models.base import get_db
 from routes.company_route import get_current_company
 
@@ -15,13 +15,26 @@ router = APIRouter(prefix="/shortlist")
 
 @router.get("/", response_model=List[ShortlistOut])
 def fetch_shortlist(
+    response: Response,
     candidateName: Optional[str] = Query(None), 
     jdId: Optional[UUID] = Query(None),
     jdTitle: Optional[str] = Query(None),
+    limit: int = Query(SHORTLIST_PAGE_SIZE, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
     db: Session = Depends(get_db), 
     company_obj = Depends(get_current_company)
 ):
-    return get_shortlist(db, candidateName, jdId, jdTitle)
+    """
+    The calling company's shortlist, newest first, one page at a time. When there
+    are more entries the X-Next-Cursor header holds the cursor for the next page.
+    """
+    try:
+        entries, next_cursor = get_shortlist(db, company_obj.id, candidateName, jdId, jdTitle, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return entries
 
 
 @router.post("/", response_model=ShortlistOut)
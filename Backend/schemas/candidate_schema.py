@@ -47,3 +47,22 @@ class CandidateOut(CandidateBase):
 
     class Config:
         from_attributes = True
+
+
+class CandidateSearchResult(BaseModel):
+    id: UUID
+    name: str
+    email: Optional[str] = None
+    role: Optional[str] = ""
+    skills: Optional[Any] = []
+    rank: float
+    highlight: Optional[str] = ""  # matched terms wrapped in <mark>
+
+
+class CandidateBulkDelete(BaseModel):
+    candidate_ids: List[UUID] = Field(..., min_length=1, max_length=10000)
+
+
+class CandidateBulkDeleteResult(BaseModel):
+    deleted: int
+    files_queued: int  # resume files removed in the background after the response
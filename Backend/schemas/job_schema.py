@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+from uuid import UUID
+from datetime import datetime
+from typing import Optional, Any
+
+
+class BackgroundJobOut(BaseModel):
+    id: UUID
+    kind: str
+    status: str
+    params: Optional[dict[str, Any]] = None
+    checkpoint: Optional[dict[str, Any]] = None
+    processed: int
+    total: Optional[int] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ReembedStatusOut(BaseModel):
+    model_name: str
+    stale_matches: int
+    job: Optional[BackgroundJobOut] = None
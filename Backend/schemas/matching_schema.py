@@ -1,7 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from uuid import UUID
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Literal
 
 
 class CalculateMatchRequest(BaseModel):
@@ -17,7 +17,15 @@ class CandidateMatchOut(BaseModel):
     sbert_score: float
     final_score: float
     matched_skills: Optional[List[str]]
+    embedding_model: Optional[str] = None
     calculated_at: datetime
 
     class Config:
         from_attributes = True
+
+
+class MatchSettings(BaseModel):
+    persist_mode: Literal["all", "top_k"] = "all"
+    top_k: int = Field(5, ge=1, le=100)
+    keep_threshold: Optional[int] = Field(None, ge=0, le=100)
+    min_score: Optional[int] = Field(None, ge=0, le=100)
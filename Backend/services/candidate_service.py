@@ -1,51 +1,79 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_, desc
-from typing import List, Optional
+from sqlalchemy import func, or_, desc, delete, exists
+from typing import List, Optional, Tuple
 from uuid import UUID
-from models import Candidate, JobDescription
+from models import Candidate, JobDescription, Resume, Embedding
 from models.candidate_match_model import CandidateMatch
 from schemas.candidate_schema import CandidateUpdate
 from datetime import datetime, timedelta, timezone
+from services.search_service import search_filter
+from services.skill_service import has_skills_filter, sync_candidate_skills
 
-def get_candidates(
+
+def owner_filter(auth: dict):
+    """Criterion restricting candidates to the authenticated company or user."""
+    if auth["type"] == "company":
+        return Candidate.company_id == auth["entity"].id
+    return Candidate.user_id == auth["entity"].user_id
+
+
+def candidate_filters(
     db: Session,
     auth: dict,
-    role: Optional[str] = None,
-    department: Optional[str] = None,
-    days: Optional[int] = None,
     search: Optional[str] = None,
-    minScore: Optional[int] = None,
-    sortBy: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 20
-) -> List[Candidate]:
-    query = db.query(Candidate)
+    days: Optional[int] = None,
+    department: Optional[str] = None,
+    skills: Optional[List[str]] = None
+) -> list:
+    """Criteria on Candidate alone shared by the candidate list and the export."""
+    filters = []
 
     if auth["type"] == "company":
-        query = query.filter(Candidate.company_id == auth["entity"].id)
+        filters.append(Candidate.company_id == auth["entity"].id)
     elif auth["type"] == "user":
-        query = query.filter(Candidate.user_id == auth["entity"].user_id)
+        filters.append(Candidate.user_id == auth["entity"].user_id)
 
-    # Search by name or email
+    # Search by name or email (substring), and on Postgres also full-text over
+    # role, skills, summary and experience
     if search:
-        query = query.filter(or_(
-            Candidate.name.ilike(f"%{search}%"),
-            Candidate.email.ilike(f"%{search}%")
-        ))
+        filters.append(search_filter(db, search))
+
+    # Candidates having every one of `skills`
+    if skills:
+        company_id = auth["entity"].id if auth["type"] == "company" else None
+        filters.append(has_skills_filter(skills, company_id))
 
     # Filter by uploaded_at within the last `days` days
     if days:
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
-        query = query.filter(Candidate.uploaded_at >= cutoff_date)
+        filters.append(Candidate.uploaded_at >= cutoff_date)
+
+    # Filter by department (case-insensitive)
+    if department:
+        filters.append(Candidate.department.ilike(f"%{department}%"))
+
+    return filters
+
+
+def get_candidates(
+    db: Session,
+    auth: dict,
+    role: Optional[str] = None,
+    department: Optional[str] = None,
+    days: Optional[int] = None,
+    search: Optional[str] = None,
+    minScore: Optional[int] = None,
+    sortBy: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 20,
+    skills: Optional[List[str]] = None
+) -> List[Candidate]:
+    query = db.query(Candidate).filter(*candidate_filters(db, auth, search, days, department, skills))
 
     # Filter by JD title (case-insensitive) using role filter
     if role:
         query = query.filter(JobDescription.title.ilike(f"%{role}%"))
 
-    # Filter by department (case-insensitive)
-    if department:
-        query = query.filter(Candidate.department.ilike(f"%{department}%"))
-
     # Join with CandidateMatch once for both filtering and sorting
     # Use outerjoin to include candidates without matches
     query = query.outerjoin(CandidateMatch, Candidate.id == CandidateMatch.candidate_id).outerjoin(JobDescription, CandidateMatch.jd_id == JobDescription.id)
@@ -135,76 +163,59 @@ def update_candidate(db: Session, candidate_id: UUID, updates: CandidateUpdate)
     candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
     if not candidate:
         return None
-    for field, value in updates.dict(exclude_unset=True).items():
+    changes = updates.dict(exclude_unset=True)
+    for field, value in changes.items():
         setattr(candidate, field, value)
+    if "skills" in changes:
+        sync_candidate_skills(db, [candidate])
     db.commit()
     db.refresh(candidate)
     return candidate
 
 
-def delete_candidate(db: Session, candidate_id: UUID) -> bool:
+def delete_candidates(db: Session, candidate_ids: List[UUID], owner=None) -> Tuple[int, List[str]]:
     """
-    Delete a candidate and all related records including resume.
-    
-    Deletes in order:
-    1. CandidateMatch records (matches with JDs)
-    2. Shortlist entries
-    3. Candidate record
-    4. Resume file from disk
-    5. Resume database record
-    
-    This ensures no orphaned resumes exist that could cause dashboard inconsistencies.
+    Deletes candidates and their resumes in one transaction. Matches, shortlist
+    entries, interviews and skill rows go with them through ON DELETE CASCADE;
+    embeddings (which have no foreign key) are deleted by id. Match history is
+    kept, so past score trends do not change; retention archives it like any
+    other history. `owner` (see owner_filter) restricts the delete to the
+    caller's candidates.
+
+    Returns the number of candidates deleted and the storage keys of the deleted
+    resumes. Files are not touched; pass the keys to release_resume_files once
+    the transaction has committed.
     """
-    candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
-    if not candidate:
-        return False
-    
-    # Store resume_id and get resume path before deleting candidate
-    resume_id = candidate.resume_id
-    resume_path = None
-    
-    if resume_id:
-        from models.resume_model import Resume
-        resume = db.query(Resume).filter(Resume.resume_id == resume_id).first()
-        if resume:
-            resume_path = resume.uploaded_path
-    
-    # Delete related records in proper order to avoid foreign key violations
-    
-    # 1. Delete candidate matches
-    db.query(CandidateMatch).filter(CandidateMatch.candidate_id == candidate_id).delete(synchronize_session=False)
-    
-    # 2. Delete shortlist entries
-    from models.shortlist_model import Shortlist
-    db.query(Shortlist).filter(Shortlist.candidate_id == candidate_id).delete(synchronize_session=False)
-    
-    # 3. Delete the candidate
-    db.delete(candidate)
-    
-    # Commit candidate and related deletions
+    if not candidate_ids:
+        return 0, []
+    stmt = delete(Candidate).where(Candidate.id.in_(candidate_ids))
+    if owner is not None:
+        stmt = stmt.where(owner)
+    deleted = db.execute(
+        stmt.returning(Candidate.id, Candidate.resume_id).execution_options(synchronize_session=False)
+    ).all()
+    if not deleted:
+        return 0, []
+
+    deleted_ids = [row.id for row in deleted]
+    db.query(Embedding).filter(
+        Embedding.owner_type == "candidate", Embedding.owner_id.in_(deleted_ids)
+    ).delete(synchronize_session=False)
+
+    # A resume row is kept while any candidate still references it.
+    keys = db.execute(
+        delete(Resume).where(
+            Resume.resume_id.in_({row.resume_id for row in deleted}),
+            ~exists().where(Candidate.resume_id == Resume.resume_id)
+        ).returning(Resume.uploaded_path).execution_options(synchronize_session=False)
+    ).scalars().all()
     db.commit()
-    
-    # 4. Delete resume file from disk (if exists)
-    if resume_path:
-        try:
-            from pathlib import Path
-            file_path = Path(resume_path)
-            if file_path.exists():
-                file_path.unlink()
-                print(f"Resume file deleted from disk: {resume_path}")
-        except Exception as e:
-            print(f"Warning: Failed to delete resume file {resume_path}: {e}")
-    
-    # 5. Delete resume from database (if exists)
-    if resume_id:
-        try:
-            from models.resume_model import Resume
-            resume = db.query(Resume).filter(Resume.resume_id == resume_id).first()
-            if resume:
-                db.delete(resume)
-                db.commit()
-                print(f"Resume database record deleted: {resume_id}")
-        except Exception as e:
-            print(f"Warning: Failed to delete resume database record {resume_id}: {e}")
-    
-    return True
+    return len(deleted_ids), [key for key in keys if key]
+
+
+def delete_candidate(db: Session, candidate_id: UUID) -> bool:
+    """Delete a candidate with its related records, resume row and resume file."""
+    from services.resume_service import release_resume_files
+    deleted, keys = delete_candidates(db, [candidate_id])
+    release_resume_files(db, keys)
+    return deleted > 0
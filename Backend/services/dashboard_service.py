@@ -1,6 +1,7 @@
-from sqlalchemy import func, cast, Date, and_
+from sqlalchemy import func
 from datetime import datetime, timedelta, timezone
-from models import Resume, Candidate, CandidateMatch, Shortlist, JobDescription
+from models import Resume, Candidate, CandidateMatch, CandidateMatchHistory, Shortlist, JobDescription
+from services.skill_service import skill_counts
 from sqlalchemy.orm import Session
 from uuid import UUID
 from typing import Optional
@@ -71,14 +72,9 @@ def get_dashboard_stats(company_id: UUID, db: Session):
         ).scalar() or 0.0
         top_dept_score = round(top_dept_score, 1)
 
-    # Top skill (JSONB array)
-    top_skill_row = db.query(
-        func.jsonb_array_elements_text(Candidate.skills).label("skill"),
-        func.count(Candidate.id)
-    ).filter(
-        Candidate.company_id == company_id
-    ).group_by("skill").order_by(func.count(Candidate.id).desc()).first()
-    top_skill = top_skill_row[0] if top_skill_row else None
+    # Top skill
+    top_skill_rows = skill_counts(db, company_id, limit=1)
+    top_skill = top_skill_rows[0].skill if top_skill_rows else None
 
     return {
         "resumes_scanned": resumes_scanned,
@@ -102,14 +98,8 @@ def get_skills_distribution(company_id: UUID, db: Session, days: int = 7):
     # Date filter
     since_date = datetime.now(timezone.utc) - timedelta(days=days)
 
-    # Query: expand JSONB array to rows and count each skill
-    skill_rows = db.query(
-        func.jsonb_array_elements_text(Candidate.skills).label("skill"),
-        func.count(Candidate.id).label("count")
-    ).filter(
-        Candidate.company_id == company_id,
-        Candidate.uploaded_at >= since_date
-    ).group_by("skill").order_by(func.count(Candidate.id).desc()).all()
+    # Candidates per skill, from the normalized candidate_skills table
+    skill_rows = skill_counts(db, company_id, since=since_date)
 
     total_candidates = sum([row.count for row in skill_rows]) or 1  # avoid division by zero
 
@@ -128,98 +118,68 @@ def get_skills_distribution(company_id: UUID, db: Session, days: int = 7):
 def get_match_trends(company_id: str, db: Session, days: int = 7, jd_id: Optional[UUID] = None):
     """
     Returns match trends for a company in the last `days` days, optionally filtered by JD.
+
+    Reads candidate_match_history, which holds one score per candidate/JD pair per
+    day and is partitioned by month on that day, so only the partitions in the
+    window are scanned. avg_score averages those daily pair scores; a candidate
+    scored several times in a day counts once in total_candidates.
     """
     today = datetime.utcnow().date()
     start_date = today - timedelta(days=days-1)
 
-    # 1️⃣ Aggregate daily trends across all candidates
-    daily_trends_query = (
-        db.query(
-            cast(CandidateMatch.calculated_at, Date).label("day"),
-            func.avg(CandidateMatch.final_score).label("avg_score"),
-            func.count(CandidateMatch.id).label("total_candidates"),
-            func.count(Shortlist.id).label("shortlisted_count")
-        )
-        .join(Candidate, Candidate.id == CandidateMatch.candidate_id)
-        .outerjoin(
-            Shortlist,
-            and_(
-                Shortlist.candidate_id == CandidateMatch.candidate_id,
-                Shortlist.shortlisted == True,
-                Shortlist.shortlisted_by == company_id
-            )
-        )
-        .filter(
-            Candidate.company_id == company_id,
-            CandidateMatch.calculated_at >= start_date
-        )
+    day = CandidateMatchHistory.scored_on.label("day")
+    # One row per shortlisted candidate, so joining it does not repeat history rows.
+    shortlisted = (
+        db.query(Shortlist.candidate_id)
+        .filter(Shortlist.shortlisted == True, Shortlist.shortlisted_by == company_id)
+        .distinct()
+        .subquery()
     )
 
-    if jd_id:
-        daily_trends_query = daily_trends_query.filter(CandidateMatch.jd_id == jd_id)
-
-    daily_trends_rows = daily_trends_query.group_by("day").order_by("day").all()
+    def daily_rows(*group_by):
+        query = (
+            db.query(
+                *group_by,
+                day,
+                func.avg(CandidateMatchHistory.final_score).label("avg_score"),
+                func.count(func.distinct(CandidateMatchHistory.candidate_id)).label("total_candidates"),
+                func.count(func.distinct(shortlisted.c.candidate_id)).label("shortlisted_count")
+            )
+            .outerjoin(shortlisted, shortlisted.c.candidate_id == CandidateMatchHistory.candidate_id)
+            .filter(
+                CandidateMatchHistory.company_id == company_id,
+                CandidateMatchHistory.scored_on >= start_date
+            )
+        )
+        if jd_id:
+            query = query.filter(CandidateMatchHistory.jd_id == jd_id)
+        return query.group_by(*group_by, day).order_by(*group_by, day).all()
 
-    trends = [
-        {
+    def as_point(row):
+        return {
             "date": row.day.isoformat(),
             "avg_score": round(row.avg_score or 0, 2),
             "shortlisted_count": int(row.shortlisted_count or 0),
             "total_candidates": int(row.total_candidates or 0)
         }
-        for row in daily_trends_rows
-    ]
 
-    # 2️⃣ JD breakdown
-    jd_query = db.query(JobDescription).filter(JobDescription.company_id == company_id)
+    # 1️⃣ Aggregate daily trends across all candidates
+    trends = [as_point(row) for row in daily_rows()]
+
+    # 2️⃣ JD breakdown, from one query grouped by JD and day
+    jd_query = db.query(JobDescription.id, JobDescription.title).filter(JobDescription.company_id == company_id)
     if jd_id:
         jd_query = jd_query.filter(JobDescription.id == jd_id)
     jd_list = jd_query.all()
 
-    jd_breakdown = []
-    for jd in jd_list:
-        daily_jd_query = (
-            db.query(
-                cast(CandidateMatch.calculated_at, Date).label("day"),
-                func.avg(CandidateMatch.final_score).label("avg_score"),
-                func.count(CandidateMatch.id).label("total_candidates"),
-                func.count(Shortlist.id).label("shortlisted_count")
-            )
-            .join(Candidate, Candidate.id == CandidateMatch.candidate_id)
-            .outerjoin(
-                Shortlist,
-                and_(
-                    Shortlist.candidate_id == CandidateMatch.candidate_id,
-                    Shortlist.shortlisted == True,
-                    Shortlist.shortlisted_by == company_id
-                )
-            )
-            .filter(
-                Candidate.company_id == company_id,
-                CandidateMatch.jd_id == jd.id,
-                CandidateMatch.calculated_at >= start_date
-            )
-            .group_by("day")
-            .order_by("day")
-        )
-
-        daily_rows = daily_jd_query.all()
-
-        daily_scores = [
-            {
-                "date": row.day.isoformat(),
-                "avg_score": round(row.avg_score or 0, 2),
-                "shortlisted_count": int(row.shortlisted_count or 0),
-                "total_candidates": int(row.total_candidates or 0)
-            }
-            for row in daily_rows
-        ]
+    points_by_jd = {}
+    for row in daily_rows(CandidateMatchHistory.jd_id):
+        points_by_jd.setdefault(row.jd_id, []).append(as_point(row))
 
-        jd_breakdown.append({
-            "jd_id": jd.id,
-            "jd_title": jd.title,
-            "daily_scores": daily_scores
-        })
+    jd_breakdown = [
+        {"jd_id": jd.id, "jd_title": jd.title, "daily_scores": points_by_jd.get(jd.id, [])}
+        for jd in jd_list
+    ]
 
     return {"trends": trends, "jd_breakdown": jd_breakdown}
 
@@ -327,14 +287,8 @@ def get_report_summary(company_id: UUID, db: Session, report_type: str, date_ran
     top_department = top_dept_row[0] if top_dept_row else None
     
     # Top skill in date range
-    top_skill_row = db.query(
-        func.jsonb_array_elements_text(Candidate.skills).label("skill"),
-        func.count(Candidate.id)
-    ).filter(
-        Candidate.company_id == company_id,
-        Candidate.uploaded_at >= since_date
-    ).group_by("skill").order_by(func.count(Candidate.id).desc()).first()
-    top_skill = top_skill_row[0] if top_skill_row else None
+    top_skill_rows = skill_counts(db, company_id, since=since_date, limit=1)
+    top_skill = top_skill_rows[0].skill if top_skill_rows else None
     
     return {
         "total_resumes": total_resumes,
@@ -0,0 +1,215 @@
+"""
+Admin data maintenance: placeholder values for incomplete candidates, match
+timestamps refreshed so old matches show up in dashboard charts, and the
+data summary behind /admin/check-data.
+
+The fixes run as background jobs, one company at a time (or only the company
+in job.params["company_id"]). Within a company they update at most
+DATA_FIX_BATCH_SIZE rows per statement and commit after each statement, so no
+rows are loaded into the ORM and locks are short. Each of those commits also
+carries the job's heartbeat. Each fix only matches rows that still need it, so
+a resumed job continues where it stopped.
+"""
+import os
+import time
+from datetime import datetime, timezone, timedelta
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import func, or_, select, true, update
+from sqlalchemy.orm import Session
+
+from models import Company, Candidate, JobDescription, CandidateMatch, BackgroundJob
+from services.job_service import heartbeat, save_checkpoint
+from utils.log_config import logger
+
+FIX_TIMESTAMPS_JOB_KIND = "fix_match_timestamps"
+FIX_CANDIDATES_JOB_KIND = "fix_candidate_data"
+
+DATA_FIX_BATCH_SIZE = int(os.getenv("DATA_FIX_BATCH_SIZE", 1000))
+DATA_FIX_THROTTLE_SECONDS = float(os.getenv("DATA_FIX_THROTTLE_SECONDS", 0.05))
+
+# Matches older than this (or without a timestamp) are re-stamped with the time of the run.
+STALE_MATCH_DAYS = 30
+
+DEFAULT_SUMMARY = (
+    "An analytical and results-driven software engineer with experience in application development, "
+    "scripting and coding, automation, web application design, product testing and deployment, UI testing, "
+    "and requirements gathering."
+)
+DEFAULT_EDUCATION = (
+    "M.S., Computer Science, 2012; B.S.B.A., Management Information Systems, 2011 - University of Arizona"
+)
+
+
+def _blank(column):
+    return or_(column.is_(None), func.trim(column) == "")
+
+
+# Candidate column -> (condition for "needs the placeholder", placeholder value).
+CANDIDATE_DEFAULTS = {
+    Candidate.name: (_blank(Candidate.name), "FIRST LAST"),
+    Candidate.role: (_blank(Candidate.role), "Software Engineer"),
+    Candidate.experience_years: (
+        or_(Candidate.experience_years.is_(None), Candidate.experience_years == 0), 5
+    ),
+    Candidate.summary: (_blank(Candidate.summary), DEFAULT_SUMMARY),
+    # education is JSON: NULL, JSON null, "", "Not specified", [] or {}.
+    Candidate.education: (
+        or_(Candidate.education.is_(None), Candidate.education.in_([None, "", "Not specified", [], {}])),
+        DEFAULT_EDUCATION
+    ),
+}
+
+
+def _owned_by(column, company_id):
+    return column.is_(None) if company_id is None else column == company_id
+
+
+def _update_in_batches(db: Session, table, condition, values: dict, job: BackgroundJob = None) -> int:
+    """UPDATEs rows matching `condition`, DATA_FIX_BATCH_SIZE at a time, committing each batch. Returns the row count."""
+    total = 0
+    while True:
+        batch = select(table.id).where(condition).limit(DATA_FIX_BATCH_SIZE).scalar_subquery()
+        updated = db.execute(
+            update(table).where(table.id.in_(batch)).values(**values).execution_options(synchronize_session=False)
+        ).rowcount
+        if job is not None:
+            heartbeat(job)
+        db.commit()
+        total += updated
+        if updated < DATA_FIX_BATCH_SIZE:
+            return total
+        time.sleep(DATA_FIX_THROTTLE_SECONDS)
+
+
+def fix_match_timestamps(db: Session, company_id: Optional[UUID], now: datetime = None, job: BackgroundJob = None) -> dict:
+    """Sets calculated_at to `now` on the company's matches that have none or are older than STALE_MATCH_DAYS."""
+    now = now or datetime.now(timezone.utc)
+    in_company = CandidateMatch.jd_id.in_(
+        select(JobDescription.id).where(_owned_by(JobDescription.company_id, company_id))
+    )
+    return {
+        "null_timestamps_updated": _update_in_batches(
+            db, CandidateMatch, in_company & CandidateMatch.calculated_at.is_(None), {"calculated_at": now}, job
+        ),
+        "old_timestamps_updated": _update_in_batches(
+            db, CandidateMatch, in_company & (CandidateMatch.calculated_at < now - timedelta(days=STALE_MATCH_DAYS)),
+            {"calculated_at": now}, job
+        ),
+    }
+
+
+def fix_candidate_data(db: Session, company_id: Optional[UUID], job: BackgroundJob = None) -> dict:
+    """
+    Fills CANDIDATE_DEFAULTS placeholders into the company's candidates. Candidates
+    are taken in id order, DATA_FIX_BATCH_SIZE at a time, and each column is set
+    with one UPDATE per batch.
+    """
+    in_company = _owned_by(Candidate.company_id, company_id)
+    needs_fix = or_(*(condition for condition, _ in CANDIDATE_DEFAULTS.values()))
+    updated = 0
+    last_id = None
+    while True:
+        query = select(Candidate.id).where(in_company, needs_fix)
+        if last_id is not None:
+            query = query.where(Candidate.id > last_id)
+        ids = db.execute(query.order_by(Candidate.id).limit(DATA_FIX_BATCH_SIZE)).scalars().all()
+        if not ids:
+            return {"updated_count": updated}
+        for column, (condition, value) in CANDIDATE_DEFAULTS.items():
+            db.execute(
+                update(Candidate).where(Candidate.id.in_(ids), condition)
+                .values({column: value}).execution_options(synchronize_session=False)
+            )
+        if job is not None:
+            heartbeat(job)
+        db.commit()
+        updated += len(ids)
+        last_id = ids[-1]
+        time.sleep(DATA_FIX_THROTTLE_SECONDS)
+
+
+def _company_ids(db: Session, job: BackgroundJob) -> List[Optional[UUID]]:
+    """
+    The companies the job still has to process, in id order. An unscoped job ends
+    with None, which stands for rows that belong to no company.
+    """
+    checkpoint = job.checkpoint or {}
+    if job.params.get("company_id"):
+        company_id = UUID(job.params["company_id"])
+        return [] if checkpoint.get("last_company_id") == str(company_id) else [company_id]
+    query = db.query(Company.id).order_by(Company.id)
+    if checkpoint.get("last_company_id"):
+        query = query.filter(Company.id > UUID(checkpoint["last_company_id"]))
+    return [company_id for (company_id,) in query.all()] + [None]
+
+
+def _run_per_company(db: Session, job: BackgroundJob, fix):
+    """Runs `fix(db, company_id, job)` for each company, adding its counts to the checkpoint."""
+    checkpoint = dict(job.checkpoint or {})
+    company_ids = _company_ids(db, job)
+    processed = job.processed or 0
+    job.total = processed + len(company_ids)
+    for company_id in company_ids:
+        for key, count in fix(db, company_id, job).items():
+            checkpoint[key] = checkpoint.get(key, 0) + count
+        if company_id is not None:
+            checkpoint["last_company_id"] = str(company_id)
+        processed += 1
+        save_checkpoint(db, job, dict(checkpoint), processed)
+        logger.info(f"Data fix job {job.id} ({job.kind}): {processed}/{job.total} companies, {checkpoint}")
+
+
+def run_fix_timestamps_job(db: Session, job: BackgroundJob):
+    """Job handler for fix_match_timestamps. Every company is stamped with the job's start time."""
+    _run_per_company(db, job, lambda db, company_id, job: fix_match_timestamps(db, company_id, job.started_at, job))
+
+
+def run_fix_candidates_job(db: Session, job: BackgroundJob):
+    """Job handler for fix_candidate_data."""
+    _run_per_company(db, job, fix_candidate_data)
+
+
+def data_summary(db: Session, company_id: Optional[UUID] = None, now: datetime = None) -> dict:
+    """Candidate and match counts for /admin/check-data, in one aggregate query."""
+    now = now or datetime.now(timezone.utc)
+    candidates = select(Candidate.id, Candidate.name, Candidate.experience_years, Candidate.skills)
+    matches = select(CandidateMatch.id, CandidateMatch.calculated_at)
+    if company_id is not None:
+        candidates = candidates.where(Candidate.company_id == company_id)
+        matches = matches.join(JobDescription, JobDescription.id == CandidateMatch.jd_id).where(
+            JobDescription.company_id == company_id
+        )
+    candidates = candidates.subquery()
+    matches = matches.subquery()
+    recent_date = now - timedelta(days=STALE_MATCH_DAYS)
+
+    candidate_counts = select(
+        func.count().label("total"),
+        func.count().filter(candidates.c.name.isnot(None), candidates.c.name != "").label("with_names"),
+        func.count().filter(candidates.c.experience_years > 0).label("with_experience"),
+        func.count(candidates.c.skills).label("with_skills"),
+    ).subquery()
+    match_counts = select(
+        func.count().label("total"),
+        func.count().filter(matches.c.calculated_at >= recent_date).label("recent_30_days"),
+    ).subquery()
+
+    # Both sides are single rows; the explicit ON true avoids an implicit cartesian FROM list.
+    row = db.execute(
+        select(candidate_counts, match_counts.c.total.label("matches_total"), match_counts.c.recent_30_days)
+        .select_from(candidate_counts.join(match_counts, true()))
+    ).one()
+    return {
+        "candidates": {
+            "total": row.total,
+            "with_names": row.with_names,
+            "with_experience": row.with_experience,
+            "with_skills": row.with_skills
+        },
+        "matches": {
+            "total": row.matches_total,
+            "recent_30_days": row.recent_30_days
+        }
+    }
@@ -0,0 +1,138 @@
+"""
+Batch SBERT scoring across a pool of matching processes.
+
+score_matrix scores in-process unless MATCHING_WORKERS > 1 and the run has at
+least MATCHING_PARALLEL_MIN_ROWS candidate rows. parallel_sbert_scores then
+writes the run's candidate and JD matrices (in the compact dtype they are
+stored in) as `.npy` files under EMBEDDINGS_DIR, named per run, and partitions
+the candidate rows across a forkserver pool. Workers open the inputs with
+np.load(mmap_mode="r"), so the pages are shared through the OS page cache
+instead of being pickled to each worker, and write their slices of the score
+matrix into a shared output memmap. The run's files are deleted once its
+scores are read back.
+"""
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from utils.embedding_codec import cosine_similarity
+from utils.log_config import logger
+from utils.utility import BASE_DIR, register_forkserver_preload, get_forkserver_context
+
+
+EMBEDDINGS_DIR = Path(os.getenv("EMBEDDINGS_DIR", BASE_DIR / "cache" / "embeddings"))
+
+# Matching processes used for batch scoring; 1 keeps scoring in-process.
+MATCHING_WORKERS = int(os.getenv("MATCHING_WORKERS", 1))
+# Below this many candidate rows the pool overhead outweighs the parallel speedup.
+MATCHING_PARALLEL_MIN_ROWS = int(os.getenv("MATCHING_PARALLEL_MIN_ROWS", 5000))
+
+_POOL = None
+_POOL_WORKERS = 0
+
+# Workers need only this module, not the app (and torch), when they start.
+register_forkserver_preload(__name__)
+
+
+def sbert_score_matrix(candidate_vectors: np.ndarray, jd_vectors: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity of every candidate row against every JD row, mapped to 0–100.
+    Accepts float32, float16 or int8 matrices. Pairs where either side has no text
+    (a zero row) score 0.
+    """
+    similarity = cosine_similarity(candidate_vectors, jd_vectors).astype(np.float64)
+    scores = np.round(((similarity + 1) / 2) * 100, 2)
+    has_text = np.outer(candidate_vectors.any(axis=1), jd_vectors.any(axis=1))
+    return np.where(has_text, scores, 0.0)
+
+
+def matrix_path(company_id, kind: str) -> Path:
+    return EMBEDDINGS_DIR / str(company_id) / f"{kind}.npy"
+
+
+def _score_partition(candidates_path: str, jds_path: str, output_path: str, start: int, end: int) -> int:
+    """Pool worker: scores candidate rows [start, end) into the shared output matrix."""
+    candidate_vectors = np.load(candidates_path, mmap_mode="r")[start:end]
+    jd_vectors = np.load(jds_path, mmap_mode="r")
+    output = np.load(output_path, mmap_mode="r+")
+    output[start:end] = sbert_score_matrix(candidate_vectors, jd_vectors)
+    output.flush()
+    return end - start
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _POOL, _POOL_WORKERS
+    if _POOL is None or _POOL_WORKERS != workers:
+        if _POOL is not None:
+            _POOL.shutdown(wait=False)
+        _POOL = ProcessPoolExecutor(max_workers=workers, mp_context=get_forkserver_context())
+        _POOL_WORKERS = workers
+    return _POOL
+
+
+def _noop() -> None:
+    return None
+
+
+def warm_pool(workers: int = None):
+    """Starts the worker processes ahead of the first batch run."""
+    workers = workers or MATCHING_WORKERS
+    if workers > 1:
+        pool = _get_pool(workers)
+        for future in [pool.submit(_noop) for _ in range(workers)]:
+            future.result()
+
+
+def shutdown_pool():
+    global _POOL, _POOL_WORKERS
+    if _POOL is not None:
+        _POOL.shutdown()
+        _POOL = None
+        _POOL_WORKERS = 0
+
+
+def parallel_sbert_scores(company_id, candidate_vectors: np.ndarray, jd_vectors: np.ndarray,
+                          workers: int = None) -> np.ndarray:
+    """
+    Writes this run's matrices and scores them across `workers` processes, each
+    taking a contiguous block of candidate rows. Returns the full score matrix.
+    """
+    workers = workers or MATCHING_WORKERS
+    n_rows = len(candidate_vectors)
+    # Files are per run: concurrent runs for the same company (a JD upload during a
+    # full match, a re-embedding job, another worker) must not read each other's matrices.
+    run = uuid.uuid4().hex
+    candidates_path = matrix_path(company_id, f"candidates-{run}")
+    jds_path = matrix_path(company_id, f"jds-{run}")
+    output_path = matrix_path(company_id, f"scores-{run}")
+    candidates_path.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        np.save(candidates_path, np.ascontiguousarray(candidate_vectors))
+        np.save(jds_path, np.ascontiguousarray(jd_vectors))
+        output = np.lib.format.open_memmap(output_path, mode="w+", dtype=np.float64, shape=(n_rows, len(jd_vectors)))
+        del output
+
+        bounds = np.linspace(0, n_rows, workers + 1, dtype=int)
+        pool = _get_pool(workers)
+        futures = [
+            pool.submit(_score_partition, str(candidates_path), str(jds_path), str(output_path), int(start), int(end))
+            for start, end in zip(bounds[:-1], bounds[1:]) if end > start
+        ]
+        scored = sum(f.result() for f in futures)
+        logger.info(f"Scored {scored} candidate rows for company {company_id} across {len(futures)} workers")
+        return np.array(np.load(output_path, mmap_mode="r"))
+    finally:
+        for path in (candidates_path, jds_path, output_path):
+            path.unlink(missing_ok=True)
+
+
+def score_matrix(company_id, candidate_vectors: np.ndarray, jd_vectors: np.ndarray, workers: int = None) -> np.ndarray:
+    """Scores in parallel when configured and worthwhile, otherwise in-process."""
+    workers = workers or MATCHING_WORKERS
+    if company_id is not None and workers > 1 and len(candidate_vectors) >= MATCHING_PARALLEL_MIN_ROWS:
+        return parallel_sbert_scores(company_id, candidate_vectors, jd_vectors, workers)
+    return sbert_score_matrix(candidate_vectors, jd_vectors)
@@ -0,0 +1,173 @@
+"""
+Candidate export: candidates with their best match, streamed as CSV or NDJSON.
+
+The filters are those of the candidate list (services/candidate_service.py).
+Each candidate is one row. The best match (highest final_score) comes from a
+window-function subquery, so there is no query per candidate. Rows are fetched
+EXPORT_YIELD_PER at a time through a server-side cursor and written out in
+chunks, so memory use does not grow with the size of the export.
+"""
+import csv
+import io
+import json
+import os
+from datetime import datetime
+from typing import Iterator, List, Optional
+from uuid import UUID
+
+from sqlalchemy import Select, exists, func, nulls_last, or_, select
+from sqlalchemy.orm import Session, aliased
+
+from models import Candidate, CandidateMatch, JobDescription
+from services.candidate_service import candidate_filters
+
+EXPORT_YIELD_PER = int(os.getenv("EXPORT_YIELD_PER", 1000))
+
+
+def _best_matches(candidate_ids: Select):
+    """Match rows of `candidate_ids`, ranked per candidate; rank 1 is the best match."""
+    return (
+        select(
+            CandidateMatch.candidate_id,
+            CandidateMatch.jd_id,
+            CandidateMatch.final_score,
+            CandidateMatch.skill_match_percent,
+            CandidateMatch.sbert_score,
+            CandidateMatch.matched_skills,
+            func.row_number().over(
+                partition_by=CandidateMatch.candidate_id,
+                order_by=(nulls_last(CandidateMatch.final_score.desc()), CandidateMatch.jd_id)
+            ).label("rank")
+        )
+        .where(CandidateMatch.candidate_id.in_(candidate_ids))
+        .subquery("best_match")
+    )
+
+
+def _export_columns(best, best_jd) -> dict:
+    """Exportable column name -> expression."""
+    return {
+        "id": Candidate.id,
+        "name": Candidate.name,
+        "email": Candidate.email,
+        "phone": Candidate.phone,
+        "role": Candidate.role,
+        "department": Candidate.department,
+        "experience_years": Candidate.experience_years,
+        "skills": Candidate.skills,
+        "summary": Candidate.summary,
+        "rejected": Candidate.rejected,
+        "uploaded_at": Candidate.uploaded_at,
+        "best_jd_id": best.c.jd_id,
+        "best_jd_title": best_jd.title,
+        "final_score": best.c.final_score,
+        "skill_match_percent": best.c.skill_match_percent,
+        "sbert_score": best.c.sbert_score,
+        "matched_skills": best.c.matched_skills,
+    }
+
+
+EXPORT_COLUMNS = list(_export_columns(_best_matches(select(Candidate.id)), JobDescription))
+DEFAULT_EXPORT_COLUMNS = [
+    "id", "name", "email", "role", "department", "experience_years", "skills",
+    "uploaded_at", "best_jd_title", "final_score", "matched_skills"
+]
+
+
+def parse_columns(columns: Optional[str]) -> List[str]:
+    """Comma-separated column names (default DEFAULT_EXPORT_COLUMNS); raises ValueError for unknown ones."""
+    if not columns:
+        return list(DEFAULT_EXPORT_COLUMNS)
+    names = [name.strip() for name in columns.split(",") if name.strip()]
+    unknown = [name for name in names if name not in EXPORT_COLUMNS]
+    if unknown or not names:
+        raise ValueError(f"Unknown export columns {unknown}; choose from {EXPORT_COLUMNS}")
+    return names
+
+
+def build_export_query(
+    db: Session,
+    auth: dict,
+    columns: List[str],
+    role: Optional[str] = None,
+    department: Optional[str] = None,
+    days: Optional[int] = None,
+    search: Optional[str] = None,
+    minScore: Optional[int] = None,
+    sortBy: Optional[str] = None,
+    skills: Optional[List[str]] = None
+) -> Select:
+    filters = candidate_filters(db, auth, search, days, department, skills)
+    # Ranking only the selected candidates' matches keeps the window to this export.
+    best = _best_matches(select(Candidate.id).where(*filters))
+    best_jd = aliased(JobDescription, name="best_jd")
+    expressions = _export_columns(best, best_jd)
+    query = (
+        select(*(expressions[name].label(name) for name in columns))
+        .select_from(Candidate)
+        .outerjoin(best, (best.c.candidate_id == Candidate.id) & (best.c.rank == 1))
+        .outerjoin(best_jd, best_jd.id == best.c.jd_id)
+        .where(*filters)
+    )
+
+    # As in the candidate list: matched to any JD with that title, and at least
+    # minScore on the best match or not matched at all.
+    if role:
+        query = query.where(exists().where(
+            CandidateMatch.candidate_id == Candidate.id,
+            CandidateMatch.jd_id == JobDescription.id,
+            JobDescription.title.ilike(f"%{role}%")
+        ))
+    if minScore:
+        query = query.where(or_(best.c.final_score >= minScore, best.c.final_score.is_(None)))
+
+    sorts = {
+        "score": nulls_last(best.c.final_score.desc()),
+        "newest": Candidate.uploaded_at.desc(),
+        "experience": Candidate.experience_years.desc(),
+        "name": Candidate.name,
+        "uploaded_at": Candidate.uploaded_at,
+    }
+    if sortBy in sorts:
+        query = query.order_by(sorts[sortBy])
+    return query.order_by(Candidate.id)
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return "; ".join(str(item) for item in value)
+    if isinstance(value, dict):
+        return json.dumps(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def iter_export(db: Session, query: Select, columns: List[str], fmt: str) -> Iterator[str]:
+    """Yields the export one chunk (EXPORT_YIELD_PER rows) at a time; CSV starts with a header row."""
+    result = db.execute(query.execution_options(yield_per=EXPORT_YIELD_PER))
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if fmt == "csv":
+        writer.writerow(columns)
+    for rows in result.partitions():
+        for row in rows:
+            if fmt == "csv":
+                writer.writerow([_csv_value(value) for value in row])
+            else:
+                buffer.write(json.dumps(dict(zip(columns, row)), default=_json_default) + "\n")
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
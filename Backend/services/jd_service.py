@@ -71,11 +71,8 @@ class JDCompanyService:
         
         # Trigger matching for all candidates
         try:
-            from models.candidate_model import Candidate
-            from services.matching_service import calculate_match_score
-            candidates = db.query(Candidate).filter(Candidate.company_id == company.id).all()
-            for cand in candidates:
-                calculate_match_score(cand.id, jd.id, db, jd)
+            from services.matching_service import match_jd
+            match_jd(db, jd, company.id)
         except Exception as e:
             print(f"Error triggering matching: {e}")
             
@@ -0,0 +1,99 @@
+from sqlalchemy.orm import Session
+from datetime import datetime, timezone, timedelta
+from typing import Callable
+from uuid import UUID
+import os
+
+from models.base import SessionLocal
+from models.background_job_model import BackgroundJob
+from utils.log_config import logger
+
+# A "running" job whose heartbeat is older than this is treated as interrupted
+# (its worker process died) and may be resumed from its checkpoint.
+JOB_STALE_AFTER_SECONDS = int(os.getenv("JOB_STALE_AFTER_SECONDS", 600))
+
+ACTIVE_STATUSES = ("pending", "running")
+
+
+def create_job(db: Session, kind: str, params: dict = None, total: int = None) -> BackgroundJob:
+    job = BackgroundJob(kind=kind, status="pending", params=params or {}, checkpoint={}, processed=0, total=total)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def get_job(db: Session, job_id: UUID) -> BackgroundJob:
+    return db.query(BackgroundJob).filter(BackgroundJob.id == job_id).first()
+
+
+def is_stale(job: BackgroundJob) -> bool:
+    if job.status not in ACTIVE_STATUSES or job.updated_at is None:
+        return False
+    heartbeat = job.updated_at
+    if heartbeat.tzinfo is None:
+        heartbeat = heartbeat.replace(tzinfo=timezone.utc)
+    return heartbeat < datetime.now(timezone.utc) - timedelta(seconds=JOB_STALE_AFTER_SECONDS)
+
+
+def get_active_job(db: Session, kind: str) -> BackgroundJob:
+    """Returns the live pending/running job of `kind`, ignoring ones whose worker died."""
+    jobs = db.query(BackgroundJob).filter(
+        BackgroundJob.kind == kind,
+        BackgroundJob.status.in_(ACTIVE_STATUSES)
+    ).order_by(BackgroundJob.created_at.desc()).all()
+    return next((job for job in jobs if not is_stale(job)), None)
+
+
+def can_resume(job: BackgroundJob) -> bool:
+    return job.status == "failed" or is_stale(job)
+
+
+def heartbeat(job: BackgroundJob):
+    """
+    Marks the job as alive without recording progress; committed with the caller's
+    next commit. Handlers whose checkpoints are far apart call it once per batch,
+    so the job is not taken for stale (JOB_STALE_AFTER_SECONDS) while it works.
+    """
+    job.updated_at = datetime.now(timezone.utc)
+
+
+def save_checkpoint(db: Session, job: BackgroundJob, checkpoint: dict, processed: int = None):
+    """Records progress and commits it together with the work done since the last checkpoint."""
+    job.checkpoint = checkpoint
+    if processed is not None:
+        job.processed = processed
+    job.updated_at = datetime.now(timezone.utc)
+    db.commit()
+
+
+def run_job(job_id: UUID, handler: Callable[[Session, BackgroundJob], None], session_factory=SessionLocal):
+    """
+    Runs `handler(db, job)` on its own session, outside the request that started it.
+    The handler is expected to call save_checkpoint as it goes; a job restarted
+    after a failure receives its last checkpoint and continues from there.
+    """
+    db = session_factory()
+    try:
+        job = get_job(db, job_id)
+        if job is None:
+            return
+        job.status = "running"
+        job.error = None
+        job.started_at = job.started_at or datetime.now(timezone.utc)
+        job.updated_at = datetime.now(timezone.utc)
+        db.commit()
+
+        try:
+            handler(db, job)
+        except Exception as e:
+            db.rollback()
+            logger.exception(f"Background job {job_id} ({job.kind}) failed")
+            job.status = "failed"
+            job.error = str(e)
+        else:
+            job.status = "completed"
+        job.finished_at = datetime.now(timezone.utc)
+        db.commit()
+    finally:
+        db.close()
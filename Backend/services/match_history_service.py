@@ -0,0 +1,286 @@
+"""
+Match score history and its retention.
+
+Every matching run records its scores in candidate_match_history as the day's
+score of each pair (see append_match_history). On Postgres that table is
+range-partitioned by month on scored_on, so trend queries over a recent window
+only scan the partitions in that window.
+
+How long history is kept depends on the company's plan (PLAN_RETENTION_MONTHS).
+The retention job does three things:
+- creates the partitions for the next PARTITION_MONTHS_AHEAD months;
+- once a month has expired for some companies, archives their rows from that
+  partition and deletes them;
+- once a month has expired for every company, detaches the whole partition,
+  archives it and drops it.
+
+Archives are gzipped CSV files under MATCH_HISTORY_ARCHIVE_DIR. Run the job
+monthly, from the admin API (POST /api/admin/match-history/retention) or from
+the command line:
+
+    python -m services.match_history_service [--dry-run]
+"""
+import argparse
+import gzip
+import os
+import re
+import sys
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+from sqlalchemy import or_, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from models import Company, BackgroundJob, CandidateMatchHistory
+from models.base import SessionLocal
+from services.job_service import save_checkpoint
+from utils.log_config import logger
+from utils.utility import BASE_DIR
+
+HISTORY_TABLE = CandidateMatchHistory.__tablename__
+HISTORY_JOB_KIND = "match_history_retention"
+
+MATCH_HISTORY_ARCHIVE_DIR = Path(os.getenv("MATCH_HISTORY_ARCHIVE_DIR", BASE_DIR / "archives" / "match_history"))
+# Months of history kept (besides the current month) for plans not listed below.
+MATCH_HISTORY_RETENTION_MONTHS = int(os.getenv("MATCH_HISTORY_RETENTION_MONTHS", 12))
+# Keyed by Company.plan, lower-cased and without the " Plan" suffix the signup page adds.
+PLAN_RETENTION_MONTHS = {"hiring sprint": 3, "pro": 12, "agency": 24}
+PARTITION_MONTHS_AHEAD = 2
+
+_PARTITION_NAME = re.compile(rf"^{HISTORY_TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+
+def _dialect_insert(db: Session):
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite_insert
+    return pg_insert
+
+
+def _scored_on(calculated_at: datetime) -> date:
+    # SQLite hands back naive datetimes; they are UTC like everything else stored.
+    if calculated_at.tzinfo is not None:
+        calculated_at = calculated_at.astimezone(timezone.utc)
+    return calculated_at.date()
+
+
+def append_match_history(db: Session, matches: List[dict], company_id):
+    """
+    Records stored match rows (as returned by upsert_matches) as the day's score
+    of each pair: the day's first run inserts the row, later runs that day update
+    it, and only when a score changed. The caller commits.
+    """
+    if not matches:
+        return
+    rows = {}
+    for match in matches:
+        scored_on = _scored_on(match["calculated_at"])
+        rows[(match["candidate_id"], match["jd_id"], scored_on)] = {
+            "candidate_id": match["candidate_id"], "jd_id": match["jd_id"], "scored_on": scored_on,
+            "calculated_at": match["calculated_at"], "company_id": company_id,
+            "skill_match_percent": match.get("skill_match_percent"),
+            "sbert_score": match.get("sbert_score"), "final_score": match.get("final_score")
+        }
+
+    table = CandidateMatchHistory.__table__
+    scores = ("skill_match_percent", "sbert_score", "final_score")
+    stmt = _dialect_insert(db)(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.candidate_id, table.c.jd_id, table.c.scored_on],
+        set_={col: stmt.excluded[col] for col in ("calculated_at", "company_id", *scores)},
+        where=or_(*(table.c[col].is_distinct_from(stmt.excluded[col]) for col in scores))
+    )
+    db.execute(stmt, list(rows.values()))
+
+
+def retention_months(plan: Optional[str]) -> int:
+    key = (plan or "").strip().lower()
+    key = key[:-len(" plan")] if key.endswith(" plan") else key
+    return PLAN_RETENTION_MONTHS.get(key, MATCH_HISTORY_RETENTION_MONTHS)
+
+
+def add_months(month: date, n: int) -> date:
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{HISTORY_TABLE}_y{month.year}m{month.month:02d}"
+
+
+def _current_month(today: date = None) -> date:
+    return (today or datetime.now(timezone.utc).date()).replace(day=1)
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def ensure_partitions(db: Session, today: date = None, months_ahead: int = PARTITION_MONTHS_AHEAD):
+    """
+    Creates the monthly partitions from the current month to `months_ahead` months
+    out. Rows outside every partition land in the default partition, which must stay
+    empty for a month's partition to be created later.
+    """
+    if not _is_postgres(db):
+        return
+    current = _current_month(today)
+    for n in range(months_ahead + 1):
+        month = add_months(current, n)
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {HISTORY_TABLE} "
+            f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+        ))
+    db.commit()
+
+
+def list_partitions(db: Session) -> List[tuple]:
+    """(name, month) of the monthly partitions, oldest first; the default partition is left out."""
+    names = db.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = CAST(:parent AS regclass)"
+    ), {"parent": HISTORY_TABLE}).scalars()
+    partitions = []
+    for name in names:
+        found = _PARTITION_NAME.match(name)
+        if found:
+            partitions.append((name, date(int(found.group(1)), int(found.group(2)), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def plan_retention(partitions: List[tuple], company_plans: List[tuple], today: date = None) -> List[dict]:
+    """
+    Decides what to archive. A month has expired for a company once it ends
+    more than the company's retention in whole months before the current month.
+    Returns one action per partition with expired rows: {"partition", "month",
+    "company_ids"}, where company_ids is None when the whole partition has
+    expired for every company.
+    """
+    current = _current_month(today)
+    by_retention = defaultdict(list)
+    for company_id, plan in company_plans:
+        by_retention[retention_months(plan)].append(company_id)
+    longest = max([MATCH_HISTORY_RETENTION_MONTHS, *PLAN_RETENTION_MONTHS.values(), *by_retention])
+
+    actions = []
+    for name, month in partitions:
+        end = add_months(month, 1)
+        if end <= add_months(current, -longest):
+            actions.append({"partition": name, "month": month, "company_ids": None})
+            continue
+        expired = [
+            company_id
+            for months, company_ids in sorted(by_retention.items())
+            if end <= add_months(current, -months)
+            for company_id in company_ids
+        ]
+        if expired:
+            actions.append({"partition": name, "month": month, "company_ids": expired})
+    return actions
+
+
+def _copy_to_archive(db: Session, query: str, path: Path) -> Path:
+    """Streams `query` through COPY into a gzipped CSV at `path`; written under a temporary name first."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".part")
+    cursor = db.connection().connection.cursor()
+    try:
+        with gzip.open(partial, "wt", encoding="utf-8") as out:
+            cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER)", out)
+    finally:
+        cursor.close()
+    os.replace(partial, path)
+    return path
+
+
+def _company_condition(company_ids) -> str:
+    # Inlined rather than bound because COPY takes no parameters; ids are parsed as UUIDs first.
+    return "company_id IN ({})".format(", ".join(f"'{uuid.UUID(str(company_id))}'" for company_id in company_ids))
+
+
+def _describe(action: dict) -> str:
+    if action["company_ids"] is None:
+        return f"{action['partition']}: whole partition"
+    return f"{action['partition']}: {len(action['company_ids'])} companies"
+
+
+def archive_action(db: Session, action: dict, archive_dir: Path = None) -> Path:
+    """
+    Archives and removes the expired rows of one partition, in one transaction.
+    The archive file is complete before the rows are deleted.
+    """
+    archive_dir = Path(archive_dir or MATCH_HISTORY_ARCHIVE_DIR)
+    name = action["partition"]
+    if action["company_ids"] is None:
+        # Detaching only changes the catalog; the archive is then read from the
+        # standalone table without holding the parent locked.
+        db.execute(text(f"ALTER TABLE {HISTORY_TABLE} DETACH PARTITION {name}"))
+        path = _copy_to_archive(db, f"SELECT * FROM {name}", archive_dir / f"{name}.csv.gz")
+        db.execute(text(f"DROP TABLE {name}"))
+    else:
+        condition = _company_condition(action["company_ids"])
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        path = _copy_to_archive(
+            db, f"SELECT * FROM {name} WHERE {condition}", archive_dir / f"{name}_expired_{stamp}.csv.gz"
+        )
+        db.execute(text(f"DELETE FROM {name} WHERE {condition}"))
+    db.commit()
+    logger.info(f"Archived {_describe(action)} to {path}")
+    return path
+
+
+def retention_actions(db: Session, today: date = None) -> List[dict]:
+    company_plans = db.query(Company.id, Company.plan).all()
+    actions = plan_retention(list_partitions(db), company_plans, today)
+    # Per-company deletes only need to run while the partition still has their rows.
+    return [
+        action for action in actions
+        if action["company_ids"] is None or db.execute(text(
+            f"SELECT EXISTS (SELECT 1 FROM {action['partition']} WHERE {_company_condition(action['company_ids'])})"
+        )).scalar()
+    ]
+
+
+def run_history_retention_job(db: Session, job: BackgroundJob):
+    """
+    Job handler: creates upcoming partitions, then archives expired history one
+    partition at a time. Each step is idempotent, so a resumed job just recomputes
+    what is left.
+    """
+    if not _is_postgres(db):
+        raise RuntimeError("Match history partitioning requires PostgreSQL")
+    ensure_partitions(db)
+    actions = retention_actions(db)
+    job.total = (job.processed or 0) + len(actions)
+    archived = list((job.checkpoint or {}).get("archives", []))
+    for action in actions:
+        archived.append(str(archive_action(db, action, job.params.get("archive_dir"))))
+        save_checkpoint(db, job, {"archives": archived}, (job.processed or 0) + 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="list what would be archived, change nothing")
+    parser.add_argument("--archive-dir", default=str(MATCH_HISTORY_ARCHIVE_DIR))
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        if args.dry_run:
+            for action in retention_actions(db):
+                print(_describe(action))
+            return 0
+        ensure_partitions(db)
+        for action in retention_actions(db):
+            print(archive_action(db, action, Path(args.archive_dir)))
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
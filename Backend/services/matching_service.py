@@ -1,12 +1,53 @@
+from sqlalchemy import func, or_, select
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from uuid import UUID
-from typing import List
-from models import Candidate, JobDescription, CandidateMatch
+from typing import List, Iterator
+from models import Candidate, JobDescription, CandidateMatch, Embedding, Company
+from services.embedding_store import sbert_score_matrix, score_matrix
+from services.match_history_service import append_match_history
+from utils.embedding_codec import quantize, to_bytes, from_bytes, EMBEDDING_DTYPES
+from utils.log_config import logger
 from sentence_transformers import SentenceTransformer, util
 import numpy as np
+import hashlib
+import heapq
+import itertools
+import os
+from collections import defaultdict
+import uuid
 from datetime import datetime, timezone
 
-# Load SBERT once
+# Rows per INSERT ... ON CONFLICT round trip. Each row binds 9 parameters, so this
+# stays well below PostgreSQL's 65535 bind parameter limit.
+MATCH_UPSERT_CHUNK_SIZE = int(os.getenv("MATCH_UPSERT_CHUNK_SIZE", 5000))
+
+# Texts per SentenceTransformer.encode forward pass.
+ENCODE_BATCH_SIZE = int(os.getenv("ENCODE_BATCH_SIZE", 64))
+
+# Changing the model leaves stored embeddings and scores on the old one until the
+# re-embedding job (services/reembed_service.py) has rescored every company.
+SBERT_MODEL_NAME = os.getenv("SBERT_MODEL", "all-MiniLM-L6-v2")
+
+# Format embeddings are stored and scored in: float32, float16 or int8.
+EMBEDDING_DTYPE = os.getenv("EMBEDDING_DTYPE", "float16")
+if EMBEDDING_DTYPE not in EMBEDDING_DTYPES:
+    raise ValueError(f"EMBEDDING_DTYPE must be one of {EMBEDDING_DTYPES}")
+
+MATCH_PERSIST_MODES = ("all", "top_k")
+
+# final_score = SKILL_WEIGHT * skill_match_percent + SBERT_WEIGHT * sbert_score
+SKILL_WEIGHT = 0.6
+SBERT_WEIGHT = 0.4
+
+# Candidates scored per batch by iter_match_all_candidates (streaming runs).
+MATCH_STREAM_BATCH_SIZE = int(os.getenv("MATCH_STREAM_BATCH_SIZE", 500))
+
+# Owner ids per `IN (...)` lookup of stored embeddings.
+EMBEDDING_LOOKUP_CHUNK_SIZE = 5000
+
+_UPSERT_COLUMNS = ("skill_match_percent", "matched_skills", "sbert_score", "final_score", "embedding_model", "calculated_at")
 
 # Lazy load SBERT
 _MODEL = None
@@ -15,7 +56,7 @@ def get_model():
     global _MODEL
     if _MODEL is None:
         print("Loading SBERT model... (this may take a few seconds)")
-        _MODEL = SentenceTransformer("all-MiniLM-L6-v2")
+        _MODEL = SentenceTransformer(SBERT_MODEL_NAME)
         print("SBERT model loaded.")
     return _MODEL
 
@@ -47,99 +88,506 @@ def compute_sbert_similarity(text1: str, text2: str) -> float:
     return round(((similarity + 1) / 2) * 100, 2)
 
 
-def calculate_match_score(candidate_id: UUID, jd_id: UUID, db: Session, jd=None):
+def build_candidate_text(candidate: Candidate) -> str:
+    return (
+        (candidate.summary or "") +
+        " " + " ".join(candidate.skills or []) +
+        " " + " ".join([exp for exp in (candidate.experience or [])])
+    )
+
+
+def encode_texts(texts: List[str]) -> np.ndarray:
     """
-    Computes matching between candidate & JD and saves into candidate_matches table.
+    Encodes texts in batches and returns an (n, dim) float32 matrix of unit vectors.
+    Empty texts get a zero row so they score 0, like compute_sbert_similarity.
     """
+    model = get_model()
+    vectors = np.zeros((len(texts), model.get_sentence_embedding_dimension()), dtype=np.float32)
+    non_empty = [i for i, text in enumerate(texts) if text]
+    if non_empty:
+        vectors[non_empty] = model.encode(
+            [texts[i] for i in non_empty],
+            batch_size=ENCODE_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+    return vectors
 
-    # Fetch candidate + JD
-    candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
-    if jd is None:
-        jd = db.query(JobDescription).filter(JobDescription.id == jd_id).first()
 
-    if not candidate or not jd:
-        raise ValueError("Invalid candidate_id or jd_id")
+def text_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
 
-    # Extract required fields
-    candidate_skills = candidate.skills or []
-    jd_skills = jd.keywords or []
 
-    candidate_text = (
-        (candidate.summary or "") +
-        " " + " ".join(candidate.skills or []) +
-        " " + " ".join([exp for exp in (candidate.experience or [])])
-    )
-
-    jd_text = jd.description or ""
+def get_embeddings(db: Session, owner_type: str, owner_ids: list, texts: List[str], company_id=None) -> np.ndarray:
+    """
+    Returns the EMBEDDING_DTYPE matrix for `texts`, one row per owner.
 
+    Vectors stored in the embeddings table are reused when the text hash and dtype
+    still match; the rest are encoded in one batch and upserted (the caller commits).
+    """
+    hashes = [text_hash(text) for text in texts]
+    stored = {}
+    for start in range(0, len(owner_ids), EMBEDDING_LOOKUP_CHUNK_SIZE):
+        rows = db.query(Embedding.owner_id, Embedding.text_hash, Embedding.dtype, Embedding.vector).filter(
+            Embedding.owner_type == owner_type,
+            Embedding.model_name == SBERT_MODEL_NAME,
+            Embedding.owner_id.in_(owner_ids[start:start + EMBEDDING_LOOKUP_CHUNK_SIZE])
+        )
+        stored.update({row.owner_id: row for row in rows})
+
+    vectors = [None] * len(texts)
+    missing = []
+    for i, owner_id in enumerate(owner_ids):
+        row = stored.get(owner_id)
+        if row is not None and row.text_hash == hashes[i] and row.dtype == EMBEDDING_DTYPE:
+            vectors[i] = from_bytes(row.vector, row.dtype)[0]
+        else:
+            missing.append(i)
+
+    if missing:
+        encoded, scales = quantize(encode_texts([texts[i] for i in missing]), EMBEDDING_DTYPE)
+        for k, i in enumerate(missing):
+            vectors[i] = encoded[k]
+        upsert_embeddings(db, [
+            {
+                "owner_type": owner_type,
+                "owner_id": owner_ids[i],
+                "model_name": SBERT_MODEL_NAME,
+                "company_id": company_id,
+                "dtype": EMBEDDING_DTYPE,
+                "dim": encoded.shape[1],
+                "vector": to_bytes(encoded[k], EMBEDDING_DTYPE, None if scales is None else scales[k]),
+                "text_hash": hashes[i],
+                "updated_at": datetime.now(timezone.utc)
+            }
+            for k, i in enumerate(missing)
+        ])
+    return np.stack(vectors)
+
+
+def final_score_upper_bound(skill_percent: float) -> float:
+    """Best final_score a pair can reach given its skill match, i.e. with a perfect SBERT score."""
+    return round((skill_percent * SKILL_WEIGHT) + (100 * SBERT_WEIGHT), 2)
+
+
+def build_match_row(candidate: Candidate, jd: JobDescription, sbert_score: float = None, skill_match: tuple = None) -> dict:
+    """
+    Scores a candidate against a JD and returns the candidate_matches row values.
+    Nothing is written to the database here. Pass `sbert_score` when it was already
+    computed in bulk by sbert_score_matrix, and `skill_match` when compute_skill_match
+    already ran for the pair.
+    """
     # 1. Skill match score
-    skill_percent, matched_skills = compute_skill_match(candidate_skills, jd_skills)
+    if skill_match is None:
+        skill_match = compute_skill_match(candidate.skills or [], jd.keywords or [])
+    skill_percent, matched_skills = skill_match
 
     # 2. SBERT score
-    sbert_score = compute_sbert_similarity(candidate_text, jd_text)
+    if sbert_score is None:
+        sbert_score = compute_sbert_similarity(build_candidate_text(candidate), jd.description or "")
 
     # 3. Final score (weighted)
-    final_score = round((skill_percent * 0.6) + (sbert_score * 0.4), 2)
-
-    # Check if match already exists for this candidate-JD combination
-    existing_match = db.query(CandidateMatch).filter(
-        CandidateMatch.candidate_id == candidate_id,
-        CandidateMatch.jd_id == jd_id
-    ).first()
-
-    if existing_match:
-        # Update existing match record
-        existing_match.skill_match_percent = round(skill_percent, 2)
-        existing_match.matched_skills = matched_skills
-        existing_match.sbert_score = sbert_score
-        existing_match.final_score = final_score
-        existing_match.calculated_at = datetime.now(timezone.utc)
-        match = existing_match
+    final_score = round((skill_percent * SKILL_WEIGHT) + (sbert_score * SBERT_WEIGHT), 2)
+
+    return {
+        "id": uuid.uuid4(),
+        "candidate_id": candidate.id,
+        "jd_id": jd.id,
+        "skill_match_percent": round(skill_percent, 2),
+        "matched_skills": matched_skills,
+        "sbert_score": float(sbert_score),
+        "final_score": final_score,
+        "embedding_model": SBERT_MODEL_NAME,
+        "calculated_at": datetime.now(timezone.utc)
+    }
+
+
+def score_pairs(db: Session, candidates: List[Candidate], job_descriptions: List[JobDescription], company_id=None, min_score=None) -> List[dict]:
+    """
+    Builds match rows for every candidate × JD pair. Each text is encoded at most
+    once (and not at all when its stored embedding is current). With a `company_id`,
+    large pools are scored across the shared-memory worker pool.
+
+    With `min_score`, scoring cascades: the skill stage runs first, and pairs whose
+    final_score_upper_bound is below `min_score` are pruned before the SBERT stage.
+    Pruned pairs get no row; texts that only appear in pruned pairs are never encoded.
+    """
+    if not candidates or not job_descriptions:
+        return []
+
+    skills = [
+        [compute_skill_match(candidate.skills or [], jd.keywords or []) for jd in job_descriptions]
+        for candidate in candidates
+    ]
+    if min_score is None:
+        pairs = [(i, j) for i in range(len(candidates)) for j in range(len(job_descriptions))]
     else:
-        # Create new match record
-        match = CandidateMatch(
-            candidate_id=candidate_id,
-            jd_id=jd_id,
-            skill_match_percent=round(skill_percent, 2),
-            matched_skills=matched_skills,
-            sbert_score=sbert_score,
-            final_score=final_score,
-            calculated_at=datetime.now(timezone.utc)
+        pairs = [
+            (i, j)
+            for i in range(len(candidates))
+            for j in range(len(job_descriptions))
+            if final_score_upper_bound(skills[i][j][0]) >= min_score
+        ]
+    if not pairs:
+        return []
+
+    # Only embed the candidates and JDs that still have a pair in play.
+    candidate_index = {i: k for k, i in enumerate(sorted({i for i, _ in pairs}))}
+    jd_index = {j: k for k, j in enumerate(sorted({j for _, j in pairs}))}
+    kept_candidates = [candidates[i] for i in candidate_index]
+    kept_jds = [job_descriptions[j] for j in jd_index]
+
+    candidate_vectors = get_embeddings(
+        db, "candidate", [c.id for c in kept_candidates], [build_candidate_text(c) for c in kept_candidates], company_id
+    )
+    jd_vectors = get_embeddings(
+        db, "jd", [jd.id for jd in kept_jds], [jd.description or "" for jd in kept_jds], company_id
+    )
+    sbert_scores = score_matrix(company_id, candidate_vectors, jd_vectors).tolist()
+
+    return [
+        build_match_row(
+            candidates[i], job_descriptions[j], sbert_scores[candidate_index[i]][jd_index[j]], skills[i][j]
         )
-        db.add(match)
+        for i, j in pairs
+    ]
+
+
+def _dialect_insert(db: Session):
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite_insert
+    return pg_insert
 
+
+def upsert_embeddings(db: Session, rows: List[dict]):
+    """Inserts or refreshes stored embeddings keyed by (owner_type, owner_id, model_name)."""
+    if not rows:
+        return
+    table = Embedding.__table__
+    stmt = _dialect_insert(db)(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.owner_type, table.c.owner_id, table.c.model_name],
+        set_={col: stmt.excluded[col] for col in ("company_id", "dtype", "dim", "vector", "text_hash", "updated_at")}
+    ).execution_options(insertmanyvalues_page_size=MATCH_UPSERT_CHUNK_SIZE)
+    db.execute(stmt, rows)
+
+
+def upsert_matches(db: Session, rows: List[dict], company_id=None) -> List[dict]:
+    """
+    Writes match rows with INSERT ... ON CONFLICT (candidate_id, jd_id) DO UPDATE.
+    The statement is compiled once and executed with SQLAlchemy's "insertmanyvalues"
+    batching, which sends MATCH_UPSERT_CHUNK_SIZE rows per round trip. The caller commits.
+    With `company_id`, the scores are also recorded in candidate_match_history.
+
+    Returns the rows with `id` and `calculated_at` taken from the database, so pairs
+    that already existed keep their original id.
+    """
+    if not rows:
+        return []
+
+    table = CandidateMatch.__table__
+    stmt = _dialect_insert(db)(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.candidate_id, table.c.jd_id],
+        set_={col: stmt.excluded[col] for col in _UPSERT_COLUMNS}
+    ).returning(table.c.id, table.c.calculated_at, sort_by_parameter_order=True)
+    stmt = stmt.execution_options(insertmanyvalues_page_size=MATCH_UPSERT_CHUNK_SIZE)
+
+    stored = db.execute(stmt, rows).all()
+    matches = [
+        {**row, "id": saved.id, "calculated_at": saved.calculated_at}
+        for row, saved in zip(rows, stored)
+    ]
+    if company_id is not None:
+        append_match_history(db, matches, company_id)
+    return matches
+
+
+def calculate_match_score(candidate_id: UUID, jd_id: UUID, db: Session, jd=None):
+    """
+    Computes matching between candidate & JD and saves into candidate_matches table.
+    """
+
+    # Fetch candidate + JD
+    candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+    if jd is None:
+        jd = db.query(JobDescription).filter(JobDescription.id == jd_id).first()
+
+    if not candidate or not jd:
+        raise ValueError("Invalid candidate_id or jd_id")
+
+    match = upsert_matches(db, [build_match_row(candidate, jd)], jd.company_id)[0]
     db.commit()
-    db.refresh(match)
+    return match
+
 
+def get_match_settings(db: Session, company_id) -> dict:
+    company = db.query(Company).filter(Company.id == company_id).first()
+    if company is None:
+        return {"persist_mode": "all", "top_k": 5, "keep_threshold": None, "min_score": None}
     return {
-        "id": match.id,
-        "candidate_id": candidate_id,
-        "jd_id": jd_id,
-        "skill_match_percent": round(skill_percent, 2),
-        "sbert_score": sbert_score,
-        "final_score": final_score,
-        "matched_skills": matched_skills,
-        "calculated_at": match.calculated_at
+        "persist_mode": company.match_persist_mode or "all",
+        "top_k": company.match_top_k or 5,
+        "keep_threshold": company.match_keep_threshold,
+        "min_score": company.match_min_score
     }
 
 
+def update_match_settings(db: Session, company_id, settings: dict) -> dict:
+    company = db.query(Company).filter(Company.id == company_id).first()
+    if company is None:
+        raise ValueError("Invalid company_id")
+    company.match_persist_mode = settings["persist_mode"]
+    company.match_top_k = settings["top_k"]
+    company.match_keep_threshold = settings.get("keep_threshold")
+    company.match_min_score = settings.get("min_score")
+    db.commit()
+    return get_match_settings(db, company_id)
+
+
+def select_top_k(rows: List[dict], top_k: int, keep_threshold=None, candidate_floor: dict = None, jd_floor: dict = None) -> List[dict]:
+    """
+    Picks the rows to persist in top_k mode: each candidate's best `top_k` JDs, each
+    JD's best `top_k` candidates, and every row scoring at least `keep_threshold`.
+
+    When `rows` only cover part of one side (e.g. one new candidate against every JD),
+    pass that side's floor: a mapping of id -> k-th best score already stored. A row
+    enters that side's top-K if it beats the floor, or if fewer than K rows are stored.
+    """
+    keep = set()
+    if keep_threshold is not None:
+        keep.update(i for i, row in enumerate(rows) if row["final_score"] >= keep_threshold)
+
+    for key, floor in (("candidate_id", candidate_floor), ("jd_id", jd_floor)):
+        if floor is None:
+            groups = defaultdict(list)
+            for i, row in enumerate(rows):
+                groups[row[key]].append(i)
+            for indexes in groups.values():
+                keep.update(heapq.nlargest(top_k, indexes, key=lambda i: rows[i]["final_score"]))
+        else:
+            keep.update(
+                i for i, row in enumerate(rows)
+                if row[key] not in floor or row["final_score"] > floor[row[key]]
+            )
+
+    return [row for i, row in enumerate(rows) if i in keep]
+
+
+def _kth_best_scores(db: Session, column, k: int, *criteria) -> dict:
+    """Maps each `column` value (candidate_id or jd_id) to its k-th best stored final_score."""
+    ranked = db.query(
+        column.label("owner_id"),
+        CandidateMatch.final_score,
+        func.row_number().over(partition_by=column, order_by=CandidateMatch.final_score.desc()).label("rn")
+    ).filter(*criteria).subquery()
+    return {row.owner_id: row.final_score for row in db.query(ranked.c.owner_id, ranked.c.final_score).filter(ranked.c.rn == k)}
+
+
+def delete_stale_matches(db: Session, company_id, before: datetime, candidate_id: UUID = None, jd_id: UUID = None) -> int:
+    """
+    Removes the company's match rows (or one candidate's, or one JD's) that a run
+    starting at `before` did not rewrite, i.e. pairs it dropped by top-K selection
+    or pruning.
+    """
+    if candidate_id is not None:
+        owned = CandidateMatch.candidate_id == candidate_id
+    elif jd_id is not None:
+        owned = CandidateMatch.jd_id == jd_id
+    else:
+        owned = CandidateMatch.candidate_id.in_(select(Candidate.id).where(Candidate.company_id == company_id))
+    return db.query(CandidateMatch).filter(owned, CandidateMatch.calculated_at < before).delete(synchronize_session=False)
+
 
-def match_candidate(db: Session, candidate_id: UUID, company_id) -> List[CandidateMatch]:
+def evict_beyond_top_k(db: Session, company_id, top_k: int, keep_threshold=None, jd_ids=None, candidate_ids=None) -> int:
+    """
+    Removes the rows of the given JDs (or candidates) that top_k mode no longer
+    keeps: ranked below `top_k` both for their JD and for their candidate, and
+    scoring under `keep_threshold`. An incremental run inserts the rows that beat
+    a side's floor; this deletes the rows they pushed out.
+    """
+    ranked = select(
+        CandidateMatch.id,
+        CandidateMatch.candidate_id,
+        CandidateMatch.jd_id,
+        CandidateMatch.final_score,
+        func.row_number().over(
+            partition_by=CandidateMatch.jd_id, order_by=(CandidateMatch.final_score.desc(), CandidateMatch.id)
+        ).label("jd_rank"),
+        func.row_number().over(
+            partition_by=CandidateMatch.candidate_id, order_by=(CandidateMatch.final_score.desc(), CandidateMatch.id)
+        ).label("candidate_rank")
+    ).where(
+        CandidateMatch.candidate_id.in_(select(Candidate.id).where(Candidate.company_id == company_id))
+    ).subquery()
+
+    evicted = select(ranked.c.id).where(ranked.c.jd_rank > top_k, ranked.c.candidate_rank > top_k)
+    if jd_ids is not None:
+        evicted = evicted.where(ranked.c.jd_id.in_(jd_ids))
+    if candidate_ids is not None:
+        evicted = evicted.where(ranked.c.candidate_id.in_(candidate_ids))
+    if keep_threshold is not None:
+        evicted = evicted.where(or_(ranked.c.final_score.is_(None), ranked.c.final_score < keep_threshold))
+    return db.query(CandidateMatch).filter(CandidateMatch.id.in_(evicted)).delete(synchronize_session=False)
+
+
+def _log_pruned(stats: dict, scope: str, n_pairs: int, n_scored: int):
+    pruned = n_pairs - n_scored
+    if stats is not None:
+        stats["pairs_pruned"] = pruned
+    if pruned:
+        logger.info(f"Cascade scoring for {scope}: pruned {pruned} of {n_pairs} pairs before SBERT")
+
+
+def match_candidate(db: Session, candidate_id: UUID, company_id, stats: dict = None) -> List[dict]:
+    """
+    Scores one candidate against every JD of the company. Pass a `stats` dict to
+    receive the number of pairs pruned by cascade scoring as stats["pairs_pruned"].
+    """
+    run_started_at = datetime.now(timezone.utc)
     candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
     if not candidate:
         return []
-    matches = []
     job_descriptions = db.query(JobDescription).filter(JobDescription.company_id == company_id).all()
 
-    for jd in job_descriptions:
-        match = calculate_match_score(candidate_id, jd.id, db, jd)
-        matches.append(match)
+    settings = get_match_settings(db, company_id)
+    rows = score_pairs(db, [candidate], job_descriptions, company_id, settings["min_score"])
+    _log_pruned(stats, f"candidate {candidate_id}", len(job_descriptions), len(rows))
+    if settings["persist_mode"] == "top_k":
+        company_jds = select(JobDescription.id).where(JobDescription.company_id == company_id)
+        jd_floor = _kth_best_scores(db, CandidateMatch.jd_id, settings["top_k"], CandidateMatch.jd_id.in_(company_jds))
+        rows = select_top_k(rows, settings["top_k"], settings["keep_threshold"], jd_floor=jd_floor)
+
+    matches = upsert_matches(db, rows, company_id)
+    if settings["persist_mode"] == "top_k" or settings["min_score"] is not None:
+        delete_stale_matches(db, company_id, run_started_at, candidate_id=candidate.id)
+    if settings["persist_mode"] == "top_k" and matches:
+        evict_beyond_top_k(
+            db, company_id, settings["top_k"], settings["keep_threshold"], jd_ids=[m["jd_id"] for m in matches]
+        )
+    db.commit()
+    return matches
+
+
+def match_jd(db: Session, jd: JobDescription, company_id) -> List[dict]:
+    run_started_at = datetime.now(timezone.utc)
+    candidates = db.query(Candidate).filter(Candidate.company_id == company_id).all()
+
+    settings = get_match_settings(db, company_id)
+    rows = score_pairs(db, candidates, [jd], company_id, settings["min_score"])
+    _log_pruned(None, f"JD {jd.id}", len(candidates), len(rows))
+    if settings["persist_mode"] == "top_k":
+        company_candidates = select(Candidate.id).where(Candidate.company_id == company_id)
+        candidate_floor = _kth_best_scores(
+            db, CandidateMatch.candidate_id, settings["top_k"], CandidateMatch.candidate_id.in_(company_candidates)
+        )
+        rows = select_top_k(rows, settings["top_k"], settings["keep_threshold"], candidate_floor=candidate_floor)
+
+    matches = upsert_matches(db, rows, company_id)
+    if settings["persist_mode"] == "top_k" or settings["min_score"] is not None:
+        delete_stale_matches(db, company_id, run_started_at, jd_id=jd.id)
+    if settings["persist_mode"] == "top_k" and matches:
+        evict_beyond_top_k(
+            db, company_id, settings["top_k"], settings["keep_threshold"],
+            candidate_ids=[m["candidate_id"] for m in matches]
+        )
+    db.commit()
     return matches
 
 
-def match_all_candidates(db: Session, company_id) -> List[CandidateMatch]:
+def match_all_candidates(db: Session, company_id, stats: dict = None) -> List[dict]:
+    """
+    Scores every candidate × JD pair of the company. Pass a `stats` dict to receive
+    the number of pairs pruned by cascade scoring as stats["pairs_pruned"].
+    """
+    run_started_at = datetime.now(timezone.utc)
     candidates = db.query(Candidate).filter(Candidate.company_id == company_id).all()
-    all_matches = []
-    for c in candidates:
-        all_matches.extend(match_candidate(db, c.id, company_id))
+    job_descriptions = db.query(JobDescription).filter(JobDescription.company_id == company_id).all()
+
+    settings = get_match_settings(db, company_id)
+    rows = score_pairs(db, candidates, job_descriptions, company_id, settings["min_score"])
+    _log_pruned(stats, f"company {company_id}", len(candidates) * len(job_descriptions), len(rows))
+    if settings["persist_mode"] == "top_k":
+        rows = select_top_k(rows, settings["top_k"], settings["keep_threshold"])
+
+    all_matches = upsert_matches(db, rows, company_id)
+    if settings["persist_mode"] == "top_k" or settings["min_score"] is not None:
+        delete_stale_matches(db, company_id, run_started_at)
+    db.commit()
     return all_matches
+
+
+def iter_match_all_candidates(db: Session, company_id, batch_size: int = None) -> Iterator[dict]:
+    """
+    Streaming form of match_all_candidates. Candidates are scored in id-ordered
+    batches of `batch_size`; each batch is written and committed before a
+    {"event": "batch", ...} dict with its matches and running totals is yielded,
+    and a final {"event": "done", ...} summary follows.
+
+    Memory stays bounded by the batch size. In top_k mode each batch settles its
+    candidates' own top-K; the JDs' top-K is tracked in one heap per JD (at most
+    top_k rows each); those no earlier batch wrote form a last batch, so each pair
+    is sent once. The rows the run did not rewrite are then deleted, as in
+    match_all_candidates.
+    """
+    batch_size = batch_size or MATCH_STREAM_BATCH_SIZE
+    run_started_at = datetime.now(timezone.utc)
+    settings = get_match_settings(db, company_id)
+    top_k = settings["top_k"] if settings["persist_mode"] == "top_k" else None
+
+    job_descriptions = db.query(JobDescription).filter(JobDescription.company_id == company_id).all()
+    # Detach the JDs so the per-batch commits don't expire them and reload each one.
+    for jd in job_descriptions:
+        db.expunge(jd)
+    total = db.query(func.count(Candidate.id)).filter(Candidate.company_id == company_id).scalar() or 0
+    jd_heaps = defaultdict(list)  # jd_id -> min-heap of (final_score, seq, row, written)
+    # An unreachable floor keeps select_top_k from picking rows for the JD side.
+    unreachable = {jd.id: float("inf") for jd in job_descriptions}
+    seq = itertools.count()
+    processed = stored = pruned = 0
+    last_id = None
+
+    while True:
+        query = db.query(Candidate).filter(Candidate.company_id == company_id)
+        if last_id is not None:
+            query = query.filter(Candidate.id > last_id)
+        candidates = query.order_by(Candidate.id).limit(batch_size).all()
+        if not candidates:
+            break
+        last_id = candidates[-1].id
+
+        rows = score_pairs(db, candidates, job_descriptions, company_id, settings["min_score"])
+        pruned += len(candidates) * len(job_descriptions) - len(rows)
+        if top_k is not None:
+            # The JD side is settled after the last batch, from jd_heaps.
+            kept = select_top_k(rows, top_k, settings["keep_threshold"], jd_floor=unreachable)
+            written = {id(row) for row in kept}
+            for row in rows:
+                heap = jd_heaps[row["jd_id"]]
+                entry = (row["final_score"], next(seq), row, id(row) in written)
+                if len(heap) < top_k:
+                    heapq.heappush(heap, entry)
+                elif entry[0] > heap[0][0]:
+                    heapq.heapreplace(heap, entry)
+            rows = kept
+
+        matches = upsert_matches(db, rows, company_id)
+        db.commit()
+        processed += len(candidates)
+        stored += len(matches)
+        yield {"event": "batch", "matches": matches, "processed": processed, "total": total, "pairs_pruned": pruned}
+
+    if top_k is not None:
+        # Only the JD-side rows no batch has written yet, so each pair is sent once.
+        rows = [row for heap in jd_heaps.values() for _, _, row, written in heap if not written]
+        matches = upsert_matches(db, rows, company_id)
+        stored += len(matches)
+        if matches:
+            yield {"event": "batch", "matches": matches, "processed": processed, "total": total, "pairs_pruned": pruned}
+    if top_k is not None or settings["min_score"] is not None:
+        delete_stale_matches(db, company_id, run_started_at)
+    db.commit()
+    if pruned:
+        logger.info(f"Cascade scoring for company {company_id}: pruned {pruned} pairs before SBERT")
+
+    yield {"event": "done", "processed": processed, "total": total, "matches_stored": stored, "pairs_pruned": pruned}
@@ -0,0 +1,203 @@
+"""
+Versioned resume parsing.
+
+parse_resume results are cached in parse_cache by (text hash, PARSER_VERSION), and
+every candidate records the parser version its fields came from. After a parser
+change, the re-parse job rebuilds outdated candidates from the stored
+Resume.parsed_text, without re-extracting any PDF. Run it from the admin API
+(POST /api/admin/reparse) or from the command line:
+
+    python -m services.parse_service --workers 4
+"""
+import argparse
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from itertools import repeat
+from typing import List
+from uuid import UUID
+
+from sqlalchemy import func, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from models import Candidate, Resume, ParseCache, BackgroundJob
+from models.base import SessionLocal
+from services.job_service import create_job, get_job, run_job, save_checkpoint
+from services.skill_service import sync_candidate_skills
+from utils.log_config import logger
+from utils.resume_parser import parse_resume, PARSER_VERSION
+from utils.utility import get_forkserver_context
+
+REPARSE_JOB_KIND = "reparse"
+
+# Fields of a Candidate that come from parse_resume.
+PARSED_FIELDS = (
+    "name", "email", "phone", "skills", "experience_years", "experience",
+    "education", "summary", "projects", "department", "role"
+)
+
+# Candidates per batch, parser processes, and the pause between batches so the
+# job leaves capacity for live traffic.
+REPARSE_BATCH_SIZE = int(os.getenv("REPARSE_BATCH_SIZE", 500))
+REPARSE_WORKERS = int(os.getenv("REPARSE_WORKERS", min(4, os.cpu_count() or 1)))
+REPARSE_THROTTLE_SECONDS = float(os.getenv("REPARSE_THROTTLE_SECONDS", 0.5))
+
+
+def parse_key(text: str, department=None) -> str:
+    """Cache key of a parse: its output depends on both the text and the department."""
+    return hashlib.sha256(f"{department or ''}\0{text}".encode("utf-8")).hexdigest()
+
+
+def _dialect_insert(db: Session):
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite_insert
+    return pg_insert
+
+
+def store_parse_results(db: Session, results: dict):
+    """Caches {text_hash: result} for the current parser version; existing entries are kept."""
+    if not results:
+        return
+    stmt = _dialect_insert(db)(ParseCache.__table__).on_conflict_do_nothing()
+    db.execute(stmt, [
+        {"text_hash": key, "parser_version": PARSER_VERSION, "result": result}
+        for key, result in results.items()
+    ])
+
+
+def get_parse_results(db: Session, texts: List[str], department=None, pool: ProcessPoolExecutor = None) -> List[dict]:
+    """
+    Returns parse_resume(text, department) for each text, reusing cached results for
+    the current PARSER_VERSION. Uncached texts are parsed once each (in `pool` when
+    given) and cached; the caller commits.
+    """
+    keys = [parse_key(text, department) for text in texts]
+    cached = {
+        row.text_hash: row.result
+        for row in db.query(ParseCache.text_hash, ParseCache.result).filter(
+            ParseCache.parser_version == PARSER_VERSION,
+            ParseCache.text_hash.in_(set(keys))
+        )
+    }
+
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in cached:
+            missing.setdefault(key, text)
+    if missing:
+        if pool is not None:
+            parsed = list(pool.map(parse_resume, missing.values(), repeat(department), chunksize=16))
+        else:
+            parsed = [parse_resume(text, department) for text in missing.values()]
+        fresh = dict(zip(missing.keys(), parsed))
+        store_parse_results(db, fresh)
+        cached.update(fresh)
+
+    return [cached[key] for key in keys]
+
+
+def parse_resume_cached(db: Session, text: str, department=None) -> dict:
+    return get_parse_results(db, [text], department)[0]
+
+
+def apply_parse_result(candidate: Candidate, result: dict):
+    """Writes parsed fields onto the candidate and stamps the parser version."""
+    for field in PARSED_FIELDS:
+        setattr(candidate, field, result[field])
+    candidate.parser_version = PARSER_VERSION
+    candidate.parsed_at = datetime.now(timezone.utc)
+
+
+def outdated_candidates_filter():
+    return or_(Candidate.parser_version.is_(None), Candidate.parser_version != PARSER_VERSION)
+
+
+def run_reparse_job(db: Session, job: BackgroundJob):
+    """
+    Job handler: re-parses every candidate whose parser_version is outdated, in
+    id-ordered batches, from the stored Resume.parsed_text. The checkpoint holds
+    the last candidate id handled, so a resumed job continues after it.
+
+    Parsed fields are overwritten, including ones edited by hand since the upload.
+    Matches are not recomputed here; the next matching run picks up the new skills.
+    """
+    if job.params.get("parser_version") != PARSER_VERSION:
+        raise RuntimeError(
+            f"Job was started for parser {job.params.get('parser_version')!r} but this process runs {PARSER_VERSION!r}"
+        )
+    batch_size = job.params.get("batch_size") or REPARSE_BATCH_SIZE
+    workers = job.params.get("workers") or REPARSE_WORKERS
+    if job.total is None:
+        job.total = db.query(func.count(Candidate.id)).filter(outdated_candidates_filter()).scalar() or 0
+
+    checkpoint = (job.checkpoint or {}).get("last_candidate_id")
+    last_id = UUID(checkpoint) if checkpoint else None
+    processed = job.processed or 0
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_forkserver_context()) if workers > 1 else None
+    try:
+        while True:
+            query = db.query(Candidate, Resume.parsed_text).join(Resume, Resume.resume_id == Candidate.resume_id).filter(
+                outdated_candidates_filter()
+            )
+            if last_id is not None:
+                query = query.filter(Candidate.id > last_id)
+            batch = query.order_by(Candidate.id).limit(batch_size).all()
+            if not batch:
+                break
+
+            # All uploads are parsed with the same department; see process_resume_pdf.
+            results = get_parse_results(db, [text or "" for _, text in batch], "Engineering", pool)
+            for (candidate, _), result in zip(batch, results):
+                apply_parse_result(candidate, result)
+            sync_candidate_skills(db, [candidate for candidate, _ in batch])
+
+            last_id = batch[-1][0].id
+            processed += len(batch)
+            save_checkpoint(db, job, {"last_candidate_id": str(last_id)}, processed)
+            logger.info(f"Re-parse job {job.id}: {processed}/{job.total} candidates on parser {PARSER_VERSION}")
+            time.sleep(REPARSE_THROTTLE_SECONDS)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=REPARSE_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=REPARSE_WORKERS, help="parser processes")
+    parser.add_argument("--resume", metavar="JOB_ID", help="continue a failed or interrupted job from its checkpoint")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        if args.resume:
+            job = get_job(db, UUID(args.resume))
+            if job is None:
+                parser.error(f"No job {args.resume}")
+        else:
+            job = create_job(db, REPARSE_JOB_KIND, {
+                "parser_version": PARSER_VERSION, "batch_size": args.batch_size, "workers": args.workers
+            })
+        job_id = job.id
+    finally:
+        db.close()
+
+    print(f"Re-parse job {job_id} started")
+    run_job(job_id, run_reparse_job)
+
+    db = SessionLocal()
+    try:
+        job = get_job(db, job_id)
+        print(f"Re-parse job {job_id} {job.status}: {job.processed}/{job.total} candidates")
+        return 0 if job.status == "completed" else 1
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
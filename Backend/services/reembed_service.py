@@ -0,0 +1,93 @@
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+from uuid import UUID
+import os
+import time
+
+from models import Company, Candidate, JobDescription, CandidateMatch, Embedding, BackgroundJob
+from services import matching_service
+from services.job_service import heartbeat, save_checkpoint
+from utils.log_config import logger
+
+REEMBED_JOB_KIND = "reembed"
+
+# Texts encoded per batch, and the pause after each batch so a re-embedding run
+# leaves CPU and database capacity for live traffic.
+REEMBED_BATCH_SIZE = int(os.getenv("REEMBED_BATCH_SIZE", 256))
+REEMBED_THROTTLE_SECONDS = float(os.getenv("REEMBED_THROTTLE_SECONDS", 0.5))
+
+
+def count_stale_matches(db: Session, model_name: str = None) -> int:
+    """Match rows whose sbert_score does not come from `model_name` (default: the current model)."""
+    model_name = model_name or matching_service.SBERT_MODEL_NAME
+    return db.query(func.count(CandidateMatch.id)).filter(
+        or_(CandidateMatch.embedding_model.is_(None), CandidateMatch.embedding_model != model_name)
+    ).scalar() or 0
+
+
+def _embed_in_batches(db: Session, owner_type: str, model, company_id, text_of, job: BackgroundJob = None):
+    """
+    Stores current-model embeddings for the company's candidates or JDs, one
+    throttled batch at a time. Each batch's commit carries `job`'s heartbeat.
+    """
+    last_id = None
+    while True:
+        query = db.query(model).filter(model.company_id == company_id)
+        if last_id is not None:
+            query = query.filter(model.id > last_id)
+        batch = query.order_by(model.id).limit(REEMBED_BATCH_SIZE).all()
+        if not batch:
+            return
+        matching_service.get_embeddings(db, owner_type, [row.id for row in batch], [text_of(row) for row in batch], company_id)
+        if job is not None:
+            heartbeat(job)
+        db.commit()
+        last_id = batch[-1].id
+        time.sleep(REEMBED_THROTTLE_SECONDS)
+
+
+def reembed_company(db: Session, company_id, job: BackgroundJob = None):
+    """
+    Moves one company onto the current model: embeds its texts in batches, then
+    rescores all of its pairs in a single commit, so readers see either the old
+    scores or the new ones for the company, never a mix from that run.
+    """
+    model_name = matching_service.SBERT_MODEL_NAME
+    _embed_in_batches(db, "candidate", Candidate, company_id, matching_service.build_candidate_text, job)
+    _embed_in_batches(db, "jd", JobDescription, company_id, lambda jd: jd.description or "", job)
+
+    matching_service.match_all_candidates(db, company_id)
+
+    db.query(Embedding).filter(
+        Embedding.company_id == company_id,
+        Embedding.model_name != model_name
+    ).delete(synchronize_session=False)
+    db.commit()
+
+
+def run_reembed_job(db: Session, job: BackgroundJob):
+    """
+    Job handler: re-embeds and rescores every company, in id order. The checkpoint
+    holds the last company finished; a resumed job skips it and everything before.
+    Embeddings already stored for the current model are reused, so a company that
+    was interrupted half-way only encodes what is still missing.
+    """
+    model_name = matching_service.SBERT_MODEL_NAME
+    if job.params.get("model_name") != model_name:
+        raise RuntimeError(
+            f"Job was started for model {job.params.get('model_name')!r} but this process runs {model_name!r}"
+        )
+
+    checkpoint = dict(job.checkpoint or {})
+    query = db.query(Company.id).order_by(Company.id)
+    if checkpoint.get("last_company_id"):
+        query = query.filter(Company.id > UUID(checkpoint["last_company_id"]))
+    if job.total is None:
+        job.total = db.query(func.count(Company.id)).scalar() or 0
+
+    processed = job.processed or 0
+    for (company_id,) in query.all():
+        reembed_company(db, company_id, job)
+        processed += 1
+        save_checkpoint(db, job, {"last_company_id": str(company_id)}, processed)
+        logger.info(f"Re-embedding job {job.id}: {processed}/{job.total} companies on {model_name}")
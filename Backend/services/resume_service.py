@@ -1,18 +1,18 @@
 import uuid
-import aiofiles
-from pathlib import Path
 from fastapi import HTTPException, UploadFile
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
 
-from utils.utility import format_datetime_to_ist, BASE_DIR, get_current_datetime_utc
+from utils.utility import format_datetime_to_ist, get_current_datetime_utc
 from utils.log_config import logger
-from utils.resume_parser import extract_text_from_pdf, parse_resume
-from models.base import session
+from utils.resume_parser import extract_text_from_pdf, PdfExtractionError, PARSER_VERSION
+from utils.upload import stream_upload_to_disk
+from utils.storage import get_storage, content_key
+from models.base import session, SessionLocal
 from models.resume_model import Resume
 from models.candidate_model import Candidate
-
-
-UPLOADS_DIR = BASE_DIR / "uploads" / "resumes" 
-UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
+from services.parse_service import parse_resume_cached
+from services.skill_service import sync_candidate_skills
 
 
 def get_entity_id(auth):
@@ -23,7 +23,7 @@ def get_entity_id(auth):
     raise HTTPException(401, "Auth type not supported")
 
 
-async def get_resume_by_id_db(resume_id):
+async def get_resume_by_id_db(resume_id, include_text=False):
     try:
         resp = session.query(Resume).filter(Resume.resume_id == resume_id).first()
     except Exception as e:
@@ -37,25 +37,43 @@ async def get_resume_by_id_db(resume_id):
         "resume_id":resp.resume_id, 
         "uploaded_path":resp.uploaded_path, 
         "actual_name":resp.actual_name,  
-        "parsed_text": resp.parsed_text,
+        "content_sha256": resp.content_sha256,
+        "text_url": f"/api/resumes/{resp.resume_id}/text",
         "created_at": format_datetime_to_ist(resp.created_at)
     }
+    # parsed_text is deferred; reading it costs a second query and a decompress.
+    if include_text:
+        D["parsed_text"] = resp.parsed_text
     return D
 
 
-async def delete_resume_db(resume_id):
+async def get_resume_text_db(resume_id) -> str:
     try:
-        resp = session.query(Resume).filter(Resume.resume_id == resume_id).first()
+        row = session.query(Resume.parsed_text).filter(Resume.resume_id == resume_id).first()
+    except Exception as e:
+        logger.error(f"Error fetching resume text: {e}")
+        raise HTTPException(status_code=500, detail="Error fetching resume text")
+
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"Resume not found for id: {resume_id}")
+    return row.parsed_text
+
+
+async def delete_resume_db(resume_id, db=None):
+    db = session if db is None else db
+    try:
+        resp = db.query(Resume).filter(Resume.resume_id == resume_id).first()
         if resp is None:
             raise HTTPException(status_code=404, detail=f"Resume not found for id: {resume_id}")   
-        session.delete(resp)
-        session.commit()
+        db.delete(resp)
+        db.commit()
     except Exception as e:
         logger.error(f"Error deleting resume: {e}")
         raise HTTPException(status_code=500, detail="Error deleting resume")
 
 
-async def insert_resume_db(resume_id, uploaded_path, actual_name, file_format, auth, parsed_text):
+async def insert_resume_db(resume_id, uploaded_path, actual_name, file_format, auth, parsed_text, content_sha256=None, db=None):
+    db = session if db is None else db
     logger.info(f"Inserting resume with ID: {resume_id}")
     try:
         new_resume = Resume(
@@ -63,53 +81,65 @@ async def insert_resume_db(resume_id, uploaded_path, actual_name, file_format, a
             uploaded_path=uploaded_path,
             actual_name=actual_name,
             file_format=file_format,
-            parsed_text=parsed_text
+            parsed_text=parsed_text,
+            content_sha256=content_sha256
         )
         if auth['type'] == 'user':
             new_resume.user_id = auth['entity'].user_id
         else:
             new_resume.company_id = auth['entity'].id
-        session.add(new_resume)
-        session.commit()
+        db.add(new_resume)
+        db.commit()
     except Exception as e:
+        db.rollback()
         logger.error(f"Error inserting resume: {e}")
         raise HTTPException(status_code=500, detail="Error inserting resume") 
 
 
 async def process_resume_pdf(file: UploadFile, auth):
     """
-    Process the uploaded PDF resume and save it to the uploads/pdf directory.
+    Streams the uploaded PDF resume to disk, parses it and keeps the original in
+    resume storage under its content key (see utils/storage.py).
     """
     
     resume_id = uuid.uuid4()
     logger.info(f"Processing started for resume: {resume_id}")
-    file_name = f"resume_{resume_id}.pdf"
-    file_path = f"{UPLOADS_DIR}/{file_name}"
     uploaded_at = get_current_datetime_utc()
 
+    stored = await stream_upload_to_disk(file)
+    logger.info(f"Resume {resume_id} received: {stored.size} bytes, sha256 {stored.sha256}")
+    key = content_key(stored.sha256)
     try:
-        async with aiofiles.open(file_path, "wb") as f:
-            content = await file.read()
-            await f.write(content)
-        logger.info(f"Resume written to disk: {resume_id}")
-    except Exception as e:
-        logger.error(f"Error saving uploaded resume: {e}")
-        raise e
-    
-    parsed_text = extract_text_from_pdf(file_path)
+        try:
+            parsed_text = await run_in_threadpool(extract_text_from_pdf, stored.path)
+        except PdfExtractionError as e:
+            logger.warning(f"Rejected resume {resume_id} ({e.code}): {e}")
+            raise HTTPException(status_code=422, detail={"code": e.code, "message": str(e)})
 
-    try:
-        await insert_resume_db(resume_id, file_path, file.filename, "pdf", auth, parsed_text)
-        logger.info(f"Resume inserted to DB: {resume_id}")
-    except Exception as e:
-        logger.error(f"Error inserting resume into database: {e}")
-        await delete_resume_service(None, file_path)
-        raise e
+        # Saving the file and inserting the row happen under the content key's lock,
+        # so a concurrent release of the same content cannot delete the file in between.
+        # The lock lives in its own session: a commit on the shared one would drop it.
+        db = SessionLocal()
+        try:
+            lock_content_keys(db, [key])
+            file_path = await run_in_threadpool(get_storage().save, stored.path, key)
+            await insert_resume_db(resume_id, file_path, file.filename, "pdf", auth, parsed_text, stored.sha256, db=db)
+            logger.info(f"Resume inserted to DB: {resume_id}")
+        except Exception as e:
+            logger.error(f"Error inserting resume into database: {e}")
+            db.rollback()
+            release_resume_file(db, key, stored.sha256)
+            db.rollback()
+            raise e
+        finally:
+            db.close()
+    finally:
+        stored.path.unlink(missing_ok=True)
     
     # parse and create candidate
     try:
         logger.info(f"Parsing started for resume: {resume_id}")
-        parse_res = parse_resume(parsed_text, "Engineering")
+        parse_res = parse_resume_cached(session, parsed_text, "Engineering")
         logger.info(f"Parsing completed and starting candidate creation")
         parsed_at = get_current_datetime_utc()
         cand = Candidate(
@@ -126,6 +156,7 @@ async def process_resume_pdf(file: UploadFile, auth):
             role=parse_res["role"],
             uploaded_at=uploaded_at,
             parsed_at=parsed_at,
+            parser_version=PARSER_VERSION,
             resume_id=resume_id
         )
         if auth['type'] == 'user':
@@ -133,6 +164,8 @@ async def process_resume_pdf(file: UploadFile, auth):
         else:
             cand.company_id = auth['entity'].id
         session.add(cand)
+        session.flush()
+        sync_candidate_skills(session, [cand])
         session.commit()
         session.refresh(cand)
         logger.info("candidate creation successful")
@@ -153,28 +186,99 @@ async def process_resume_pdf(file: UploadFile, auth):
         "message": "Resume uploaded successfully", 
         "resume_id": resume_id, 
         "parsed_text": parsed_text,
+        "content_sha256": stored.sha256,
         "candidate_id": cand.id
     }
 
 
-async def get_resume_by_id(resume_id):
+async def get_resume_by_id(resume_id, include_text=False):
     try:
-        resp = await get_resume_by_id_db(resume_id)
+        resp = await get_resume_by_id_db(resume_id, include_text)
     except Exception as e:
         raise e
     
     return resp
 
     
-async def delete_resume_service(resume_id, path):
+def lock_content_keys(db, keys):
+    """
+    Takes a transaction-level lock per storage key (Postgres only). Uploads hold it
+    while saving a file and inserting its row, and releases hold it while checking
+    references and deleting, so the two cannot interleave on one content key.
+    """
+    if db.get_bind().dialect.name != "postgresql" or not keys:
+        return
+    # Sorted so that two transactions locking overlapping keys cannot deadlock.
+    db.execute(
+        text("SELECT pg_advisory_xact_lock(hashtext(k)) FROM unnest(CAST(:keys AS text[])) AS k ORDER BY k"),
+        {"keys": sorted(keys)}
+    )
+
+
+def release_resume_file(db, key, content_sha256=None, resume_id=None):
+    """
+    Deletes a stored resume file unless another resume still references it;
+    identical uploads share one content-addressed file. The key stays locked
+    (lock_content_keys) until the caller's transaction ends.
+    """
+    lock_content_keys(db, [key])
+    others = db.query(Resume.resume_id).filter(Resume.uploaded_path == key)
+    if content_sha256:
+        others = others.filter(Resume.content_sha256 == content_sha256)
+    if resume_id is not None:
+        others = others.filter(Resume.resume_id != resume_id)
+    if others.first() is not None:
+        logger.info(f"Resume file {key} is still referenced; keeping it")
+        return
+    try:
+        get_storage(key).delete(key)
+    except Exception as e:
+        logger.warning(f"Failed to delete resume file {key}: {e}")
+
+
+RELEASE_BATCH_SIZE = 1000
+
+
+def release_resume_files(db, keys):
+    """
+    Batch form of release_resume_file for resumes whose rows are already deleted:
+    one reference check per RELEASE_BATCH_SIZE keys, then deletes unreferenced files.
+    """
+    keys = sorted({key for key in keys if key})
+    for start in range(0, len(keys), RELEASE_BATCH_SIZE):
+        batch = keys[start:start + RELEASE_BATCH_SIZE]
+        lock_content_keys(db, batch)
+        referenced = {key for (key,) in db.query(Resume.uploaded_path).filter(Resume.uploaded_path.in_(batch)).distinct()}
+        for key in batch:
+            if key in referenced:
+                continue
+            try:
+                get_storage(key).delete(key)
+            except Exception as e:
+                logger.warning(f"Failed to delete resume file {key}: {e}")
+        # Ends the transaction, releasing the batch's locks.
+        db.commit()
+    logger.info(f"Released {len(keys)} resume file(s)")
+
+
+def release_resume_files_task(keys):
+    """Background-task entry point: the request's session is closed by the time it runs."""
+    db = SessionLocal()
+    try:
+        release_resume_files(db, keys)
+    finally:
+        db.close()
+
+
+async def delete_resume_service(resume_id, path, content_sha256=None):
     logger.info(f"Deleting resume with ID: {resume_id} and path: {path}")
-    file_path = Path(path)
-    if file_path.exists():
-        file_path.unlink()
-        print(f"file deleted in disk for path: {file_path}")
-    else:
-        print(f"No file exist in disk for path: {file_path}")
-
-    if resume_id:
-        await delete_resume_db(resume_id)
+    # As in process_resume_pdf, the content key's lock needs a session nobody else commits.
+    db = SessionLocal()
+    try:
+        release_resume_file(db, path, content_sha256, resume_id)
+        if resume_id:
+            await delete_resume_db(resume_id, db)
+        db.commit()
+    finally:
+        db.close()
     logger.info(f"Resume with ID: {resume_id} deleted successfully from database.")
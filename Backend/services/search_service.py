@@ -0,0 +1,104 @@
+"""
+Candidate search.
+
+On Postgres, name and email are matched by substring through pg_trgm GIN indexes,
+and role, skills, summary and experience through candidates.search_vector, a
+stored generated tsvector column with its own GIN index (migration 8b3e5f1a9c24).
+The column is not mapped on Candidate because SQLite test databases cannot
+create it, so queries reference it with literal_column. On other databases search
+falls back to plain name/email substring matching.
+"""
+from sqlalchemy import Text, cast, func, literal_column, or_, select
+from sqlalchemy.orm import Session
+
+from models import Candidate
+
+SEARCH_CONFIG = "english"
+SEARCH_VECTOR = literal_column("candidates.search_vector")
+
+# ts_headline options: up to three fragments of the matched fields, terms wrapped in <mark>.
+HEADLINE_OPTIONS = 'StartSel=<mark>, StopSel=</mark>, MaxFragments=3, MinWords=5, MaxWords=20, FragmentDelimiter=" ... "'
+
+
+def is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _ts_query(q: str):
+    # websearch syntax: "kafka spark" needs both terms, "kafka or spark" either,
+    # "-java" excludes, quoted phrases match in order.
+    return func.websearch_to_tsquery(SEARCH_CONFIG, q)
+
+
+def _like_pattern(q: str) -> str:
+    return "%" + q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def search_filter(db: Session, q: str):
+    """Criterion matching candidates for `q`; usable in any Candidate query."""
+    pattern = _like_pattern(q)
+    substring = or_(Candidate.name.ilike(pattern, escape="\\"), Candidate.email.ilike(pattern, escape="\\"))
+    if not is_postgres(db):
+        return substring
+    return or_(substring, SEARCH_VECTOR.op("@@")(_ts_query(q)))
+
+
+def _flatten(column):
+    """A JSONB string array as plain comma-separated text."""
+    return func.translate(cast(column, Text), '[]"', "")
+
+
+def build_search_statement(q: str, owner, limit: int, offset: int):
+    """
+    Ranked search over the candidates matching `owner`. Candidates are ranked on
+    full-text relevance (ts_rank_cd, weighted A for role and skills, B for summary,
+    C for experience) plus name similarity. Highlights are computed only for the
+    returned page.
+    """
+    query = _ts_query(q)
+    pattern = _like_pattern(q)
+    rank = (
+        func.ts_rank_cd(SEARCH_VECTOR, query) + func.similarity(Candidate.name, q)
+    ).label("rank")
+    page = (
+        select(Candidate.id.label("id"), rank)
+        .where(
+            owner,
+            or_(
+                Candidate.name.ilike(pattern, escape="\\"),
+                Candidate.email.ilike(pattern, escape="\\"),
+                SEARCH_VECTOR.op("@@")(query)
+            )
+        )
+        .order_by(rank.desc(), Candidate.id)
+        .limit(limit)
+        .offset(offset)
+        .subquery()
+    )
+    document = func.concat_ws(
+        " | ", Candidate.role, _flatten(Candidate.skills), Candidate.summary, _flatten(Candidate.experience)
+    )
+    return (
+        select(
+            Candidate.id, Candidate.name, Candidate.email, Candidate.role, Candidate.skills, page.c.rank,
+            func.ts_headline(SEARCH_CONFIG, document, query, HEADLINE_OPTIONS).label("highlight")
+        )
+        .join(page, page.c.id == Candidate.id)
+        .order_by(page.c.rank.desc(), Candidate.id)
+    )
+
+
+def search_candidates(db: Session, owner, q: str, limit: int = 20, offset: int = 0) -> list:
+    rows = db.execute(build_search_statement(q, owner, limit, offset)).all()
+    return [
+        {
+            "id": row.id,
+            "name": row.name,
+            "email": row.email or None,
+            "role": row.role,
+            "skills": row.skills or [],
+            "rank": round(float(row.rank), 4),
+            "highlight": row.highlight
+        }
+        for row in rows
+    ]
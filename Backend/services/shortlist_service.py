@@ -1,18 +1,51 @@
+import base64
+from datetime import datetime
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
 from models import Shortlist, Candidate, JobDescription
 from schemas.shortlist_schema import ShortlistCreate
 
-def get_shortlist(db: Session, candidate_name: Optional[str] = None, jd_id: Optional[UUID] = None, jd_title: Optional[str] = None) -> List[Shortlist]:
-    query = db.query(Shortlist).join(Candidate).join(JobDescription)
+SHORTLIST_PAGE_SIZE = 50
+
+
+def encode_cursor(entry: Shortlist) -> str:
+    return base64.urlsafe_b64encode(f"{entry.created_at.isoformat()}|{entry.id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Raises ValueError for a cursor that encode_cursor did not produce."""
+    try:
+        created_at, entry_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(entry_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def get_shortlist(db: Session, company_id: UUID, candidate_name: Optional[str] = None, jd_id: Optional[UUID] = None,
+                  jd_title: Optional[str] = None, limit: int = SHORTLIST_PAGE_SIZE,
+                  cursor: Optional[str] = None) -> Tuple[List[Shortlist], Optional[str]]:
+    """
+    One page of the company's shortlist, newest first, and the cursor of the next
+    page (None on the last one). Pages are keyed on (created_at, id), which
+    ix_shortlist_shortlisted_by_created_at serves, so a page costs the same
+    however deep it is. Candidate and JD are only joined to filter on them.
+    """
+    query = db.query(Shortlist).filter(Shortlist.shortlisted_by == company_id)
     if candidate_name:
-        query = query.filter(Candidate.name.ilike(f"%{candidate_name}%"))
+        query = query.join(Shortlist.candidates).filter(Candidate.name.ilike(f"%{candidate_name}%"))
     if jd_id:
         query = query.filter(Shortlist.jd_id == jd_id)
     if jd_title:
-        query = query.filter(JobDescription.title.ilike(f"%{jd_title}%"))
-    return query.all()
+        query = query.join(Shortlist.job_description).filter(JobDescription.title.ilike(f"%{jd_title}%"))
+    if cursor:
+        query = query.filter(tuple_(Shortlist.created_at, Shortlist.id) < tuple_(*decode_cursor(cursor)))
+
+    entries = query.order_by(Shortlist.created_at.desc(), Shortlist.id.desc()).limit(limit + 1).all()
+    if len(entries) > limit:
+        return entries[:limit], encode_cursor(entries[limit - 1])
+    return entries, None
 
 
 def create_shortlist(db: Session, shortlist_data: ShortlistCreate, company_id: UUID) -> Shortlist:
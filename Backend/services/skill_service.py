@@ -0,0 +1,113 @@
+"""
+Normalized candidate skills.
+
+Candidate.skills (JSONB) stays the source of truth; candidate_skills mirrors it
+as (candidate, skill) rows. Every code path that writes Candidate.skills calls
+sync_candidate_skills in the same transaction: upload, candidate update and the
+re-parse job. Skill analytics and the skill filter read candidate_skills only.
+"""
+from typing import Dict, Iterable, List
+
+from sqlalchemy import func, select, true
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from models import Candidate, Skill, CandidateSkill
+
+
+def normalize_skill(name: str) -> str:
+    return " ".join(name.split()).lower()
+
+
+def _skill_names(skills) -> list:
+    # Candidate.skills is free-form JSONB; only a list of strings is treated as skills.
+    if not isinstance(skills, list):
+        return []
+    return [skill for skill in skills if isinstance(skill, str) and skill.strip()]
+
+
+def _dialect_insert(db: Session):
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite_insert
+    return pg_insert
+
+
+def get_skill_ids(db: Session, names: Iterable[str]) -> Dict[str, int]:
+    """Maps normalized skill name -> skill id, creating skills that do not exist yet."""
+    display = {}
+    for name in names:
+        display.setdefault(normalize_skill(name)[:100], " ".join(name.split())[:100])
+    if not display:
+        return {}
+
+    ids = dict(db.query(Skill.normalized, Skill.id).filter(Skill.normalized.in_(display)))
+    missing = [key for key in display if key not in ids]
+    if missing:
+        stmt = _dialect_insert(db)(Skill.__table__).on_conflict_do_nothing(index_elements=["normalized"])
+        db.execute(stmt, [{"name": display[key], "normalized": key} for key in missing])
+        ids.update(db.query(Skill.normalized, Skill.id).filter(Skill.normalized.in_(missing)))
+    return ids
+
+
+def replace_candidate_skills(db: Session, rows: List[tuple]):
+    """
+    Rewrites candidate_skills for each (candidate_id, company_id, uploaded_at, skills)
+    row. The caller commits.
+    """
+    if not rows:
+        return
+    ids = get_skill_ids(db, (skill for *_, skills in rows for skill in _skill_names(skills)))
+    db.query(CandidateSkill).filter(
+        CandidateSkill.candidate_id.in_([row[0] for row in rows])
+    ).delete(synchronize_session=False)
+
+    values = {}
+    for candidate_id, company_id, uploaded_at, skills in rows:
+        for skill in _skill_names(skills):
+            skill_id = ids[normalize_skill(skill)[:100]]
+            values[(candidate_id, skill_id)] = {
+                "candidate_id": candidate_id, "skill_id": skill_id,
+                "company_id": company_id, "uploaded_at": uploaded_at
+            }
+    if values:
+        db.execute(CandidateSkill.__table__.insert(), list(values.values()))
+
+
+def sync_candidate_skills(db: Session, candidates: List[Candidate]):
+    """Mirrors the candidates' current skills into candidate_skills; they must be flushed."""
+    replace_candidate_skills(db, [(c.id, c.company_id, c.uploaded_at, c.skills) for c in candidates])
+
+
+def has_skills_filter(names: List[str], company_id=None):
+    """
+    Criterion for candidates that have every skill in `names` (case-insensitive).
+    Pass `company_id` to let the lookup use the company-leading index.
+    """
+    normalized = {normalize_skill(name) for name in names if name and name.strip()}
+    if not normalized:
+        return true()
+    matching = (
+        select(CandidateSkill.candidate_id)
+        .join(Skill, Skill.id == CandidateSkill.skill_id)
+        .where(Skill.normalized.in_(normalized))
+        .group_by(CandidateSkill.candidate_id)
+        .having(func.count(CandidateSkill.skill_id) == len(normalized))
+    )
+    if company_id is not None:
+        matching = matching.where(CandidateSkill.company_id == company_id)
+    return Candidate.id.in_(matching)
+
+
+def skill_counts(db: Session, company_id, since=None, limit: int = None):
+    """(skill name, candidate count) for the company's candidates, most common first."""
+    count = func.count(CandidateSkill.candidate_id)
+    query = db.query(Skill.name.label("skill"), count.label("count")).join(
+        Skill, Skill.id == CandidateSkill.skill_id
+    ).filter(CandidateSkill.company_id == company_id)
+    if since is not None:
+        query = query.filter(CandidateSkill.uploaded_at >= since)
+    query = query.group_by(Skill.id, Skill.name).order_by(count.desc(), Skill.name)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
@@ -31,3 +31,32 @@ def client(mock_db_session):
         yield c
     
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def sqlite_session():
+    """Returns a real session on an in-memory SQLite database with the core tables created."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.dialects.postgresql import JSONB
+    from sqlalchemy.ext.compiler import compiles
+    from sqlalchemy.orm import sessionmaker
+    from models.base import Base
+    from models import UserModel, Company, Resume, Candidate, JobDescription, CandidateMatch, Embedding, BackgroundJob, ParseCache, Skill, CandidateSkill, CandidateMatchHistory
+
+    @compiles(JSONB, "sqlite")
+    def compile_jsonb_sqlite(type_, compiler, **kw):
+        return "JSON"
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[
+        UserModel.__table__, Company.__table__, Resume.__table__,
+        Candidate.__table__, JobDescription.__table__, CandidateMatch.__table__, Embedding.__table__,
+        BackgroundJob.__table__, ParseCache.__table__, Skill.__table__, CandidateSkill.__table__,
+        CandidateMatchHistory.__table__
+    ])
+    db = sessionmaker(bind=engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+        engine.dispose()
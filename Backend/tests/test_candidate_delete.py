@@ -0,0 +1,99 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+
+from main import app
+from models.base import Base
+from models import (
+    Candidate, CandidateMatch, CandidateMatchHistory, CandidateSkill, Company, Embedding, Interview, JobDescription,
+    Resume, Shortlist
+)
+from services.match_history_service import append_match_history
+from services.candidate_service import delete_candidates, owner_filter
+from services.skill_service import sync_candidate_skills
+from utils.security import get_authenticated_entity
+
+
+@pytest.fixture
+def fk_session(sqlite_session):
+    # SQLite enforces foreign keys (and so ON DELETE CASCADE) only when asked to.
+    sqlite_session.execute(text("PRAGMA foreign_keys=ON"))
+    Base.metadata.create_all(sqlite_session.get_bind(), tables=[Shortlist.__table__, Interview.__table__])
+    return sqlite_session
+
+
+def _seed_company(db, n):
+    company = Company(name=f"Acme {uuid4()}", email=f"{uuid4()}@example.com", password="x")
+    db.add(company)
+    db.flush()
+    jd = JobDescription(title="Data Engineer", description="Kafka", company_id=company.id)
+    db.add(jd)
+    candidates = []
+    for i in range(n):
+        resume = Resume(resume_id=uuid4(), uploaded_path=f"ab/cd/{uuid4().hex}.pdf", actual_name="cv.pdf",
+                        file_format="pdf", parsed_text="", company_id=company.id)
+        candidate = Candidate(name=f"Candidate {i}", email=f"c{i}@example.com", resume_id=resume.resume_id,
+                              company_id=company.id, skills=["Kafka"])
+        db.add(resume)
+        candidates.append(candidate)
+    db.flush()
+    db.add_all(candidates)
+    db.flush()
+    for candidate in candidates:
+        db.add_all([
+            CandidateMatch(candidate_id=candidate.id, jd_id=jd.id, final_score=80),
+            Shortlist(candidate_id=candidate.id, jd_id=jd.id, shortlisted=True, shortlisted_by=company.id),
+            Interview(candidate_id=candidate.id, interview_type="HR Round", scheduled_date="2025-01-01",
+                      scheduled_time="10:00", scheduled_by=company.id),
+            Embedding(owner_type="candidate", owner_id=candidate.id, model_name="m", company_id=company.id,
+                      dtype="float32", dim=1, vector=b"\0\0\0\0", text_hash="h"),
+        ])
+        append_match_history(db, [{"candidate_id": candidate.id, "jd_id": jd.id, "final_score": 80,
+                                   "calculated_at": datetime.now(timezone.utc)}], company.id)
+    sync_candidate_skills(db, candidates)
+    db.commit()
+    return company, candidates
+
+
+def test_bulk_delete_cascades_and_respects_owner(fk_session):
+    db = fk_session
+    company, (first, second, kept) = _seed_company(db, 3)
+    _, (other,) = _seed_company(db, 1)
+    resume_paths = {c.id: db.get(Resume, c.resume_id).uploaded_path for c in (first, second)}
+    auth = {"type": "company", "entity": SimpleNamespace(id=company.id)}
+
+    deleted, keys = delete_candidates(db, [first.id, second.id, other.id], owner_filter(auth))
+
+    assert deleted == 2
+    assert sorted(keys) == sorted(resume_paths.values())
+    remaining = {c for (c,) in db.query(Candidate.id)}
+    assert remaining == {kept.id, other.id}
+    for model in (CandidateMatch, Shortlist, Interview, CandidateSkill):
+        assert {c for (c,) in db.query(model.candidate_id)} == remaining
+    assert {o for (o,) in db.query(Embedding.owner_id)} == remaining
+    assert db.query(Resume).count() == 2
+    # History has no foreign key and outlives the candidates.
+    assert db.query(CandidateMatchHistory).count() == 4
+
+
+def test_bulk_delete_endpoint_releases_files_in_background(client, mock_db_session):
+    company = SimpleNamespace(id=uuid4())
+    ids = [str(uuid4()), str(uuid4())]
+    app.dependency_overrides[get_authenticated_entity] = lambda: {"type": "company", "entity": company}
+    try:
+        with patch("routes.candidate_route.delete_candidates", return_value=(2, ["ab/cd/x.pdf"])) as delete, \
+                patch("routes.candidate_route.release_resume_files_task") as release:
+            response = client.post("/api/candidates/bulk-delete", json={"candidate_ids": ids})
+            empty = client.post("/api/candidates/bulk-delete", json={"candidate_ids": []})
+    finally:
+        app.dependency_overrides.pop(get_authenticated_entity)
+
+    assert response.status_code == 200
+    assert response.json() == {"deleted": 2, "files_queued": 1}
+    assert [str(i) for i in delete.call_args.args[1]] == ids
+    release.assert_called_once_with(["ab/cd/x.pdf"])
+    assert empty.status_code == 422
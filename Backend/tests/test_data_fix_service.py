@@ -0,0 +1,145 @@
+import warnings
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import SAWarning
+from sqlalchemy.orm import sessionmaker
+
+from main import app
+from models import Candidate, JobDescription, CandidateMatch, Company, BackgroundJob
+from services import data_fix_service
+from services.data_fix_service import (
+    FIX_TIMESTAMPS_JOB_KIND, FIX_CANDIDATES_JOB_KIND, DEFAULT_EDUCATION,
+    run_fix_timestamps_job, run_fix_candidates_job, data_summary
+)
+from routes.admin_route import _start_data_fix
+from services.job_service import create_job, run_job, is_stale
+from utils.security import get_authenticated_entity
+
+
+def _seed_company(db, calculated_at=None):
+    company = Company(id=uuid4(), name=f"Acme {uuid4().hex[:6]}", email=f"{uuid4().hex[:6]}@acme.test", password="x")
+    incomplete = Candidate(id=uuid4(), name=" ", email="a@example.com", resume_id=uuid4(), company_id=company.id,
+                           experience_years=0, education="Not specified")
+    complete = Candidate(id=uuid4(), name="Ada", email="b@example.com", resume_id=uuid4(), company_id=company.id,
+                         role="Engineer", experience_years=3, summary="Builds things", education=["B.S."], skills=["Python"])
+    jd = JobDescription(id=uuid4(), title="JD", description="Python engineer", company_id=company.id)
+    db.add_all([company, incomplete, complete, jd])
+    db.flush()
+    match = CandidateMatch(id=uuid4(), candidate_id=incomplete.id, jd_id=jd.id, final_score=50)
+    db.add(match)
+    db.add(CandidateMatch(id=uuid4(), candidate_id=complete.id, jd_id=jd.id, final_score=80,
+                          calculated_at=datetime.now() - timedelta(days=90)))
+    db.flush()
+    match.calculated_at = calculated_at  # None overrides the server default
+    db.commit()
+    return company, incomplete, complete
+
+
+def _run(db, kind, handler, params=None):
+    job = create_job(db, kind, params)
+    run_job(job.id, handler, session_factory=sessionmaker(bind=db.get_bind()))
+    db.expire_all()
+    return db.get(BackgroundJob, job.id)
+
+
+def test_fix_candidates_job_fills_placeholders_in_batches(sqlite_session, monkeypatch):
+    monkeypatch.setattr(data_fix_service, "DATA_FIX_BATCH_SIZE", 1)
+    monkeypatch.setattr(data_fix_service, "DATA_FIX_THROTTLE_SECONDS", 0)
+    _, incomplete, complete = _seed_company(sqlite_session)
+    company, other, _ = _seed_company(sqlite_session)
+    no_education = Candidate(id=uuid4(), name="Bo", email="c@example.com", resume_id=uuid4(), company_id=company.id,
+                             role="Engineer", experience_years=2, summary="Ships things", education=[])
+    sqlite_session.add(no_education)
+    sqlite_session.commit()
+
+    job = _run(sqlite_session, FIX_CANDIDATES_JOB_KIND, run_fix_candidates_job)
+
+    assert job.status == "completed"
+    assert (job.processed, job.total) == (3, 3)  # two companies, then candidates without one
+    assert job.checkpoint["updated_count"] == 3
+    assert sqlite_session.get(Candidate, no_education.id).education == DEFAULT_EDUCATION
+    for candidate_id in (incomplete.id, other.id):
+        fixed = sqlite_session.get(Candidate, candidate_id)
+        assert (fixed.name, fixed.role, fixed.experience_years) == ("FIRST LAST", "Software Engineer", 5)
+        assert fixed.education == DEFAULT_EDUCATION
+        assert fixed.summary
+    untouched = sqlite_session.get(Candidate, complete.id)
+    assert (untouched.name, untouched.role, untouched.education) == ("Ada", "Engineer", ["B.S."])
+
+
+def test_fix_jobs_can_be_scoped_to_one_company(sqlite_session, monkeypatch):
+    monkeypatch.setattr(data_fix_service, "DATA_FIX_THROTTLE_SECONDS", 0)
+    company, incomplete, _ = _seed_company(sqlite_session)
+    _, other, _ = _seed_company(sqlite_session)
+
+    job = _run(sqlite_session, FIX_CANDIDATES_JOB_KIND, run_fix_candidates_job, {"company_id": str(company.id)})
+
+    assert (job.processed, job.total, job.checkpoint["updated_count"]) == (1, 1, 1)
+    assert sqlite_session.get(Candidate, incomplete.id).name == "FIRST LAST"
+    assert sqlite_session.get(Candidate, other.id).name == " "
+
+
+def test_fix_timestamps_job_restamps_missing_and_old_matches(sqlite_session, monkeypatch):
+    monkeypatch.setattr(data_fix_service, "DATA_FIX_THROTTLE_SECONDS", 0)
+    _seed_company(sqlite_session, calculated_at=None)
+    _seed_company(sqlite_session, calculated_at=datetime.now())
+
+    job = _run(sqlite_session, FIX_TIMESTAMPS_JOB_KIND, run_fix_timestamps_job)
+
+    assert job.status == "completed"
+    assert (job.checkpoint["null_timestamps_updated"], job.checkpoint["old_timestamps_updated"]) == (1, 2)
+    stamps = {m.calculated_at for m in sqlite_session.query(CandidateMatch)}
+    assert job.started_at in stamps and len(stamps) == 2  # the recent match keeps its own timestamp
+
+
+def test_data_summary_counts_in_one_query(sqlite_session):
+    company, _, _ = _seed_company(sqlite_session, calculated_at=datetime.now())
+    _seed_company(sqlite_session)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", SAWarning)
+        data_summary(sqlite_session)
+    assert data_summary(sqlite_session, company.id) == {
+        "candidates": {"total": 2, "with_names": 2, "with_experience": 1, "with_skills": 1},
+        "matches": {"total": 2, "recent_30_days": 1}
+    }
+    assert data_summary(sqlite_session)["matches"] == {"total": 4, "recent_30_days": 1}
+
+
+def test_fix_endpoints_require_admin(client):
+    app.dependency_overrides[get_authenticated_entity] = lambda: {"type": "company", "entity": MagicMock(), "entity_id": "1"}
+
+    assert client.post("/api/admin/fix-timestamps").status_code == 403
+    assert client.post("/api/admin/fix-candidate-data").status_code == 403
+    assert client.get("/api/admin/check-data").status_code == 403
+
+
+def test_start_data_fix_only_reuses_a_job_with_the_same_scope(sqlite_session):
+    company_a, company_b = uuid4(), uuid4()
+    background_tasks = MagicMock()
+
+    job = _start_data_fix(FIX_CANDIDATES_JOB_KIND, company_a, sqlite_session, background_tasks)
+    assert _start_data_fix(FIX_CANDIDATES_JOB_KIND, company_a, sqlite_session, background_tasks).id == job.id
+    for other_scope in (company_b, None):
+        with pytest.raises(HTTPException) as error:
+            _start_data_fix(FIX_CANDIDATES_JOB_KIND, other_scope, sqlite_session, background_tasks)
+        assert error.value.status_code == 409
+    assert background_tasks.add_task.call_count == 1
+
+
+def test_fixes_heartbeat_every_batch(sqlite_session, monkeypatch):
+    monkeypatch.setattr(data_fix_service, "DATA_FIX_THROTTLE_SECONDS", 0)
+    company, _, _ = _seed_company(sqlite_session)
+    job = create_job(sqlite_session, FIX_CANDIDATES_JOB_KIND, {"company_id": str(company.id)})
+    job.status = "running"
+
+    for fix in (data_fix_service.fix_candidate_data, data_fix_service.fix_match_timestamps):
+        job.updated_at = datetime.now() - timedelta(hours=1)
+        sqlite_session.commit()
+        assert is_stale(job)
+        fix(sqlite_session, company.id, job=job)
+        assert not is_stale(job)
@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from main import app
+from utils import db_metrics
+from utils.db_metrics import RequestStats, db_stats_snapshot, instrument_engine
+from utils.security import get_admin_user
+
+
+def test_request_stats_keeps_slowest_statements(monkeypatch):
+    monkeypatch.setattr(db_metrics, "SLOW_REQUEST_TOP_STATEMENTS", 2)
+    stats = RequestStats()
+    for seconds, statement in [(0.01, "a"), (0.05, "b"), (0.02, "c"), (0.03, "d")]:
+        stats.record(seconds, statement)
+
+    assert stats.queries == 4
+    assert round(stats.db_seconds, 2) == 0.11
+    assert sorted(stats.slowest, reverse=True) == [(0.05, "b"), (0.03, "d")]
+
+
+@pytest.fixture
+def engine():
+    # Sync dependencies run in a worker thread, so the connection is shared across threads.
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    instrument_engine(engine)
+    instrument_engine(engine)  # idempotent
+    yield engine
+    engine.dispose()
+
+
+def test_middleware_reports_queries_per_request(client, engine, monkeypatch):
+    monkeypatch.setattr(db_metrics, "SLOW_REQUEST_MS", 0)
+
+    def admin_running_queries():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        return object()
+
+    app.dependency_overrides[get_admin_user] = admin_running_queries
+    response = client.get("/api/admin/db-stats")
+
+    assert response.status_code == 200
+    assert response.headers["x-db-queries"] == "2"
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert 'desc="2 queries"' in response.headers["server-timing"]
+
+    route = next(row for row in db_stats_snapshot()["routes"] if row["route"] == "GET /api/admin/db-stats")
+    assert route["requests"] >= 1
+    assert route["max_queries"] >= 2
+    assert route["slow_requests"] >= 1
+
+
+def test_statements_outside_requests_are_not_counted(engine):
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert engine.pool.connect().info["query_start"] == []
+
+    assert db_metrics.current_stats() is None
+
+
+def test_route_name_uses_path_parameter_names():
+    scope = {"method": "GET", "path": "/api/jobs/42/candidates/42", "route": object(), "path_params": {"jd_id": "42"}}
+
+    assert db_metrics._route_name(scope) == "GET /api/jobs/{jd_id}/candidates/{jd_id}"
+    assert db_metrics._route_name({"method": "GET", "path": "/x"}) == "GET <unmatched>"
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from utils.embedding_codec import quantize, dequantize, to_bytes, from_bytes, cosine_similarity
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(7)
+    v = rng.standard_normal((20, 384)).astype(np.float32)
+    v /= np.linalg.norm(v, axis=1, keepdims=True)
+    v[3] = 0
+    return v
+
+
+@pytest.mark.parametrize("dtype, tolerance", [("float32", 0), ("float16", 1e-3), ("int8", 1e-2)])
+def test_round_trip_within_tolerance(vectors, dtype, tolerance):
+    data, scales = quantize(vectors, dtype)
+    np.testing.assert_allclose(dequantize(data, scales), vectors, atol=tolerance)
+
+    vector, scale = from_bytes(to_bytes(data[0], dtype, None if scales is None else scales[0]), dtype)
+    np.testing.assert_array_equal(vector, data[0])
+    assert scale == (None if scales is None else pytest.approx(scales[0]))
+
+
+def test_int8_is_a_quarter_of_float32(vectors):
+    data, scales = quantize(vectors, "int8")
+    assert len(to_bytes(data[0], "int8", scales[0])) == 384 + 4
+
+
+@pytest.mark.parametrize("dtype", ["float16", "int8"])
+def test_compact_cosine_tracks_float32(vectors, dtype):
+    reference = cosine_similarity(vectors, vectors[:5])
+    data, _ = quantize(vectors, dtype)
+
+    compact = cosine_similarity(data, quantize(vectors[:5], dtype)[0], block_rows=7)
+
+    np.testing.assert_allclose(compact, reference, atol=5e-3)
+    assert not compact[3].any()
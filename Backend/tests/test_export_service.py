@@ -0,0 +1,74 @@
+import csv
+import io
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+from main import app
+from models import Candidate, CandidateMatch, Company, JobDescription
+from services import export_service
+from services.export_service import build_export_query, iter_export, parse_columns
+from services.skill_service import sync_candidate_skills
+from utils.security import get_authenticated_entity
+
+
+def _seed(db):
+    company = Company(id=uuid4(), name=f"Acme {uuid4().hex[:6]}", email=f"{uuid4().hex[:6]}@acme.test", password="x")
+    backend = JobDescription(id=uuid4(), title="Backend Engineer", description="Python", company_id=company.id)
+    data = JobDescription(id=uuid4(), title="Data Engineer", description="Kafka", company_id=company.id)
+    ada = Candidate(id=uuid4(), name="Ada", email="ada@example.com", resume_id=uuid4(), company_id=company.id,
+                    skills=["Python", "Kafka"], experience_years=7)
+    bob = Candidate(id=uuid4(), name="Bob", email="bob@example.com", resume_id=uuid4(), company_id=company.id,
+                    skills=["Java"], experience_years=2)
+    db.add_all([company, backend, data, ada, bob])
+    db.flush()
+    sync_candidate_skills(db, [ada, bob])
+    db.add_all([
+        CandidateMatch(candidate_id=ada.id, jd_id=backend.id, final_score=60, matched_skills=["python"]),
+        CandidateMatch(candidate_id=ada.id, jd_id=data.id, final_score=85, matched_skills=["kafka"]),
+        CandidateMatch(candidate_id=bob.id, jd_id=backend.id, final_score=30, matched_skills=[]),
+    ])
+    db.commit()
+    return {"type": "company", "entity": company}
+
+
+def _export(db, auth, fmt="csv", columns="name,best_jd_title,final_score,matched_skills", **filters):
+    names = parse_columns(columns)
+    return "".join(iter_export(db, build_export_query(db, auth, names, **filters), names, fmt))
+
+
+def test_csv_export_has_one_row_per_candidate_with_its_best_match(sqlite_session):
+    auth = _seed(sqlite_session)
+    _seed(sqlite_session)  # another company's candidates stay out
+
+    rows = list(csv.reader(io.StringIO(_export(sqlite_session, auth, sortBy="score"))))
+
+    assert rows == [
+        ["name", "best_jd_title", "final_score", "matched_skills"],
+        ["Ada", "Data Engineer", "85", "kafka"],
+        ["Bob", "Backend Engineer", "30", ""],
+    ]
+
+
+def test_ndjson_export_streams_in_chunks_and_applies_filters(sqlite_session, monkeypatch):
+    monkeypatch.setattr(export_service, "EXPORT_YIELD_PER", 1)
+    auth = _seed(sqlite_session)
+    names = parse_columns("id,name,skills,final_score")
+
+    chunks = list(iter_export(sqlite_session, build_export_query(sqlite_session, auth, names, sortBy="name"), names, "ndjson"))
+    filtered = _export(sqlite_session, auth, "ndjson", "name", minScore=50, skills=["Kafka"])
+
+    assert len(chunks) == 2
+    first = json.loads(chunks[0])
+    assert (first["name"], first["skills"], first["final_score"]) == ("Ada", ["Python", "Kafka"], 85)
+    assert [json.loads(line) for line in filtered.splitlines()] == [{"name": "Ada"}]
+
+
+def test_export_route_rejects_unknown_columns(client):
+    app.dependency_overrides[get_authenticated_entity] = lambda: {"type": "company", "entity": SimpleNamespace(id=uuid4())}
+
+    response = client.get("/api/candidates/export?columns=name,password")
+
+    assert response.status_code == 400
+    assert "password" in response.json()["message"]
@@ -0,0 +1,77 @@
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
+from models import CandidateMatchHistory, JobDescription, Shortlist
+from models.base import Base
+from services.dashboard_service import get_match_trends
+from services.match_history_service import (
+    add_months, append_match_history, partition_name, plan_retention, retention_months
+)
+
+
+def _partitions(*months):
+    return [(partition_name(month), month) for month in months]
+
+
+def test_retention_months_by_plan():
+    assert retention_months("Hiring Sprint Plan") == 3
+    assert retention_months("pro") == 12
+    assert retention_months("Agency Plan") == 24
+    assert retention_months(None) == retention_months("Enterprise")
+
+
+def test_add_months_crosses_years():
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+
+
+def test_plan_retention_archives_per_company_then_whole_partitions():
+    sprint, pro, agency = uuid4(), uuid4(), uuid4()
+    companies = [(sprint, "Hiring Sprint Plan"), (pro, "Pro Plan"), (agency, "Agency Plan")]
+    today = date(2026, 6, 15)
+    partitions = _partitions(date(2024, 5, 1), date(2025, 5, 1), date(2026, 2, 1), date(2026, 3, 1), date(2026, 6, 1))
+
+    actions = {action["partition"]: action["company_ids"] for action in plan_retention(partitions, companies, today)}
+
+    assert actions == {
+        # Older than the longest retention (24 months): the whole partition goes.
+        "candidate_match_history_y2024m05": None,
+        # Past the 3- and 12-month plans only.
+        "candidate_match_history_y2025m05": [sprint, pro],
+        # Past the 3-month plan only; March 2026 is still inside it.
+        "candidate_match_history_y2026m02": [sprint],
+    }
+
+
+def _match(candidate_id, jd_id, final_score, calculated_at):
+    return {"candidate_id": candidate_id, "jd_id": jd_id, "final_score": final_score, "calculated_at": calculated_at}
+
+
+def test_append_match_history_keeps_one_row_per_pair_per_day(sqlite_session):
+    company_id, candidate_id, jd_id = uuid4(), uuid4(), uuid4()
+    morning = datetime(2026, 6, 15, 9, tzinfo=timezone.utc)
+
+    append_match_history(sqlite_session, [_match(candidate_id, jd_id, 50, morning)], company_id)
+    append_match_history(sqlite_session, [_match(candidate_id, jd_id, 90, morning + timedelta(hours=5))], company_id)
+    append_match_history(sqlite_session, [_match(candidate_id, jd_id, 90, morning + timedelta(days=1))], company_id)
+    sqlite_session.commit()
+
+    rows = sqlite_session.query(CandidateMatchHistory).order_by(CandidateMatchHistory.scored_on).all()
+    assert [(row.scored_on, row.final_score) for row in rows] == [(date(2026, 6, 15), 90), (date(2026, 6, 16), 90)]
+
+
+def test_match_trends_average_the_daily_score_of_each_pair(sqlite_session):
+    Base.metadata.create_all(sqlite_session.get_bind(), tables=[Shortlist.__table__])
+    company_id, jd_id = uuid4(), uuid4()
+    first, second = uuid4(), uuid4()
+    now = datetime.now(timezone.utc)
+    sqlite_session.add(JobDescription(id=jd_id, company_id=company_id, title="Engineer"))
+    # `first` is scored three times today; only its last score counts.
+    for score in (10, 20, 90):
+        append_match_history(sqlite_session, [_match(first, jd_id, score, now)], company_id)
+    append_match_history(sqlite_session, [_match(second, jd_id, 70, now)], company_id)
+    sqlite_session.commit()
+
+    trends = get_match_trends(company_id, sqlite_session, days=7)["trends"]
+
+    assert trends == [{"date": now.date().isoformat(), "avg_score": 80, "shortlisted_count": 0, "total_candidates": 2}]
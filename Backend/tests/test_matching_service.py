@@ -0,0 +1,230 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import numpy as np
+
+from models import Candidate, JobDescription, CandidateMatch, CandidateMatchHistory, Company
+from services.matching_service import (
+    compute_skill_match, match_all_candidates, match_candidate, match_jd, upsert_matches, select_top_k,
+    iter_match_all_candidates
+)
+
+
+def _seed(db, n_candidates=3, n_jds=2):
+    company_id = uuid4()
+    candidates = [
+        Candidate(id=uuid4(), name=f"Cand {i}", email=f"c{i}@example.com", resume_id=uuid4(),
+                  company_id=company_id, skills=["Python", "SQL"], experience=["Backend dev"], summary="Engineer")
+        for i in range(n_candidates)
+    ]
+    jds = [
+        JobDescription(id=uuid4(), title=f"JD {i}", description="Python engineer", keywords=["python"], company_id=company_id)
+        for i in range(n_jds)
+    ]
+    db.add_all(candidates + jds)
+    db.commit()
+    return company_id, candidates, jds
+
+
+def test_compute_skill_match_is_case_insensitive():
+    score, matched = compute_skill_match(["Python", "SQL"], ["python", "Docker"])
+    assert score == 50
+    assert matched == ["python"]
+
+
+def test_upsert_matches_updates_existing_pair(sqlite_session):
+    _, candidates, jds = _seed(sqlite_session, 1, 1)
+    row = {
+        "id": uuid4(), "candidate_id": candidates[0].id, "jd_id": jds[0].id,
+        "skill_match_percent": 10, "matched_skills": [], "sbert_score": 50.0, "final_score": 26, "embedding_model": "test-model",
+        "calculated_at": None
+    }
+    first = upsert_matches(sqlite_session, [row])[0]
+    second = upsert_matches(sqlite_session, [{**row, "id": uuid4(), "final_score": 80}])[0]
+    sqlite_session.commit()
+
+    assert second["id"] == first["id"]
+    stored = sqlite_session.query(CandidateMatch).all()
+    assert len(stored) == 1
+    assert stored[0].final_score == 80
+
+
+def test_match_all_candidates_writes_one_row_per_pair(sqlite_session):
+    company_id, _, _ = _seed(sqlite_session, 3, 2)
+    same_vector = lambda texts: np.ones((len(texts), 4), dtype=np.float32) / 2
+    with patch("services.matching_service.encode_texts", side_effect=same_vector):
+        matches = match_all_candidates(sqlite_session, company_id)
+        match_all_candidates(sqlite_session, company_id)
+
+    assert len(matches) == 6
+    assert sqlite_session.query(CandidateMatch).count() == 6
+    assert {m["final_score"] for m in matches} == {100.0}
+    # Same-day runs share one history row per pair.
+    assert sqlite_session.query(CandidateMatchHistory).filter(CandidateMatchHistory.company_id == company_id).count() == 6
+
+
+def test_select_top_k_keeps_best_per_side_and_above_threshold():
+    rows = [
+        {"candidate_id": c, "jd_id": j, "final_score": score}
+        for c, j, score in [("c1", "j1", 90), ("c1", "j2", 40), ("c2", "j1", 80), ("c2", "j2", 30), ("c3", "j1", 70), ("c3", "j2", 20)]
+    ]
+
+    kept = select_top_k(rows, top_k=1)
+    assert {(r["candidate_id"], r["jd_id"]) for r in kept} == {("c1", "j1"), ("c2", "j1"), ("c3", "j1"), ("c1", "j2")}
+
+    kept = select_top_k(rows[:2], top_k=1, keep_threshold=35, jd_floor={"j1": 95})
+    assert {(r["candidate_id"], r["jd_id"]) for r in kept} == {("c1", "j1"), ("c1", "j2")}
+
+
+def test_match_all_candidates_top_k_mode_drops_stale_pairs(sqlite_session):
+    company_id, candidates, _ = _seed(sqlite_session, 3, 2)
+    company = Company(id=company_id, name="Acme", email="hr@acme.test", password="x")
+    sqlite_session.add(company)
+    sqlite_session.commit()
+    same_vector = lambda texts: np.ones((len(texts), 4), dtype=np.float32) / 2
+
+    with patch("services.matching_service.encode_texts", side_effect=same_vector):
+        match_all_candidates(sqlite_session, company_id)
+        assert sqlite_session.query(CandidateMatch).count() == 6
+
+        company.match_persist_mode = "top_k"
+        company.match_top_k = 1
+        sqlite_session.commit()
+        kept = match_all_candidates(sqlite_session, company_id)
+
+    stored = sqlite_session.query(CandidateMatch).all()
+    assert len(stored) == len(kept) < 6
+    assert {m.candidate_id for m in stored} == {c.id for c in candidates}
+
+
+def _row(candidate, jd, final_score):
+    return {
+        "id": uuid4(), "candidate_id": candidate.id, "jd_id": jd.id, "skill_match_percent": final_score,
+        "matched_skills": [], "sbert_score": float(final_score), "final_score": final_score, "embedding_model": "test-model",
+        "calculated_at": datetime.now(timezone.utc)
+    }
+
+
+def _pairs(db):
+    return {(m.candidate_id, m.jd_id): m.final_score for m in db.query(CandidateMatch).all()}
+
+
+def test_incremental_top_k_evicts_displaced_rows(sqlite_session):
+    company_id, (old, new), (j0, j1) = _seed(sqlite_session, 2, 2)
+    sqlite_session.add(Company(id=company_id, name="Acme", email="hr@acme.test", password="x",
+                               match_persist_mode="top_k", match_top_k=1))
+    upsert_matches(sqlite_session, [_row(old, j0, 50), _row(old, j1, 60)])
+    sqlite_session.commit()
+
+    # `new` takes j0's only slot; old/j0 is then in neither side's top 1.
+    with patch("services.matching_service.score_pairs", side_effect=lambda *a: [_row(new, j0, 80), _row(new, j1, 10)]):
+        match_candidate(sqlite_session, new.id, company_id)
+    assert _pairs(sqlite_session) == {(old.id, j1.id): 60, (new.id, j0.id): 80}
+
+    # Re-matching j0 removes new/j0, which it no longer keeps; old/j1 stays as j1's best.
+    with patch("services.matching_service.score_pairs", side_effect=lambda *a: [_row(old, j0, 90), _row(new, j0, 5)]):
+        match_jd(sqlite_session, j0, company_id)
+    assert _pairs(sqlite_session) == {(old.id, j0.id): 90, (old.id, j1.id): 60}
+
+
+def test_cascade_scoring_prunes_pairs_that_cannot_reach_min_score(sqlite_session):
+    company_id, candidates, _ = _seed(sqlite_session, 3, 2)
+    candidates[0].skills = ["Cobol"]
+    sqlite_session.add(Company(id=company_id, name="Acme", email="hr@acme.test", password="x", match_min_score=50))
+    sqlite_session.commit()
+    encoded = []
+
+    def same_vector(texts):
+        encoded.extend(texts)
+        return np.ones((len(texts), 4), dtype=np.float32) / 2
+
+    stats = {}
+    with patch("services.matching_service.encode_texts", side_effect=same_vector):
+        matches = match_all_candidates(sqlite_session, company_id, stats)
+
+    assert stats["pairs_pruned"] == 2
+    assert len(matches) == sqlite_session.query(CandidateMatch).count() == 4
+    assert candidates[0].id not in {m["candidate_id"] for m in matches}
+    assert len(encoded) == 2 + 2  # two surviving candidates, two JDs
+
+
+def test_iter_match_all_candidates_streams_batches(sqlite_session):
+    company_id, _, _ = _seed(sqlite_session, 5, 2)
+    same_vector = lambda texts: np.ones((len(texts), 4), dtype=np.float32) / 2
+    with patch("services.matching_service.encode_texts", side_effect=same_vector):
+        events = list(iter_match_all_candidates(sqlite_session, company_id, batch_size=2))
+
+    assert [e["event"] for e in events] == ["batch", "batch", "batch", "done"]
+    assert [e["processed"] for e in events[:3]] == [2, 4, 5]
+    assert sum(len(e["matches"]) for e in events[:3]) == events[-1]["matches_stored"] == 10
+    assert sqlite_session.query(CandidateMatch).count() == 10
+
+
+def test_iter_match_all_candidates_top_k_matches_full_run(sqlite_session):
+    company_id, candidates, _ = _seed(sqlite_session, 5, 2)
+    for i, candidate in enumerate(candidates):
+        candidate.summary = f"Engineer {i}"
+    sqlite_session.add(Company(id=company_id, name="Acme", email="hr@acme.test", password="x",
+                               match_persist_mode="top_k", match_top_k=1))
+    sqlite_session.commit()
+    rng = np.random.default_rng(1)
+    random_vector = lambda texts: rng.standard_normal((len(texts), 4)).astype(np.float32)
+
+    with patch("services.matching_service.encode_texts", side_effect=random_vector):
+        full = {(m["candidate_id"], m["jd_id"]) for m in match_all_candidates(sqlite_session, company_id)}
+        events = list(iter_match_all_candidates(sqlite_session, company_id, batch_size=2))
+
+    stored = {(m.candidate_id, m.jd_id) for m in sqlite_session.query(CandidateMatch).all()}
+    assert stored == full
+    # Each pair is sent once, so the batches add up to the stored count.
+    sent = [(m["candidate_id"], m["jd_id"]) for event in events if event["event"] == "batch" for m in event["matches"]]
+    assert len(sent) == len(set(sent)) == events[-1]["matches_stored"]
+    assert set(sent) == full
+
+
+def test_sbert_score_matrix_zero_rows_score_zero():
+    from services.matching_service import sbert_score_matrix
+    candidates = np.array([[1.0, 0.0], [0.0, 0.0]], dtype=np.float32)
+    jds = np.array([[1.0, 0.0], [-1.0, 0.0]], dtype=np.float32)
+
+    scores = sbert_score_matrix(candidates, jds)
+
+    assert scores.tolist() == [[100.0, 0.0], [0.0, 0.0]]
+
+
+def test_parallel_scores_match_in_process_scores(tmp_path, monkeypatch):
+    from services import embedding_store
+    monkeypatch.setattr(embedding_store, "EMBEDDINGS_DIR", tmp_path)
+    monkeypatch.setattr(embedding_store, "MATCHING_PARALLEL_MIN_ROWS", 0)
+    rng = np.random.default_rng(0)
+    candidates = rng.standard_normal((50, 8)).astype(np.float32)
+    jds = rng.standard_normal((3, 8)).astype(np.float32)
+    candidates[7] = 0
+
+    try:
+        parallel = embedding_store.score_matrix(uuid4(), candidates, jds, workers=3)
+    finally:
+        embedding_store.shutdown_pool()
+
+    np.testing.assert_array_equal(parallel, embedding_store.sbert_score_matrix(candidates, jds))
+    assert not list(tmp_path.glob("*/*.npy"))  # every run file is removed
+
+
+def test_run_matching_stream_sends_ndjson_and_sse(client):
+    from main import app
+    from utils.security import get_authenticated_entity
+    company = MagicMock(id=uuid4())
+    app.dependency_overrides[get_authenticated_entity] = lambda: {"type": "company", "entity": company}
+    events = [{"event": "batch", "matches": [], "processed": 1, "total": 1, "pairs_pruned": 0},
+              {"event": "done", "processed": 1, "total": 1, "matches_stored": 0, "pairs_pruned": 0}]
+
+    with patch("routes.matching_route.SessionLocal"), \
+            patch("routes.matching_route.iter_match_all_candidates", side_effect=lambda db, cid: iter(events)):
+        ndjson = client.post("/api/matching/run/stream")
+        sse = client.post("/api/matching/run/stream?format=sse")
+
+    assert ndjson.headers["content-type"].startswith("application/x-ndjson")
+    assert [line for line in ndjson.text.splitlines()][-1] == '{"event": "done", "processed": 1, "total": 1, "matches_stored": 0, "pairs_pruned": 0}'
+    assert sse.headers["content-type"].startswith("text/event-stream")
+    assert sse.text.startswith("event: batch\ndata: ")
@@ -0,0 +1,52 @@
+from unittest.mock import patch
+from uuid import uuid4
+
+from sqlalchemy.orm import sessionmaker
+
+from models import Candidate, Resume, ParseCache, BackgroundJob
+from services import parse_service
+from services.job_service import create_job, run_job
+from services.parse_service import REPARSE_JOB_KIND, get_parse_results, run_reparse_job
+from utils.resume_parser import PARSER_VERSION, parse_resume
+
+RESUME_TEXT = "Jane Doe\njane@example.com\nSKILLS\nPython, SQL, Docker\n"
+
+
+def _seed_candidate(db, text=RESUME_TEXT, parser_version=None):
+    resume = Resume(resume_id=uuid4(), uploaded_path="x.pdf", actual_name="x.pdf", file_format="pdf", parsed_text=text)
+    candidate = Candidate(id=uuid4(), name="FIRST LAST", email="", resume_id=resume.resume_id, skills=[],
+                          parser_version=parser_version)
+    db.add_all([resume, candidate])
+    db.commit()
+    return candidate.id
+
+
+def test_get_parse_results_parses_each_text_once(sqlite_session):
+    with patch("services.parse_service.parse_resume", side_effect=parse_resume) as parse:
+        first = get_parse_results(sqlite_session, [RESUME_TEXT, RESUME_TEXT], "Engineering")
+        second = get_parse_results(sqlite_session, [RESUME_TEXT], "Engineering")
+        sqlite_session.commit()
+
+    assert parse.call_count == 1
+    assert first[0] == first[1] == second[0]
+    assert sqlite_session.query(ParseCache).count() == 1
+
+
+def test_reparse_job_updates_only_outdated_candidates(sqlite_session, monkeypatch):
+    monkeypatch.setattr(parse_service, "REPARSE_THROTTLE_SECONDS", 0)
+    outdated = [_seed_candidate(sqlite_session), _seed_candidate(sqlite_session, parser_version="0")]
+    current = _seed_candidate(sqlite_session, parser_version=PARSER_VERSION)
+
+    job = create_job(sqlite_session, REPARSE_JOB_KIND, {"parser_version": PARSER_VERSION, "workers": 1, "batch_size": 1})
+    run_job(job.id, run_reparse_job, session_factory=sessionmaker(bind=sqlite_session.get_bind()))
+
+    sqlite_session.expire_all()
+    job = sqlite_session.get(BackgroundJob, job.id)
+    assert job.status == "completed"
+    assert (job.processed, job.total) == (2, 2)
+    for candidate_id in outdated:
+        candidate = sqlite_session.get(Candidate, candidate_id)
+        assert candidate.parser_version == PARSER_VERSION
+        assert candidate.name == "Jane Doe"
+        assert sorted(candidate.skills) == ["Docker", "Python", "SQL"]
+    assert sqlite_session.get(Candidate, current).name == "FIRST LAST"
@@ -0,0 +1,65 @@
+from unittest.mock import patch
+from uuid import uuid4
+
+from sqlalchemy import create_engine
+
+from models import base
+from models import Candidate
+
+
+def test_read_your_writes_window():
+    tenant = str(uuid4())
+    base.mark_tenant_write(tenant, now=100.0)
+
+    assert base.wrote_recently(tenant, now=100.0 + base.READ_YOUR_WRITES_SECONDS / 2)
+    assert not base.wrote_recently(tenant, now=100.0 + base.READ_YOUR_WRITES_SECONDS + 1)
+    assert not base.wrote_recently(str(uuid4()))
+    assert not base.wrote_recently(None)
+
+
+def test_commits_mark_request_tenant_and_row_companies(sqlite_session):
+    tenant, company_id, rolled_back = str(uuid4()), uuid4(), uuid4()
+    db = base.SessionLocal(bind=sqlite_session.get_bind(), info={"tenant_id": tenant})
+    try:
+        db.add(Candidate(name="Ann", email="ann@example.com", resume_id=uuid4(), company_id=company_id))
+        db.commit()
+        db.add(Candidate(name="Bob", email="bob@example.com", resume_id=uuid4(), company_id=rolled_back))
+        db.flush()
+        db.rollback()
+    finally:
+        db.close()
+
+    assert base.wrote_recently(tenant)
+    assert base.wrote_recently(company_id)
+    assert not base.wrote_recently(rolled_back)
+
+
+def test_commits_without_request_tenant_mark_row_users(sqlite_session):
+    # Uploads write through the module-level session, which has no tenant_id.
+    user_id = uuid4()
+    db = base.SessionLocal(bind=sqlite_session.get_bind())
+    try:
+        db.add(Candidate(name="Ann", email="ann@example.com", resume_id=uuid4(), user_id=user_id))
+        db.commit()
+    finally:
+        db.close()
+
+    assert base.wrote_recently(user_id)
+
+
+def test_replica_session_sticks_to_primary_after_tenant_write():
+    replica = create_engine("sqlite://")
+    tenant = str(uuid4())
+
+    with patch.object(base, "read_engine", replica):
+        before = base.ReadSessionLocal(info={"primary_info": {"tenant_id": tenant}})
+        assert before.get_bind() is replica
+
+        base.mark_tenant_write(tenant)
+        after = base.ReadSessionLocal(info={"primary_info": {"tenant_id": tenant}})
+        other = base.ReadSessionLocal(info={"primary_info": {"tenant_id": str(uuid4())}})
+
+        assert after.get_bind() is base.engine
+        assert other.get_bind() is replica
+        # The choice is kept for the rest of the session.
+        assert before.get_bind() is replica
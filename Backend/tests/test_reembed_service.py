@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import numpy as np
+from sqlalchemy.orm import sessionmaker
+
+from main import app
+from models import Candidate, JobDescription, CandidateMatch, Company, Embedding, BackgroundJob
+from services import reembed_service
+from services.job_service import create_job, run_job, is_stale
+from services.reembed_service import REEMBED_JOB_KIND, run_reembed_job, count_stale_matches, reembed_company
+from utils.security import get_authenticated_entity
+
+
+def _seed_company(db):
+    company = Company(id=uuid4(), name=f"Acme {uuid4().hex[:6]}", email=f"{uuid4().hex[:6]}@acme.test", password="x")
+    candidate = Candidate(id=uuid4(), name="Cand", email="c@example.com", resume_id=uuid4(), company_id=company.id,
+                          skills=["Python"], experience=["Backend dev"], summary="Engineer")
+    jd = JobDescription(id=uuid4(), title="JD", description="Python engineer", keywords=["python"], company_id=company.id)
+    db.add_all([company, candidate, jd])
+    db.add(CandidateMatch(id=uuid4(), candidate_id=candidate.id, jd_id=jd.id, skill_match_percent=100,
+                          sbert_score=10.0, final_score=64, matched_skills=["python"], embedding_model="old-model"))
+    db.add(Embedding(owner_type="candidate", owner_id=candidate.id, model_name="old-model", company_id=company.id,
+                     dtype="float32", dim=1, vector=b"\x00\x00\x00\x00", text_hash="x"))
+    db.commit()
+    return company
+
+
+def test_reembed_job_rescores_every_company_and_drops_old_embeddings(sqlite_session, monkeypatch):
+    monkeypatch.setattr(reembed_service, "REEMBED_THROTTLE_SECONDS", 0)
+    _seed_company(sqlite_session)
+    _seed_company(sqlite_session)
+    assert count_stale_matches(sqlite_session) == 2
+
+    job = create_job(sqlite_session, REEMBED_JOB_KIND, {"model_name": reembed_service.matching_service.SBERT_MODEL_NAME})
+    same_vector = lambda texts: np.ones((len(texts), 4), dtype=np.float32) / 2
+    with patch("services.matching_service.encode_texts", side_effect=same_vector):
+        run_job(job.id, run_reembed_job, session_factory=sessionmaker(bind=sqlite_session.get_bind()))
+
+    sqlite_session.expire_all()
+    job = sqlite_session.get(BackgroundJob, job.id)
+    assert job.status == "completed"
+    assert (job.processed, job.total) == (2, 2)
+    assert count_stale_matches(sqlite_session) == 0
+    assert sqlite_session.query(Embedding).filter(Embedding.model_name == "old-model").count() == 0
+
+
+def test_reembed_job_resumes_after_checkpoint(sqlite_session, monkeypatch):
+    monkeypatch.setattr(reembed_service, "REEMBED_THROTTLE_SECONDS", 0)
+    company_ids = sorted([_seed_company(sqlite_session).id, _seed_company(sqlite_session).id])
+
+    job = create_job(sqlite_session, REEMBED_JOB_KIND, {"model_name": reembed_service.matching_service.SBERT_MODEL_NAME}, total=2)
+    job.checkpoint = {"last_company_id": str(company_ids[0])}
+    job.processed = 1
+    sqlite_session.commit()
+    with patch("services.reembed_service.reembed_company") as reembed_company:
+        run_job(job.id, run_reembed_job, session_factory=sessionmaker(bind=sqlite_session.get_bind()))
+
+    assert [call.args[1] for call in reembed_company.call_args_list] == [company_ids[1]]
+    sqlite_session.expire_all()
+    assert sqlite_session.get(BackgroundJob, job.id).processed == 2
+
+
+def test_reembed_heartbeats_every_batch(sqlite_session, monkeypatch):
+    monkeypatch.setattr(reembed_service, "REEMBED_THROTTLE_SECONDS", 0)
+    monkeypatch.setattr(reembed_service, "REEMBED_BATCH_SIZE", 1)
+    company = _seed_company(sqlite_session)
+    job = create_job(sqlite_session, REEMBED_JOB_KIND, {})
+    job.status = "running"
+    job.updated_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    sqlite_session.commit()
+    assert is_stale(job)
+
+    heartbeats = []
+    real_get_embeddings = reembed_service.matching_service.get_embeddings
+
+    def get_embeddings(db, *args):
+        heartbeats.append(job.updated_at)
+        return real_get_embeddings(db, *args)
+
+    same_vector = lambda texts: np.ones((len(texts), 4), dtype=np.float32) / 2
+    with patch("services.matching_service.encode_texts", side_effect=same_vector), \
+            patch.object(reembed_service.matching_service, "get_embeddings", side_effect=get_embeddings):
+        reembed_company(sqlite_session, company.id, job)
+
+    # The JD batch already sees the heartbeat committed with the candidate batch.
+    assert heartbeats[1] > heartbeats[0]
+    assert not is_stale(job)
+
+
+def test_reembed_endpoint_requires_admin(client):
+    app.dependency_overrides[get_authenticated_entity] = lambda: {"type": "company", "entity": MagicMock(), "entity_id": "1"}
+
+    response = client.post("/api/admin/reembed")
+
+    assert response.status_code == 403
@@ -0,0 +1,77 @@
+import fitz
+import pytest
+
+from utils import resume_parser
+from utils.resume_parser import extract_text_from_pdf, PdfExtractionError
+
+
+def _make_pdf(tmp_path, pages):
+    path = tmp_path / f"resume-{pages}.pdf"
+    with fitz.open() as doc:
+        for i in range(pages):
+            doc.new_page().insert_text((72, 72), f"Page {i} Python SQL")
+        doc.save(path)
+    return path
+
+
+def test_extract_text_from_pdf_reads_every_page(tmp_path):
+    text = extract_text_from_pdf(_make_pdf(tmp_path, 3))
+
+    assert text.splitlines() == ["Page 0 Python SQL", "Page 1 Python SQL", "Page 2 Python SQL"]
+
+
+def test_long_pdf_is_extracted_by_page_range_in_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(resume_parser, "PDF_PARALLEL_MIN_PAGES", 4)
+    monkeypatch.setattr(resume_parser, "PDF_EXTRACT_WORKERS", 3)
+
+    text = extract_text_from_pdf(_make_pdf(tmp_path, 10))
+
+    assert text.splitlines() == [f"Page {i} Python SQL" for i in range(10)]
+
+
+def test_invalid_pdf_raises_invalid_pdf(tmp_path):
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(b"not a pdf")
+    with pytest.raises(PdfExtractionError) as error:
+        extract_text_from_pdf(path)
+    assert error.value.code == "invalid_pdf"
+
+
+def test_page_limit_is_enforced(tmp_path, monkeypatch):
+    monkeypatch.setattr(resume_parser, "PDF_MAX_PAGES", 2)
+    with pytest.raises(PdfExtractionError) as error:
+        extract_text_from_pdf(_make_pdf(tmp_path, 3))
+    assert error.value.code == "too_many_pages"
+
+
+def test_timeout_kills_the_extraction(tmp_path, monkeypatch):
+    monkeypatch.setattr(resume_parser, "PDF_EXTRACT_TIMEOUT_SECONDS", 0)
+    with pytest.raises(PdfExtractionError) as error:
+        extract_text_from_pdf(_make_pdf(tmp_path, 1))
+    assert error.value.code == "timeout"
+
+
+def test_synthetic_resumes_parse_contact_skills_and_education():
+    import random
+    from benchmarks.resume_corpus import make_resume
+
+    rng = random.Random(3)
+    for _ in range(20):
+        data = resume_parser.parse_resume(make_resume(rng, jobs=2), "Engineering")
+
+        assert data["email"].endswith("@example.com")
+        assert data["phone"].startswith("+91")
+        assert data["skills"]
+        assert data["education"]
+
+
+def test_find_regressions_flags_only_steps_over_threshold():
+    from benchmarks.bench_parser import find_regressions
+
+    baseline = {"ms_per_resume": {"contact": 0.02, "sections": 4.0, "parse_resume": 10.0}}
+    report = {"ms_per_resume": {"contact": 0.024, "sections": 5.5, "parse_resume": 11.0}}
+
+    regressions = find_regressions(report, baseline, 0.25)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("sections:")
@@ -38,3 +38,45 @@ def test_upload_invalid_file_type(client, mock_db_session):
     
     assert response.status_code == 400
     # assert response.json()["detail"] == "Unsupported file type. Only PDF  are allowed."
+
+
+def test_resume_text_supports_char_and_byte_ranges(client, mock_db_session):
+    text = "Résumé\nPython SQL"
+    app.dependency_overrides[get_authenticated_entity] = lambda: {"entity": MagicMock(), "type": "company"}
+    try:
+        with patch("routes.resume_route.get_resume_text_db", new_callable=AsyncMock, return_value=text):
+            sliced = client.get(f"/api/resumes/{uuid4()}/text", params={"offset": 7, "limit": 6})
+            ranged = client.get(f"/api/resumes/{uuid4()}/text", headers={"Range": "bytes=0-7"})
+            unsatisfiable = client.get(f"/api/resumes/{uuid4()}/text", headers={"Range": "bytes=500-"})
+    finally:
+        app.dependency_overrides.pop(get_authenticated_entity)
+
+    assert sliced.status_code == 200
+    assert sliced.text == "Python"
+    assert sliced.headers["X-Text-Length"] == str(len(text))
+
+    body = text.encode("utf-8")
+    assert ranged.status_code == 206
+    assert ranged.content == body[:8]
+    assert ranged.headers["Content-Range"] == f"bytes 0-7/{len(body)}"
+
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["Content-Range"] == f"bytes */{len(body)}"
+
+
+def test_parsed_text_is_compressed_and_deferred(sqlite_session):
+    from sqlalchemy import inspect, text as sql
+    from models import Resume
+
+    parsed = "Experience\n" + "Built data pipelines with Python. " * 500
+    resume_id = uuid4()
+    sqlite_session.add(Resume(resume_id=resume_id, uploaded_path="x.pdf", actual_name="x.pdf", file_format="pdf", parsed_text=parsed))
+    sqlite_session.commit()
+    sqlite_session.expunge_all()
+
+    stored = sqlite_session.execute(sql("SELECT parsed_text FROM resumes")).scalar()
+    assert isinstance(stored, bytes) and len(stored) < len(parsed) / 10
+
+    resume = sqlite_session.query(Resume).filter(Resume.resume_id == resume_id).one()
+    assert "parsed_text" in inspect(resume).unloaded
+    assert resume.parsed_text == parsed
@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from main import app
+from models import Candidate
+from services.candidate_service import owner_filter
+from services.search_service import build_search_statement, search_filter
+from utils.security import get_authenticated_entity
+
+
+def test_search_statement_ranks_with_fulltext_and_trigram():
+    owner = owner_filter({"type": "company", "entity": SimpleNamespace(id=uuid4())})
+    sql = str(build_search_statement("kafka spark", owner, 20, 0).compile(dialect=postgresql.dialect()))
+
+    assert "candidates.search_vector @@ websearch_to_tsquery" in sql
+    assert "ts_rank_cd(candidates.search_vector" in sql
+    assert "similarity(candidates.name" in sql
+    assert "ts_headline" in sql
+    assert "candidates.company_id = " in sql
+    assert "LIMIT" in sql
+
+
+def test_search_filter_falls_back_to_literal_substring_match(sqlite_session):
+    resume_id = uuid4()
+    for name in ["Ann_Lee", "Annie Lee", "Bob"]:
+        sqlite_session.add(Candidate(name=name, email=f"{name.split()[0].lower()}@example.com", resume_id=resume_id))
+    sqlite_session.commit()
+
+    names = {c.name for c in sqlite_session.query(Candidate).filter(search_filter(sqlite_session, "ann_"))}
+
+    assert names == {"Ann_Lee"}
+
+
+def test_search_endpoint_returns_ranked_results(client, mock_db_session):
+    company = SimpleNamespace(id=uuid4())
+    result = {"id": uuid4(), "name": "Ann Lee", "email": None, "role": "Data Engineer", "skills": ["Kafka"],
+              "rank": 0.7, "highlight": "<mark>Kafka</mark>, Spark"}
+    app.dependency_overrides[get_authenticated_entity] = lambda: {"type": "company", "entity": company}
+    try:
+        unsupported = client.get("/api/candidates/search", params={"q": "kafka"})
+        with patch("routes.candidate_route.is_postgres", return_value=True), \
+                patch("routes.candidate_route.search_candidates", return_value=[result]) as search:
+            response = client.get("/api/candidates/search", params={"q": "kafka spark", "limit": 5})
+    finally:
+        app.dependency_overrides.pop(get_authenticated_entity)
+
+    assert unsupported.status_code == 501
+    assert response.status_code == 200
+    assert response.json()[0]["highlight"] == "<mark>Kafka</mark>, Spark"
+    assert search.call_args.args[2:] == ("kafka spark", 5, 0)
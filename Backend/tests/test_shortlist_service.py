@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from main import app
+from models.base import Base
+from models import Candidate, Company, JobDescription, Shortlist
+from routes.company_route import get_current_company
+from services.shortlist_service import get_shortlist
+
+
+@pytest.fixture
+def shortlist_session(sqlite_session):
+    Base.metadata.create_all(sqlite_session.get_bind(), tables=[Shortlist.__table__])
+    return sqlite_session
+
+
+def _seed_company(db, n):
+    company = Company(id=uuid4(), name=f"Acme {uuid4().hex[:6]}", email=f"{uuid4().hex[:6]}@acme.test", password="x")
+    jd = JobDescription(id=uuid4(), title="Data Engineer", description="Kafka", company_id=company.id)
+    db.add_all([company, jd])
+    start = datetime(2025, 1, 1)
+    for i in range(n):
+        candidate = Candidate(id=uuid4(), name=f"Candidate {i}", email=f"c{i}@example.com", resume_id=uuid4(), company_id=company.id)
+        db.add(candidate)
+        # Pairs share a created_at so pages also have to break ties on id.
+        db.add(Shortlist(candidate_id=candidate.id, jd_id=jd.id, shortlisted=True, shortlisted_by=company.id,
+                         created_at=start + timedelta(minutes=i // 2)))
+    db.commit()
+    return company
+
+
+def test_shortlist_pages_cover_only_the_company_newest_first(shortlist_session):
+    company = _seed_company(shortlist_session, 7)
+    _seed_company(shortlist_session, 3)
+
+    pages, cursor = [], None
+    while True:
+        entries, cursor = get_shortlist(shortlist_session, company.id, limit=3, cursor=cursor)
+        pages.append(entries)
+        if cursor is None:
+            break
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    entries = [entry for page in pages for entry in page]
+    assert len({entry.id for entry in entries}) == 7
+    assert all(entry.shortlisted_by == company.id for entry in entries)
+    keys = [(entry.created_at, entry.id) for entry in entries]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_shortlist_filters_on_candidate_name_and_jd_title(shortlist_session):
+    company_id = _seed_company(shortlist_session, 2).id
+
+    entries, _ = get_shortlist(shortlist_session, company_id, candidate_name="candidate 1", jd_title="data")
+
+    assert [entry.candidates.name for entry in entries] == ["Candidate 1"]
+    assert get_shortlist(shortlist_session, company_id, jd_title="designer") == ([], None)
+
+
+def test_shortlist_route_sets_next_cursor_and_rejects_bad_cursor(client, mock_db_session):
+    company = SimpleNamespace(id=uuid4())
+    app.dependency_overrides[get_current_company] = lambda: company
+    query = mock_db_session.query.return_value.filter.return_value
+    entry = SimpleNamespace(id=uuid4(), candidate_id=uuid4(), jd_id=uuid4(), shortlisted=True,
+                            shortlisted_at=datetime(2025, 1, 1), shortlisted_by=company.id, created_at=datetime(2025, 1, 1))
+    query.order_by.return_value.limit.return_value.all.return_value = [entry, entry]
+
+    response = client.get("/api/shortlist/?limit=1")
+
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    assert response.headers["x-next-cursor"]
+    assert client.get("/api/shortlist/?cursor=not-a-cursor").status_code == 400
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from models import Candidate, CandidateSkill, Skill
+from schemas.candidate_schema import CandidateUpdate
+from services.candidate_service import update_candidate
+from services.skill_service import has_skills_filter, skill_counts, sync_candidate_skills
+
+
+def _add_candidates(db, company_id, skill_lists, uploaded_at=None):
+    candidates = [
+        Candidate(name=f"Candidate {i}", email=f"c{i}@example.com", resume_id=uuid4(), company_id=company_id, skills=skills,
+                  uploaded_at=uploaded_at or datetime.now(timezone.utc))
+        for i, skills in enumerate(skill_lists)
+    ]
+    db.add_all(candidates)
+    db.flush()
+    sync_candidate_skills(db, candidates)
+    db.commit()
+    return candidates
+
+
+def test_sync_normalizes_and_dedupes_skills(sqlite_session):
+    candidate, = _add_candidates(sqlite_session, uuid4(), [["Python", " python ", "Machine  Learning", "", 7]])
+
+    skills = {s.normalized: s.name for s in sqlite_session.query(Skill)}
+    rows = sqlite_session.query(CandidateSkill).filter(CandidateSkill.candidate_id == candidate.id).count()
+
+    assert skills == {"python": "Python", "machine learning": "Machine Learning"}
+    assert rows == 2
+
+
+def test_update_replaces_candidate_skills(sqlite_session):
+    candidate, = _add_candidates(sqlite_session, uuid4(), [["Java", "Spring Boot"]])
+
+    update_candidate(sqlite_session, candidate.id, CandidateUpdate(skills=["Java", "Kafka"]))
+
+    names = {
+        name for (name,) in sqlite_session.query(Skill.name).join(
+            CandidateSkill, CandidateSkill.skill_id == Skill.id
+        ).filter(CandidateSkill.candidate_id == candidate.id)
+    }
+    assert names == {"Java", "Kafka"}
+
+
+def test_skills_filter_requires_every_skill(sqlite_session):
+    company_id = uuid4()
+    both, kafka_only, _ = _add_candidates(sqlite_session, company_id, [["Kafka", "Spark", "SQL"], ["Kafka"], ["Spark"]])
+    _add_candidates(sqlite_session, uuid4(), [["Kafka", "Spark"]])
+
+    matched = sqlite_session.query(Candidate.id).filter(has_skills_filter(["kafka", "SPARK"], company_id)).all()
+    kafka = sqlite_session.query(Candidate.id).filter(has_skills_filter(["Kafka"], company_id)).all()
+
+    assert [row.id for row in matched] == [both.id]
+    assert {row.id for row in kafka} == {both.id, kafka_only.id}
+
+
+def test_skill_counts_by_company_and_date(sqlite_session):
+    company_id = uuid4()
+    now = datetime.now(timezone.utc)
+    _add_candidates(sqlite_session, company_id, [["Python", "SQL"], ["python"]], uploaded_at=now)
+    _add_candidates(sqlite_session, company_id, [["SQL"], ["SQL"]], uploaded_at=now - timedelta(days=60))
+    _add_candidates(sqlite_session, uuid4(), [["Go"]], uploaded_at=now)
+
+    recent = skill_counts(sqlite_session, company_id, since=now - timedelta(days=7))
+    top = skill_counts(sqlite_session, company_id, limit=1)
+
+    assert [(row.skill, row.count) for row in recent] == [("Python", 2), ("SQL", 1)]
+    assert [(row.skill, row.count) for row in top] == [("SQL", 3)]
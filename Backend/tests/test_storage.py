@@ -0,0 +1,135 @@
+import hashlib
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from main import app
+from models import Resume
+from services.resume_service import release_resume_file, release_resume_files
+from utils import storage
+from utils.security import get_authenticated_entity
+from utils.storage import LocalStorage, S3Storage, content_key
+
+
+PDF = b"%PDF-1.4\n" + b"0123456789" * 100
+
+
+def _spool(tmp_path, data=PDF):
+    path = tmp_path / f"upload_{uuid4().hex}.part"
+    path.write_bytes(data)
+    return path
+
+
+def test_local_storage_shards_by_hash_and_dedupes(tmp_path):
+    store = LocalStorage(tmp_path / "resumes")
+    sha = hashlib.sha256(PDF).hexdigest()
+    key = content_key(sha)
+
+    first, second = _spool(tmp_path), _spool(tmp_path)
+    assert store.save(first, key) == key
+    store.save(second, key)
+
+    assert key == f"{sha[:2]}/{sha[2:4]}/{sha}.pdf"
+    assert store.path(key).read_bytes() == PDF
+    assert not first.exists() and not second.exists()
+    assert list((tmp_path / "resumes").rglob("*.pdf")) == [store.path(key)]
+
+
+def test_shared_file_is_kept_until_last_reference_goes(sqlite_session, tmp_path, monkeypatch):
+    store = LocalStorage(tmp_path / "resumes")
+    monkeypatch.setattr(storage, "_default", store)
+    sha = hashlib.sha256(PDF).hexdigest()
+    key = store.save(_spool(tmp_path), content_key(sha))
+    ids = [uuid4(), uuid4()]
+    for resume_id in ids:
+        sqlite_session.add(Resume(resume_id=resume_id, uploaded_path=key, actual_name="cv.pdf", file_format="pdf",
+                                  parsed_text="", content_sha256=sha))
+    sqlite_session.commit()
+
+    release_resume_file(sqlite_session, key, sha, ids[0])
+    assert store.exists(key)
+
+    sqlite_session.query(Resume).filter(Resume.resume_id == ids[0]).delete()
+    release_resume_file(sqlite_session, key, sha, ids[1])
+    assert not store.exists(key)
+
+
+def test_batch_release_skips_files_still_referenced(sqlite_session, tmp_path, monkeypatch):
+    store = LocalStorage(tmp_path / "resumes")
+    monkeypatch.setattr(storage, "_default", store)
+    kept, released = (store.save(_spool(tmp_path, PDF + bytes([i])), content_key(f"{i:02x}" * 32)) for i in range(2))
+    sqlite_session.add(Resume(resume_id=uuid4(), uploaded_path=kept, actual_name="cv.pdf", file_format="pdf",
+                              parsed_text=""))
+    sqlite_session.commit()
+
+    release_resume_files(sqlite_session, [kept, released, None])
+
+    assert store.exists(kept)
+    assert not store.exists(released)
+
+
+def test_download_answers_range_requests_from_local_storage(client, tmp_path, monkeypatch):
+    store = LocalStorage(tmp_path / "resumes")
+    monkeypatch.setattr(storage, "_default", store)
+    key = store.save(_spool(tmp_path), content_key(hashlib.sha256(PDF).hexdigest()))
+    row = {"uploaded_path": key, "actual_name": "cv.pdf"}
+
+    app.dependency_overrides[get_authenticated_entity] = lambda: {"entity": MagicMock(), "type": "company"}
+    try:
+        with patch("services.resume_service.get_resume_by_id", new_callable=AsyncMock, return_value=row):
+            full = client.get(f"/api/resumes/{uuid4()}/download")
+            partial = client.get(f"/api/resumes/{uuid4()}/download", headers={"Range": "bytes=0-7"})
+    finally:
+        app.dependency_overrides.pop(get_authenticated_entity)
+
+    assert full.status_code == 200
+    assert full.content == PDF
+    assert partial.status_code == 206
+    assert partial.content == PDF[:8]
+    assert partial.headers["Content-Range"] == f"bytes 0-7/{len(PDF)}"
+
+
+def test_s3_storage_round_trip_with_ranges(tmp_path):
+    boto3 = pytest.importorskip("boto3")
+    moto = pytest.importorskip("moto")
+
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="resumes")
+        store = S3Storage("resumes", "cv/", client=client)
+        key = content_key(hashlib.sha256(PDF).hexdigest())
+
+        store.save(_spool(tmp_path), key)
+        assert store.exists(key)
+
+        response = store.response(key, "cv.pdf", "bytes=0-7")
+        assert response.status_code == 206
+        assert response.headers["Content-Range"] == f"bytes 0-7/{len(PDF)}"
+
+        store.delete(key)
+        assert not store.exists(key)
+
+
+def test_failed_resume_insert_rolls_back_and_releases_the_file(sqlite_session, tmp_path, monkeypatch):
+    import asyncio
+    from types import SimpleNamespace
+    from fastapi import HTTPException, UploadFile
+    from io import BytesIO
+    from services import resume_service
+    from sqlalchemy.orm import sessionmaker
+
+    store = LocalStorage(tmp_path / "resumes")
+    monkeypatch.setattr(storage, "_default", store)
+    monkeypatch.setattr(resume_service, "session", sqlite_session)
+    monkeypatch.setattr(resume_service, "SessionLocal", sessionmaker(bind=sqlite_session.get_bind()))
+    monkeypatch.setattr(resume_service, "extract_text_from_pdf", lambda path: "text")
+    # An id that is not a UUID makes the flush fail, leaving the session needing a rollback.
+    auth = {"type": "company", "entity": SimpleNamespace(id="not-a-uuid")}
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(resume_service.process_resume_pdf(UploadFile(file=BytesIO(PDF), filename="cv.pdf"), auth))
+
+    assert error.value.detail == "Error inserting resume"
+    assert not store.exists(content_key(hashlib.sha256(PDF).hexdigest()))
+    assert sqlite_session.query(Resume).count() == 0
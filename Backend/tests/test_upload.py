@@ -0,0 +1,44 @@
+import asyncio
+import hashlib
+from io import BytesIO
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from utils import upload
+from utils.upload import stream_upload_to_disk
+
+
+def _upload(data: bytes) -> UploadFile:
+    return UploadFile(file=BytesIO(data), filename="resume.pdf")
+
+
+def test_stream_upload_writes_chunks_and_hashes(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload, "UPLOAD_CHUNK_SIZE", 16)
+    data = b"%PDF-1.7\n" + b"x" * 100
+
+    stored = asyncio.run(stream_upload_to_disk(_upload(data), directory=tmp_path))
+
+    assert stored.path.read_bytes() == data
+    assert stored.size == len(data)
+    assert stored.sha256 == hashlib.sha256(data).hexdigest()
+
+
+@pytest.mark.parametrize("data, status", [(b"GIF89a" + b"x" * 10, 415), (b"%PDF-1.7\n" + b"x" * 100, 413)])
+def test_stream_upload_rejects_and_cleans_up(tmp_path, monkeypatch, data, status):
+    monkeypatch.setattr(upload, "UPLOAD_CHUNK_SIZE", 16)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(stream_upload_to_disk(_upload(data), max_bytes=50, directory=tmp_path))
+
+    assert error.value.status_code == status
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_oversized_upload_rejected_from_content_length(client):
+    response = client.post(
+        "/api/public/parse_resume",
+        content=b"x",
+        headers={"Content-Length": str(upload.MAX_UPLOAD_BYTES * 2), "Content-Type": "multipart/form-data; boundary=x"}
+    )
+    assert response.status_code == 413
@@ -0,0 +1,189 @@
+"""
+Per-request SQL instrumentation.
+
+instrument_engine() hooks an engine's cursor events so that every statement is
+counted and timed against the current request, which DBMetricsMiddleware tracks
+in a context variable. Each response gets two headers:
+- X-DB-Queries: the number of statements run.
+- Server-Timing: database time and total time; browser dev tools show it.
+
+Requests slower than SLOW_REQUEST_MS are logged with their slowest statements.
+Per-route totals accumulate in memory and are served by GET /api/admin/db-stats.
+Overhead is one perf_counter pair and a context-variable lookup per statement.
+
+Statements run after the response headers are sent (streamed bodies, background
+tasks) do not appear in the headers. They still count toward the log line and
+the route totals.
+"""
+import heapq
+import os
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import event
+
+from utils.log_config import logger
+
+DB_METRICS_ENABLED = os.getenv("DB_METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", 1000))
+SLOW_REQUEST_TOP_STATEMENTS = int(os.getenv("SLOW_REQUEST_TOP_STATEMENTS", 3))
+STATEMENT_LOG_CHARS = 300
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds", "slowest")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.slowest = []  # min-heap of (seconds, statement), at most SLOW_REQUEST_TOP_STATEMENTS long
+
+    def record(self, seconds: float, statement: str):
+        self.queries += 1
+        self.db_seconds += seconds
+        if len(self.slowest) < SLOW_REQUEST_TOP_STATEMENTS:
+            heapq.heappush(self.slowest, (seconds, statement))
+        elif self.slowest and seconds > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, (seconds, statement))
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("db_request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(time.perf_counter() - started, statement)
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute.
+    starts = exception_context.connection.info.get("query_start") if exception_context.connection is not None else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine):
+    if not DB_METRICS_ENABLED or event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class RouteTotals:
+    __slots__ = ("requests", "queries", "db_seconds", "max_queries", "slow_requests")
+
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.max_queries = 0
+        self.slow_requests = 0
+
+
+_totals = {}
+_totals_lock = threading.Lock()
+_totals_since = datetime.now(timezone.utc)
+
+
+def _record_request(route: str, stats: RequestStats, slow: bool):
+    with _totals_lock:
+        totals = _totals.get(route)
+        if totals is None:
+            totals = _totals[route] = RouteTotals()
+        totals.requests += 1
+        totals.queries += stats.queries
+        totals.db_seconds += stats.db_seconds
+        totals.max_queries = max(totals.max_queries, stats.queries)
+        totals.slow_requests += slow
+
+
+def db_stats_snapshot() -> dict:
+    """Per-route totals since the process started, busiest (by database time) first."""
+    with _totals_lock:
+        routes = [
+            {
+                "route": route,
+                "requests": t.requests,
+                "queries": t.queries,
+                "avg_queries": round(t.queries / t.requests, 2),
+                "max_queries": t.max_queries,
+                "db_ms": round(t.db_seconds * 1000, 1),
+                "avg_db_ms": round(t.db_seconds * 1000 / t.requests, 2),
+                "slow_requests": t.slow_requests
+            }
+            for route, t in _totals.items()
+        ]
+    routes.sort(key=lambda row: row["db_ms"], reverse=True)
+    return {"since": _totals_since, "slow_request_ms": SLOW_REQUEST_MS, "routes": routes}
+
+
+def _route_name(scope) -> str:
+    """
+    "GET /api/candidates/{candidate_id}": the request path with path parameter
+    values replaced by their names, so that totals are per route and not per URL.
+    Requests that matched no route share one entry.
+    """
+    if "route" not in scope:
+        return f"{scope['method']} <unmatched>"
+    names = {str(value): name for name, value in scope.get("path_params", {}).items()}
+    path = "/".join(f"{{{names[part]}}}" if part in names else part for part in scope["path"].split("/"))
+    return f"{scope['method']} {path}"
+
+
+class DBMetricsMiddleware:
+    """Tracks the SQL statements of each HTTP request; see the module docstring."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not DB_METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-queries", str(stats.queries).encode()))
+                headers.append((b"server-timing", (
+                    f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries", app;dur={elapsed_ms:.1f}'
+                ).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current.reset(token)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            slow = elapsed_ms > SLOW_REQUEST_MS
+            route = _route_name(scope)
+            _record_request(route, stats, slow)
+            if slow:
+                top = "".join(
+                    f"\n  {seconds * 1000:.1f} ms: {' '.join(statement.split())[:STATEMENT_LOG_CHARS]}"
+                    for seconds, statement in sorted(stats.slowest, reverse=True)
+                )
+                logger.warning(
+                    f"Slow request {route}: {elapsed_ms:.0f} ms, {stats.queries} queries, "
+                    f"{stats.db_seconds * 1000:.0f} ms in the database{top}"
+                )
@@ -0,0 +1,71 @@
+"""
+Compact embedding formats.
+
+float32  4 bytes/dim, exact.
+float16  2 bytes/dim.
+int8     1 byte/dim plus one float32 scale per vector (max |x| / 127).
+
+Cosine similarity is invariant to per-vector scaling, so int8 matrices are scored
+without applying their scales: blocks of rows are widened to float32 and multiplied
+with BLAS, and the full dequantized matrix is never materialised.
+"""
+import numpy as np
+
+
+EMBEDDING_DTYPES = ("float32", "float16", "int8")
+
+# Candidate rows widened to float32 at a time while scoring.
+SCORE_BLOCK_ROWS = 8192
+
+
+def quantize(vectors: np.ndarray, dtype: str):
+    """Returns (data, scales). `scales` is None except for int8."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if dtype == "float32":
+        return vectors, None
+    if dtype == "float16":
+        return vectors.astype(np.float16), None
+    if dtype == "int8":
+        scales = np.abs(vectors).max(axis=1) / 127.0 if len(vectors) else np.zeros(0, dtype=np.float32)
+        safe = np.where(scales > 0, scales, 1.0)
+        data = np.clip(np.rint(vectors / safe[:, None]), -127, 127).astype(np.int8)
+        return data, scales.astype(np.float32)
+    raise ValueError(f"Unsupported embedding dtype: {dtype}")
+
+
+def dequantize(data: np.ndarray, scales: np.ndarray = None) -> np.ndarray:
+    vectors = data.astype(np.float32)
+    if scales is not None:
+        vectors *= scales[:, None]
+    return vectors
+
+
+def to_bytes(vector: np.ndarray, dtype: str, scale: float = None) -> bytes:
+    """Serialises one quantized vector; int8 vectors are prefixed with their float32 scale."""
+    if dtype == "int8":
+        return np.float32(scale).tobytes() + vector.astype(np.int8).tobytes()
+    return vector.astype(dtype).tobytes()
+
+
+def from_bytes(blob: bytes, dtype: str):
+    """Inverse of to_bytes. Returns (vector, scale); scale is None except for int8."""
+    if dtype == "int8":
+        return np.frombuffer(blob, dtype=np.int8, offset=4), float(np.frombuffer(blob[:4], dtype=np.float32)[0])
+    return np.frombuffer(blob, dtype=dtype), None
+
+
+def cosine_similarity(a: np.ndarray, b: np.ndarray, block_rows: int = SCORE_BLOCK_ROWS) -> np.ndarray:
+    """
+    Cosine similarity of every row of `a` against every row of `b`, for float32,
+    float16 or int8 inputs. Zero rows get similarity 0.
+    """
+    b32 = np.asarray(b, dtype=np.float32)
+    b_norms = np.linalg.norm(b32, axis=1)
+    b_unit = b32 / np.where(b_norms > 0, b_norms, 1.0)[:, None]
+
+    out = np.empty((len(a), len(b32)), dtype=np.float32)
+    for start in range(0, len(a), block_rows):
+        block = np.asarray(a[start:start + block_rows], dtype=np.float32)
+        norms = np.linalg.norm(block, axis=1)
+        out[start:start + len(block)] = (block @ b_unit.T) / np.where(norms > 0, norms, 1.0)[:, None]
+    return out
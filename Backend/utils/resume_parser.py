@@ -1,20 +1,145 @@
 import fitz  # PyMuPDF
+import os
 import re
+import resource
+import time
 from utils.log_config import logger
+from utils.utility import register_forkserver_preload, get_forkserver_context
 
-def extract_text_from_pdf(file_path):
+# Every PDF is opened in a throwaway subprocess, so a malformed or huge upload
+# can only exhaust that process. Limits per extraction:
+PDF_EXTRACT_TIMEOUT_SECONDS = float(os.getenv("PDF_EXTRACT_TIMEOUT_SECONDS", 20))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", 100))
+# Address-space cap (RLIMIT_AS) per extraction process; Linux does not enforce
+# an RSS limit, and address space bounds it from above.
+PDF_EXTRACT_MAX_MEMORY_MB = int(os.getenv("PDF_EXTRACT_MAX_MEMORY_MB", 1024))
+
+# PDFs with at least this many pages are extracted by page range across up to
+# PDF_EXTRACT_WORKERS sandboxed processes; shorter ones use a single process.
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", 40))
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", min(4, os.cpu_count() or 1)))
+
+# Bump whenever parse_resume's output changes; candidates parsed by an older
+# version are picked up by the re-parse job (services/parse_service.py).
+PARSER_VERSION = "1"
+
+register_forkserver_preload(__name__)
+
+
+class PdfExtractionError(Exception):
+    """
+    Extraction failed in a way the caller should report. `code` is one of:
+    invalid_pdf, encrypted, too_many_pages, timeout, memory_limit, extraction_failed.
+    """
+
+    def __init__(self, code: str, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+def _sandbox_extract(conn, path: str, start: int, end, max_pages: int, split_min_pages, memory_bytes: int):
     """
-    Extracts text from a PDF file using PyMuPDF (fitz).
+    Runs in the extraction subprocess and sends one ("text", str), ("pages", int)
+    or ("error", code, message) tuple back. With `end` None it validates the whole
+    document and, if it has at least `split_min_pages` pages, returns only its
+    page count.
     """
     try:
-        doc = fitz.open(file_path)
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        return text
+        if memory_bytes:
+            resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+        with fitz.open(path, filetype="pdf") as doc:
+            if doc.needs_pass:
+                conn.send(("error", "encrypted", "PDF is password protected"))
+                return
+            page_count = doc.page_count
+            if end is None:
+                if page_count > max_pages:
+                    conn.send(("error", "too_many_pages", f"PDF has {page_count} pages; the limit is {max_pages}"))
+                    return
+                if split_min_pages is not None and page_count >= split_min_pages:
+                    conn.send(("pages", page_count))
+                    return
+                end = page_count
+            conn.send(("text", "".join(doc[i].get_text() for i in range(start, min(end, page_count)))))
+    except MemoryError:
+        conn.send(("error", "memory_limit", f"PDF needs more than {memory_bytes // (1024 * 1024)} MB to extract"))
+    except (fitz.FileDataError, fitz.EmptyFileError) as e:
+        conn.send(("error", "invalid_pdf", f"Not a readable PDF: {e}"))
     except Exception as e:
-        logger.error(f"Error extracting text from PDF: {e}")
-        return ""
+        conn.send(("error", "extraction_failed", str(e)))
+    finally:
+        conn.close()
+
+
+def _start_sandbox(path: str, start: int = 0, end: int = None):
+    context = get_forkserver_context()
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_sandbox_extract,
+        args=(
+            sender, path, start, end, PDF_MAX_PAGES,
+            PDF_PARALLEL_MIN_PAGES if PDF_EXTRACT_WORKERS > 1 else None,
+            PDF_EXTRACT_MAX_MEMORY_MB * 1024 * 1024
+        ),
+        daemon=True
+    )
+    process.start()
+    sender.close()
+    return process, receiver
+
+
+def _collect_sandbox(process, receiver, deadline: float):
+    """Waits for the subprocess's result until `deadline`; the process is always reaped."""
+    try:
+        if not receiver.poll(max(0.0, deadline - time.monotonic())):
+            raise PdfExtractionError("timeout", f"PDF extraction took longer than {PDF_EXTRACT_TIMEOUT_SECONDS:g}s")
+        try:
+            result = receiver.recv()
+        except EOFError:
+            # Killed before replying, e.g. by the kernel OOM killer or a crash in MuPDF.
+            raise PdfExtractionError("extraction_failed", "PDF extraction process exited unexpectedly")
+    finally:
+        if process.is_alive():
+            process.kill()
+        process.join()
+        receiver.close()
+
+    if result[0] == "error":
+        raise PdfExtractionError(result[1], result[2])
+    return result
+
+
+def _extract_sandboxed(path: str) -> str:
+    deadline = time.monotonic() + PDF_EXTRACT_TIMEOUT_SECONDS
+    result = _collect_sandbox(*_start_sandbox(path), deadline)
+    if result[0] == "text":
+        return result[1]
+
+    page_count = result[1]
+    step = -(-page_count // PDF_EXTRACT_WORKERS)
+    sandboxes = [_start_sandbox(path, start, min(start + step, page_count)) for start in range(0, page_count, step)]
+    texts = []
+    try:
+        for process, receiver in sandboxes:
+            texts.append(_collect_sandbox(process, receiver, deadline)[1])
+    finally:
+        # If one range failed, stop the others.
+        for process, receiver in sandboxes[len(texts) + 1:]:
+            process.kill()
+            process.join()
+            receiver.close()
+    return "".join(texts)
+
+
+def extract_text_from_pdf(file_path) -> str:
+    """
+    Extracts text from a PDF file using PyMuPDF (fitz) inside sandboxed subprocesses
+    with the PDF_* time, memory and page limits. Only the path crosses the process
+    boundary. Long documents are split into page ranges extracted in parallel.
+    Raises PdfExtractionError.
+    """
+    return _extract_sandboxed(str(file_path))
+
 
 def clean_text(text):
     """
@@ -168,34 +293,159 @@ def extract_section(text, section_headers):
                 
     return "\n".join(lines).strip()
     
+COMMON_SKILLS = [
+    "Python", "Java", "C++", "C#", "JavaScript", "TypeScript", "React", "Angular", "Vue.js", 
+    "Node.js", "Express", "Django", "Flask", "FastAPI", "Spring Boot", "ASP.NET",
+    "SQL", "MySQL", "PostgreSQL", "MongoDB", "Redis", "Oracle", "Cassandra",
+    "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Jenkins", "Terraform", "Ansible",
+    "Git", "GitHub", "GitLab", "CI/CD", "Linux", "Unix", "Bash", "Shell Scripting",
+    "Machine Learning", "Deep Learning", "Data Science", "NLP", "Computer Vision",
+    "TensorFlow", "PyTorch", "Scikit-learn", "Pandas", "NumPy", "Matplotlib",
+    "HTML", "CSS", "SASS", "LESS", "Bootstrap", "Tailwind CSS",
+    "Agile", "Scrum", "Kanban", "Jira", "Confluence",
+    "Communication", "Leadership", "Teamwork", "Problem Solving", "Critical Thinking"
+]
+
+SKILLS_HEADERS = ["Skills", "Technical Skills", "Technologies", "Core Competencies", "Technical Proficiency"]
+EXPERIENCE_HEADERS = [
+    "Experience", "Work History", "Employment", "Professional Experience", "Work Experience",
+    "Practicum Experience", "Teaching Experience", "Internship", "Internships", "Career History",
+    "Employment History", "Professional Background"
+]
+EDUCATION_HEADERS = [
+    "Education", "Academic", "Qualifications", "Educational Qualifications", "Academic Background",
+    "Education & Qualifications", "Scholastic Achievements"
+]
+PROJECT_HEADERS = [
+    "Projects", "Key Projects", "Academic Projects", "Personal Projects", "Project Experience",
+    "Software Engineering Projects", "Technical Projects"
+]
+SUMMARY_HEADERS = ["Summary", "Profile", "Professional Summary", "Objective", "Career Objective", "About Me"]
+
+
 def extract_skills_from_text(text):
     """
     Extracts skills from text using a predefined list of common skills.
     """
-    common_skills = [
-        "Python", "Java", "C++", "C#", "JavaScript", "TypeScript", "React", "Angular", "Vue.js", 
-        "Node.js", "Express", "Django", "Flask", "FastAPI", "Spring Boot", "ASP.NET",
-        "SQL", "MySQL", "PostgreSQL", "MongoDB", "Redis", "Oracle", "Cassandra",
-        "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Jenkins", "Terraform", "Ansible",
-        "Git", "GitHub", "GitLab", "CI/CD", "Linux", "Unix", "Bash", "Shell Scripting",
-        "Machine Learning", "Deep Learning", "Data Science", "NLP", "Computer Vision",
-        "TensorFlow", "PyTorch", "Scikit-learn", "Pandas", "NumPy", "Matplotlib",
-        "HTML", "CSS", "SASS", "LESS", "Bootstrap", "Tailwind CSS",
-        "Agile", "Scrum", "Kanban", "Jira", "Confluence",
-        "Communication", "Leadership", "Teamwork", "Problem Solving", "Critical Thinking"
-    ]
-    
     # Try to find a specific skills section first
-    skills_text = extract_section(text, ["Skills", "Technical Skills", "Technologies", "Core Competencies", "Technical Proficiency"])
+    skills_text = extract_section(text, SKILLS_HEADERS)
     search_text = skills_text if skills_text else text
     
     found_skills = set()
-    for skill in common_skills:
+    for skill in COMMON_SKILLS:
         if re.search(r'\b' + re.escape(skill) + r'\b', search_text, re.IGNORECASE):
             found_skills.add(skill)
             
     return list(found_skills)
 
+def _section_lines(section_text):
+    """Non-empty lines of a section with leading bullets stripped."""
+    section_lines = []
+    for line in section_text.split('\n'):
+        line = line.strip()
+        if line:
+            # Clean bullet points and special characters
+            line = re.sub(r'^[\-\u2022\u2023\u25CF\uf0b7\*\s]+', '', line).strip()
+            # Only add if there's meaningful content left
+            if line and len(line) > 2:
+                section_lines.append(line)
+    return section_lines
+
+# The stages below fill `data` in place. `text` has spaced headers normalized and
+# `lines` holds its non-empty stripped lines. parse_resume runs them in
+# PARSE_STAGES order; benchmarks/bench_parser.py times each one.
+
+def parse_contact(text, lines, data):
+    """Email, phone and name."""
+    # Email
+    email_match = re.search(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', text)
+    if email_match:
+        data["email"] = email_match.group(0)
+        
+    # Phone
+    phone_match = re.search(r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', text)
+    if phone_match:
+        data["phone"] = phone_match.group(0).strip()
+
+    # Name
+    common_headers_lower = ["resume", "curriculum vitae", "cv", "bio", "profile", "summary"]
+    
+    for line in lines[:10]: # Check first 10 lines
+        line_lower = line.lower()
+        if line_lower not in common_headers_lower and len(line.split()) < 6:
+            # Check if it looks like a name
+            if not re.search(r'\d', line) and "@" not in line:
+                # Remove "Name:" prefix if present
+                clean_name = re.sub(r'^name\s*[:\-]\s*', '', line, flags=re.IGNORECASE).strip()
+                if clean_name:
+                    data["name"] = clean_name
+                    break
+
+def parse_skills(text, lines, data):
+    data["skills"] = extract_skills_from_text(text)
+
+def parse_sections(text, lines, data):
+    """Experience (and years of experience), education and projects."""
+    # --- Experience ---
+    exp_text = extract_section(text, EXPERIENCE_HEADERS)
+    
+    if exp_text:
+        data["experience"] = _section_lines(exp_text)
+        
+        years = re.findall(r'\b(19|20)\d{2}\b', exp_text)
+        if years:
+            years = [int(y) for y in years]
+            if len(years) >= 2:
+                data["experience_years"] = max(years) - min(years)
+    
+    if data["experience_years"] == 0:
+         exp_match = re.search(r'(\d+)\+?\s*years?', text, re.IGNORECASE)
+         if exp_match:
+            try:
+                data["experience_years"] = int(exp_match.group(1))
+            except ValueError:
+                pass
+
+    # --- Education ---
+    edu_text = extract_section(text, EDUCATION_HEADERS)
+    
+    if edu_text:
+        data["education"] = _section_lines(edu_text)
+    else:
+        education_keywords = ["Bachelor", "Master", "PhD", "B.Sc", "M.Sc", "B.Tech", "M.Tech", "University", "College", "Degree"]
+        found_education = []
+        for line in lines:
+            if any(keyword in line for keyword in education_keywords):
+                found_education.append(line)
+        data["education"] = found_education
+
+    # --- Projects ---
+    proj_text = extract_section(text, PROJECT_HEADERS)
+    
+    if proj_text:
+        data["projects"] = _section_lines(proj_text)
+
+def parse_summary(text, lines, data):
+    summary_text = extract_section(text, SUMMARY_HEADERS)
+    
+    if summary_text:
+        summary_lines = [line.strip() for line in summary_text.split('\n') if line.strip()]
+        data["summary"] = " ".join(summary_lines[:5])
+    else:
+        start_index = 0
+        if data["name"]: start_index += 1
+        if data["email"]: start_index += 1
+        if data["phone"]: start_index += 1
+        if len(lines) > start_index:
+            data["summary"] = " ".join(lines[start_index:start_index+4])
+
+PARSE_STAGES = (
+    ("contact", parse_contact),
+    ("skills", parse_skills),
+    ("sections", parse_sections),
+    ("summary", parse_summary),
+)
+
 def parse_resume(text, department=None):
     """
     Parses resume text to extract structured data using section-based extraction.
@@ -218,150 +468,11 @@ def parse_resume(text, department=None):
     }
     
     try:
-        # --- 1. Contact Info ---
-        # Email
-        email_match = re.search(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', text)
-        if email_match:
-            data["email"] = email_match.group(0)
-            
-        # Phone
-        phone_match = re.search(r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', text)
-        if phone_match:
-            data["phone"] = phone_match.group(0).strip()
-
-        # --- 2. Name ---
         lines = [line.strip() for line in text.split('\n') if line.strip()]
-        common_headers_lower = ["resume", "curriculum vitae", "cv", "bio", "profile", "summary"]
-        
-        for line in lines[:10]: # Check first 10 lines
-            line_lower = line.lower()
-            if line_lower not in common_headers_lower and len(line.split()) < 6:
-                # Check if it looks like a name
-                if not re.search(r'\d', line) and "@" not in line:
-                    # Remove "Name:" prefix if present
-                    clean_name = re.sub(r'^name\s*[:\-]\s*', '', line, flags=re.IGNORECASE).strip()
-                    if clean_name:
-                        data["name"] = clean_name
-                        break
-
-        # --- 3. Skills ---
-        common_skills = [
-            "Python", "Java", "C++", "C#", "JavaScript", "TypeScript", "React", "Angular", "Vue.js", 
-            "Node.js", "Express", "Django", "Flask", "FastAPI", "Spring Boot", "ASP.NET",
-            "SQL", "MySQL", "PostgreSQL", "MongoDB", "Redis", "Oracle", "Cassandra",
-            "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Jenkins", "Terraform", "Ansible",
-            "Git", "GitHub", "GitLab", "CI/CD", "Linux", "Unix", "Bash", "Shell Scripting",
-            "Machine Learning", "Deep Learning", "Data Science", "NLP", "Computer Vision",
-            "TensorFlow", "PyTorch", "Scikit-learn", "Pandas", "NumPy", "Matplotlib",
-            "HTML", "CSS", "SASS", "LESS", "Bootstrap", "Tailwind CSS",
-            "Agile", "Scrum", "Kanban", "Jira", "Confluence",
-            "Communication", "Leadership", "Teamwork", "Problem Solving", "Critical Thinking"
-        ]
-        
-        skills_text = extract_section(text, ["Skills", "Technical Skills", "Technologies", "Core Competencies", "Technical Proficiency"])
-        search_text = skills_text if skills_text else text
-        
-        found_skills = set()
-        for skill in common_skills:
-            if re.search(r'\b' + re.escape(skill) + r'\b', search_text, re.IGNORECASE):
-                found_skills.add(skill)
-        data["skills"] = list(found_skills)
-
-        # --- 4. Experience ---
-        exp_headers = [
-            "Experience", "Work History", "Employment", "Professional Experience", "Work Experience",
-            "Practicum Experience", "Teaching Experience", "Internship", "Internships", "Career History",
-            "Employment History", "Professional Background"
-        ]
-        exp_text = extract_section(text, exp_headers)
-        
-        if exp_text:
-            exp_lines = []
-            for line in exp_text.split('\n'):
-                line = line.strip()
-                if line:
-                    # Clean bullet points and special characters
-                    line = re.sub(r'^[\-\u2022\u2023\u25CF\uf0b7\*\s]+', '', line).strip()
-                    # Only add if there's meaningful content left
-                    if line and len(line) > 2:
-                        exp_lines.append(line)
-            data["experience"] = exp_lines
-            
-            years = re.findall(r'\b(19|20)\d{2}\b', exp_text)
-            if years:
-                years = [int(y) for y in years]
-                if len(years) >= 2:
-                    data["experience_years"] = max(years) - min(years)
-        
-        if data["experience_years"] == 0:
-             exp_match = re.search(r'(\d+)\+?\s*years?', text, re.IGNORECASE)
-             if exp_match:
-                try:
-                    data["experience_years"] = int(exp_match.group(1))
-                except ValueError:
-                    pass
-
-        # --- 5. Education ---
-        edu_headers = [
-            "Education", "Academic", "Qualifications", "Educational Qualifications", "Academic Background",
-            "Education & Qualifications", "Scholastic Achievements"
-        ]
-        edu_text = extract_section(text, edu_headers)
-        
-        if edu_text:
-            edu_lines = []
-            for line in edu_text.split('\n'):
-                line = line.strip()
-                if line:
-                    # Clean bullet points and special characters
-                    line = re.sub(r'^[\-\u2022\u2023\u25CF\uf0b7\*\s]+', '', line).strip()
-                    # Only add if there's meaningful content left
-                    if line and len(line) > 2:
-                        edu_lines.append(line)
-            data["education"] = edu_lines
-        else:
-            education_keywords = ["Bachelor", "Master", "PhD", "B.Sc", "M.Sc", "B.Tech", "M.Tech", "University", "College", "Degree"]
-            found_education = []
-            for line in lines:
-                if any(keyword in line for keyword in education_keywords):
-                    found_education.append(line)
-            data["education"] = found_education
-
-        # --- 6. Projects ---
-        proj_headers = [
-            "Projects", "Key Projects", "Academic Projects", "Personal Projects", "Project Experience",
-            "Software Engineering Projects", "Technical Projects"
-        ]
-        proj_text = extract_section(text, proj_headers)
-        
-        if proj_text:
-            proj_lines = []
-            for line in proj_text.split('\n'):
-                line = line.strip()
-                if line:
-                    # Clean bullet points and special characters
-                    line = re.sub(r'^[\-\u2022\u2023\u25CF\uf0b7\*\s]+', '', line).strip()
-                    # Only add if there's meaningful content left
-                    if line and len(line) > 2:
-                        proj_lines.append(line)
-            data["projects"] = proj_lines
-
-        # --- 7. Summary ---
-        summary_headers = ["Summary", "Profile", "Professional Summary", "Objective", "Career Objective", "About Me"]
-        summary_text = extract_section(text, summary_headers)
-        
-        if summary_text:
-            summary_lines = [line.strip() for line in summary_text.split('\n') if line.strip()]
-            data["summary"] = " ".join(summary_lines[:5])
-        else:
-            start_index = 0
-            if data["name"]: start_index += 1
-            if data["email"]: start_index += 1
-            if data["phone"]: start_index += 1
-            if len(lines) > start_index:
-                data["summary"] = " ".join(lines[start_index:start_index+4])
-
-        # --- 8. Role ---
+        for _, stage in PARSE_STAGES:
+            stage(text, lines, data)
+
+        # --- Role ---
         if data["experience"]:
             first_exp_line = data["experience"][0]
             if len(first_exp_line.split()) < 6:
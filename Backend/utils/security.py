@@ -104,6 +104,9 @@ def get_authenticated_entity(creds: HTTPAuthorizationCredentials = Depends(beare
     if not entity_type or not entity_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Malformed token")
 
+    # Lets the session record this tenant's writes for read-replica routing (models/base.py).
+    db.info["tenant_id"] = entity_id
+
     # If it's a company
     if entity_type == "company":
         company = db.query(Company).filter(Company.id == entity_id).first()
@@ -119,3 +122,12 @@ def get_authenticated_entity(creds: HTTPAuthorizationCredentials = Depends(beare
         return {"type": "user", "entity": user, "entity_id": entity_id}
 
     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token type")
+
+
+def get_admin_user(auth: dict = Depends(get_authenticated_entity)):
+    """
+    Allows only users with the 'admin' role; used by cross-tenant maintenance endpoints.
+    """
+    if auth["type"] != "user" or getattr(auth["entity"], "role", None) != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return auth["entity"]
@@ -0,0 +1,173 @@
+"""
+Resume file storage.
+
+Files are content-addressed: the key of an upload is derived from its sha256 and
+sharded by hash prefix ("ab/cd/abcd....pdf"), so no directory grows past a few
+hundred entries and identical uploads share one stored file. Resume.uploaded_path
+holds the key. Rows written before sharding hold an absolute path to a file in
+the old flat directory; those keep resolving through the local backend.
+
+RESUME_STORAGE picks the backend:
+  local  files under RESUME_STORAGE_DIR (default uploads/resumes)
+  s3     objects under RESUME_S3_PREFIX in RESUME_S3_BUCKET; needs boto3. Set
+         S3_ENDPOINT_URL for S3-compatible stores such as MinIO.
+"""
+import os
+from pathlib import Path
+
+from fastapi import HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
+
+from utils.log_config import logger
+from utils.utility import BASE_DIR
+
+
+RESUME_STORAGE = os.getenv("RESUME_STORAGE", "local")
+RESUME_STORAGE_DIR = Path(os.getenv("RESUME_STORAGE_DIR", BASE_DIR / "uploads" / "resumes"))
+RESUME_S3_BUCKET = os.getenv("RESUME_S3_BUCKET")
+RESUME_S3_PREFIX = os.getenv("RESUME_S3_PREFIX", "resumes/")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")
+
+STORAGE_CHUNK_SIZE = 256 * 1024
+
+
+def content_key(sha256: str, extension: str = "pdf") -> str:
+    return f"{sha256[:2]}/{sha256[2:4]}/{sha256}.{extension}"
+
+
+class LocalStorage:
+    """Sharded directory tree on the local filesystem."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key: str) -> Path:
+        # Legacy rows store an absolute path.
+        return Path(key) if os.path.isabs(key) else self.root / key
+
+    def save(self, source: Path, key: str) -> str:
+        """Moves `source` into the store under `key`; if the content is already stored, `source` is dropped."""
+        target = self.path(key)
+        if target.exists():
+            Path(source).unlink(missing_ok=True)
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            # Uploads are spooled on the same filesystem, so this is a rename.
+            os.replace(source, target)
+        return key
+
+    def exists(self, key: str) -> bool:
+        return self.path(key).exists()
+
+    def delete(self, key: str):
+        self.path(key).unlink(missing_ok=True)
+
+    def response(self, key: str, filename: str, range_header: str = None):
+        """
+        FileResponse answers Range requests itself (206 / 416) and hands the file to
+        the server with the pathsend extension when the server supports it.
+        """
+        path = self.path(key)
+        if not path.exists():
+            raise HTTPException(status_code=404, detail="Resume file not found")
+        return FileResponse(path=path, filename=filename, media_type="application/pdf")
+
+
+class S3Storage:
+    """Objects in an S3 bucket (or any S3-compatible store reachable at `endpoint_url`)."""
+
+    def __init__(self, bucket: str, prefix: str = "", endpoint_url: str = None, client=None):
+        if client is None:
+            try:
+                import boto3
+            except ImportError:
+                raise RuntimeError("RESUME_STORAGE=s3 requires boto3 (pip install boto3)")
+            client = boto3.client("s3", endpoint_url=endpoint_url)
+        if not bucket:
+            raise RuntimeError("RESUME_STORAGE=s3 requires RESUME_S3_BUCKET")
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def save(self, source: Path, key: str) -> str:
+        if not self.exists(key):
+            self.client.upload_file(str(source), self.bucket, self._object_key(key), ExtraArgs={"ContentType": "application/pdf"})
+        Path(source).unlink(missing_ok=True)
+        return key
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+
+    def response(self, key: str, filename: str, range_header: str = None):
+        """Streams the object; a Range header is passed through to the store and answered with 206."""
+        from botocore.exceptions import ClientError
+        params = {"Bucket": self.bucket, "Key": self._object_key(key)}
+        if range_header:
+            params["Range"] = range_header
+        try:
+            obj = self.client.get_object(**params)
+        except ClientError as e:
+            code = e.response["Error"]["Code"]
+            if code in ("404", "NoSuchKey"):
+                raise HTTPException(status_code=404, detail="Resume file not found")
+            if code == "InvalidRange":
+                raise HTTPException(status_code=416, detail="Range not satisfiable")
+            raise
+
+        headers = {
+            "Accept-Ranges": "bytes",
+            "Content-Length": str(obj["ContentLength"]),
+            "Content-Disposition": f'attachment; filename="{filename}"'
+        }
+        if obj.get("ContentRange"):
+            headers["Content-Range"] = obj["ContentRange"]
+        return StreamingResponse(
+            obj["Body"].iter_chunks(STORAGE_CHUNK_SIZE),
+            status_code=206 if obj.get("ContentRange") else 200,
+            media_type="application/pdf",
+            headers=headers
+        )
+
+
+_local = None
+_default = None
+
+
+def _local_storage() -> LocalStorage:
+    global _local
+    if _local is None:
+        _local = LocalStorage(RESUME_STORAGE_DIR)
+    return _local
+
+
+def get_storage(key: str = None):
+    """
+    The configured backend, or the backend that holds `key`: legacy absolute paths
+    always live on the local disk.
+    """
+    global _default
+    if key is not None and os.path.isabs(key):
+        return _local_storage()
+    if _default is None:
+        if RESUME_STORAGE == "s3":
+            _default = S3Storage(RESUME_S3_BUCKET, RESUME_S3_PREFIX, S3_ENDPOINT_URL)
+        elif RESUME_STORAGE == "local":
+            _default = _local_storage()
+        else:
+            raise RuntimeError(f"Unknown RESUME_STORAGE {RESUME_STORAGE!r}; use 'local' or 's3'")
+        logger.info(f"Resume storage: {RESUME_STORAGE}")
+    return _default
@@ -0,0 +1,94 @@
+import hashlib
+import os
+import uuid
+from pathlib import Path
+from typing import NamedTuple
+
+import aiofiles
+from fastapi import HTTPException, UploadFile
+from starlette.responses import JSONResponse
+
+from utils.log_config import logger
+from utils.utility import BASE_DIR
+
+
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 1024 * 1024))
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_MB", 10)) * 1024 * 1024
+
+# Uploads are streamed here first; keep it on the same filesystem as the final
+# location so moving a kept upload is a rename.
+UPLOAD_TMP_DIR = BASE_DIR / "uploads" / "tmp"
+UPLOAD_TMP_DIR.mkdir(parents=True, exist_ok=True)
+
+PDF_MAGIC = b"%PDF-"
+# The PDF spec lets readers accept the header anywhere in the first 1024 bytes.
+PDF_MAGIC_WINDOW = 1024
+
+# Allowance for multipart boundaries and part headers around the file itself.
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class StoredUpload(NamedTuple):
+    path: Path
+    size: int
+    sha256: str
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(status_code=413, detail=f"File is larger than {MAX_UPLOAD_BYTES // (1024 * 1024)} MB")
+
+
+async def stream_upload_to_disk(file: UploadFile, max_bytes: int = None, directory: Path = UPLOAD_TMP_DIR) -> StoredUpload:
+    """
+    Copies an upload to a temporary file in UPLOAD_CHUNK_SIZE chunks while computing
+    its sha256, so memory per upload stays constant. The first chunk must carry the
+    PDF header; the copy stops with 413 as soon as `max_bytes` is exceeded. The caller
+    owns the returned file (move it or unlink it).
+    """
+    max_bytes = max_bytes or MAX_UPLOAD_BYTES
+    if file.size is not None and file.size > max_bytes:
+        raise _too_large()
+
+    path = directory / f"upload_{uuid.uuid4().hex}.part"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(path, "wb") as out:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                if size == 0 and PDF_MAGIC not in chunk[:PDF_MAGIC_WINDOW]:
+                    raise HTTPException(status_code=415, detail="File is not a PDF.")
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large()
+                digest.update(chunk)
+                await out.write(chunk)
+        if size == 0:
+            raise HTTPException(status_code=400, detail="Uploaded file is empty.")
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+
+    return StoredUpload(path=path, size=size, sha256=digest.hexdigest())
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Rejects oversized uploads to `paths` with 413 from the Content-Length header,
+    before the multipart body is read and spooled. Uploads without the header are
+    still cut off by stream_upload_to_disk.
+    """
+
+    def __init__(self, app, paths, max_bytes: int = None):
+        self.app = app
+        self.paths = set(paths)
+        self.max_bytes = (max_bytes or MAX_UPLOAD_BYTES) + MULTIPART_OVERHEAD_BYTES
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.paths:
+            length = dict(scope["headers"]).get(b"content-length")
+            if length is not None and length.isdigit() and int(length) > self.max_bytes:
+                logger.warning(f"Rejected {length.decode()} byte upload to {scope['path']}")
+                response = JSONResponse(status_code=413, content={"message": _too_large().detail})
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
@@ -1,4 +1,5 @@
 from datetime import timezone, timedelta, datetime
+from multiprocessing import get_context
 from pathlib import Path
 import uuid
 from utils.log_config import logger
@@ -22,3 +23,47 @@ def get_current_datetime_utc():
 
 def get_new_id():
     return uuid.uuid4().hex
+
+
+def parse_byte_range(header: str, size: int):
+    """
+    Parses a single-range HTTP Range header ("bytes=0-99", "bytes=100-", "bytes=-50")
+    against a body of `size` bytes. Returns (start, end) with `end` inclusive, or
+    raises ValueError when the header is malformed or the range is unsatisfiable.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        raise ValueError(f"Unsupported range: {header}")
+    first, _, last = spec.strip().partition("-")
+    if not first.isdigit() and not last.isdigit():
+        raise ValueError(f"Invalid range: {header}")
+    if not first:
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(f"Range not satisfiable: {header}")
+    return start, end
+
+
+_FORKSERVER_PRELOAD = []
+
+
+def register_forkserver_preload(module: str):
+    """
+    Adds `module` to the modules the fork server imports once, before it forks any
+    worker. Call it at import time so the list is complete when the server starts.
+    """
+    if module not in _FORKSERVER_PRELOAD:
+        _FORKSERVER_PRELOAD.append(module)
+
+
+def get_forkserver_context():
+    """
+    Multiprocessing context for worker processes. forkserver, because forking the
+    threaded uvicorn process directly is unsafe.
+    """
+    context = get_context("forkserver")
+    context.set_forkserver_preload(list(_FORKSERVER_PRELOAD))
+    return context
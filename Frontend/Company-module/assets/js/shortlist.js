@@ -13,7 +13,7 @@
  *
  * API Endpoints:
  * - GET /api/candidates?search=...&minScore=...&sortBy=...
- * - GET /api/shortlist/
+ * - GET /api/shortlist/?cursor=... (one page; X-Next-Cursor holds the next page's cursor)
  * - POST /api/shortlist/ (add to shortlist)
  * - DELETE /api/shortlist/{id} (remove from shortlist)
  * ============================================================================
@@ -35,11 +35,13 @@ function setupShortlistTable() {
   const exportBtn = document.querySelector("#exportBtn");
   const compareBtn = document.querySelector("#compareBtn");
   const runMatchingBtn = document.querySelector("#runMatchingBtn");
+  const loadMoreBtn = document.querySelector("#loadMoreShortlistBtn");
 
   let isComparing = false;
   let selectedForComparison = new Set();
   let candidatesCache = [];
   let shortlistCache = {};
+  let shortlistCursor = null; // cursor of the next shortlist page, null once all are loaded
   let jdsCache = []; // Cache for job descriptions
 
   // Make candidatesCache accessible globally for comparison modal
@@ -91,9 +93,10 @@ function setupShortlistTable() {
   };
 
   /**
-   * Fetches shortlist data from the backend API
+   * Fetches one page of shortlist data from the backend API. Without a cursor it
+   * starts over from the newest entries; with one it adds the next page.
    */
-  const fetchShortlist = async () => {
+  const fetchShortlist = async (cursor = null) => {
     const token = getToken();
     if (!token) {
       logout();
@@ -101,7 +104,10 @@ function setupShortlistTable() {
     }
 
     try {
-      const response = await fetch(API.company.shortlist.getAll, {
+      const url = cursor
+        ? `${API.company.shortlist.getAll}?cursor=${encodeURIComponent(cursor)}`
+        : API.company.shortlist.getAll;
+      const response = await fetch(url, {
         headers: { 'Authorization': `Bearer ${token}` }
       });
 
@@ -111,8 +117,12 @@ function setupShortlistTable() {
       }
 
       const shortlistArray = await response.json();
+      // X-Next-Cursor is only set when more entries remain.
+      shortlistCursor = response.headers.get('X-Next-Cursor');
+      if (loadMoreBtn) loadMoreBtn.hidden = !shortlistCursor;
+
       // Convert array to object keyed by candidate_id for easier lookup
-      const shortlistMap = {};
+      const shortlistMap = cursor ? shortlistCache : {};
       shortlistArray.forEach(item => {
         // Use composite key: candidate_id + "_" + jd_id
         const key = `${item.candidate_id}_${item.jd_id}`;
@@ -652,6 +662,14 @@ function setupShortlistTable() {
       el.addEventListener(eventName, applyFilters);
     });
 
+  loadMoreBtn?.addEventListener("click", async () => {
+    if (!shortlistCursor) return;
+    loadMoreBtn.disabled = true;
+    await fetchShortlist(shortlistCursor);
+    loadMoreBtn.disabled = false;
+    renderRows(candidatesCache);
+  });
+
   // Initialize: fetch data and render
   (async () => {
     await fetchJDs(); // Fetch JDs first
@@ -32,9 +32,12 @@ const API = {
         },
         candidates: {
             getAll: `${CONFIG.BASE_API_URL}/api/candidates/`,
+            search: (q, limit = 20, offset = 0) => `${CONFIG.BASE_API_URL}/api/candidates/search?q=${encodeURIComponent(q)}&limit=${limit}&offset=${offset}`,
             get: (id) => `${CONFIG.BASE_API_URL}/api/candidates/${id}`,
             update: (id) => `${CONFIG.BASE_API_URL}/api/candidates/${id}`,
-            delete: (id) => `${CONFIG.BASE_API_URL}/api/candidates/${id}`
+            delete: (id) => `${CONFIG.BASE_API_URL}/api/candidates/${id}`,
+            bulkDelete: `${CONFIG.BASE_API_URL}/api/candidates/bulk-delete`,
+            export: (params = '') => `${CONFIG.BASE_API_URL}/api/candidates/export?${params}`
         },
         shortlist: {
             getAll: `${CONFIG.BASE_API_URL}/api/shortlist/`,
@@ -43,6 +46,7 @@ const API = {
         },
         matching: {
             run: `${CONFIG.BASE_API_URL}/api/matching/run`,
+            runStream: (format = 'ndjson') => `${CONFIG.BASE_API_URL}/api/matching/run/stream?format=${format}`,
             matchCandidate: (id) => `${CONFIG.BASE_API_URL}/api/matching/candidate/${id}`
         },
         interviews: `${CONFIG.BASE_API_URL}/api/company/interviews/`